@@ -1,11 +1,14 @@
 # type: ignore
 
 import ast
-from typing import Any, Callable, Iterable, Iterator
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
 
 import numpy as np
 
 from sim_explorer.models import AssertionResult, Temporal
+from sim_explorer.utils.streaming import SeriesSummary, window_max, window_min
 
 
 class Assertion:
@@ -15,6 +18,11 @@ class Assertion:
 
     * the independent variable t (time)
     * all variables defined as variables in cases file,
+    * the summary statistics of these variables as <variable>_<stat>, e.g. x_max (see SeriesSummary.STATS),
+      which are available if the variable is recorded with '@summary'
+    * the symbols of other cases as <case>.<symbol>, e.g. base.x, which are resolved through the results
+      of already run cases (see register_results()) and interpolated to the times of the evaluated results.
+      The times of the evaluated results must lie within the time range of the other case
     * functions from any loaded module
 
     These can then be combined to boolean expressions and be checked against
@@ -33,46 +41,41 @@ class Assertion:
         else:
             self._imports = imports
         self._symbols = {"t": 1}  # list of all symbols and their length
+        self._order = {"t": 0}  # {symbol : ordinal}, the registration order of the symbols
         self._functions: list = []  # list of all functions used in expressions
         # per expression as key:
         self._syms: dict = {}  # the symbols used in expression
         self._funcs: dict = {}  # the functions used in expression
         self._expr: dict = {}  # the raw expression
         self._compiled: dict = {}  # the byte-compiled expression
+        self._compiled_robustness: dict = {}  # the byte-compiled robustness expression (None if not available)
         self._temporal: dict = {}  # additional information for evaluation as time series
         self._description: dict = {}
         self._cases_variables: dict = {}  # is set to Cases.variables when calling self.register_vars
+        # {symbol : (instance, variable, length, model)}, completed when calling self.register_vars
+        self._sym_info: dict = {"t": ("none", "t", 1, "none")}
+        self._summary_index: dict = {}  # {symbol : (instance, variable, stat)}, set when calling self.register_vars
+        self._cross_index: dict = {}  # {<case>__<symbol> : (case, symbol)}, symbols of other cases used in expressions
+        # {case name : Results}, weak references to the results of run cases, set by register_results
+        self._results: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
         self._assertions: dict = {}  # assertion results, set by do_assert
+        self._robustness: dict = {}  # robustness margins of the assertion results, set by do_assert
 
     def info(self, sym: str, typ: str = "instance") -> str | int:
-        """Retrieve detailed information related to the registered symbol 'sym'."""
-        if sym == "t":  # the independent variable
-            return {"instance": "none", "variable": "t", "length": 1, "model": "none"}[typ]  # type: ignore
-
-        parts = sym.split("_")
-        var = parts.pop()
-        while True:
-            if var in self._cases_variables:  # found the variable
-                if not len(parts):  # abbreviated variable without instance information
-                    assert len(self._cases_variables[var]["instances"]) == 1, f"Non-unique instance for variable {var}"
-                    instance = self._cases_variables[var]["instances"][0]  # use the unique instance
-                else:
-                    instance = parts[0] + "".join("_" + x for x in parts[1:])
-                    assert instance in self._cases_variables[var]["instances"], f"No instance {instance} of {var}"
-                break
-            else:
-                if not len(parts):
-                    raise KeyError(f"The symbol {sym} does not seem to represent a registered variable") from None
-                var = parts.pop() + "_" + var
-        if typ == "instance":  # get the instance
-            return instance
-        elif typ == "variable":  # get the generic variable name
-            return var
-        elif typ == "length":  # get the number of elements
-            return len(self._cases_variables[var]["variables"])
-        elif typ == "model":  # get the basic (FMU) model
-            return self._cases_variables[var]["model"]
-        else:
+        """Retrieve detailed information related to the registered symbol 'sym'.
+
+        Args:
+            sym (str): The symbol
+            typ (str)='instance': The requested information: 'instance', 'variable' (the generic variable name),
+               'length' (the number of elements) or 'model' (the basic FMU model)
+        """
+        try:
+            info = self._sym_info[sym]
+        except KeyError:
+            raise KeyError(f"The symbol {sym} does not seem to represent a registered variable") from None
+        try:
+            return info[("instance", "variable", "length", "model").index(typ)]
+        except ValueError:
             raise KeyError(f"Unknown typ {typ} within info()") from None
 
     def symbol(self, name: str, length: int = 1):
@@ -93,6 +96,7 @@ class Assertion:
                 self._symbols.update({name: np.ones(length, dtype=float)})  # type: ignore
             else:
                 self._symbols.update({name: 1})
+            self._order.setdefault(name, len(self._order))
             sym = self._symbols[name]
         return sym
 
@@ -124,10 +128,11 @@ class Assertion:
             else:
                 return ex
         else:  # setter
-            syms, funcs = self.expr_get_symbols_functions(ex)
+            body = self._cross_case_refs(ex)  # <case>.<symbol> replaced by argument names
+            syms, funcs = self.expr_get_symbols_functions(body)
             self._syms.update({key: syms})
             self._funcs.update({key: funcs})
-            code = make_func(key, syms, ex)
+            code = make_func(key, syms, body)
             try:
                 #               print("GLOBALS", globals())
                 #               print("LOCALS", locals())
@@ -138,9 +143,101 @@ class Assertion:
             else:
                 self._expr.update({key: ex})
                 self._compiled.update({key: compiled})
+            robustness = Assertion.robustness_expr(body)
+            self._compiled_robustness.update(
+                {key: None if robustness is None else compile(make_func(key, syms, robustness), "<string>", "exec")}
+            )
             # print("KEY", key, ex, syms, compiled)
             return compiled
 
+    @staticmethod
+    def robustness_expr(ex: str) -> str | None:
+        """Make the robustness expression of the boolean expression 'ex', i.e. a signed margin,
+        which is positive if 'ex' is True and negative if 'ex' is False, e.g. '3.0 - x[2]' for 'x[2] < 3.0'.
+
+        * Comparisons: the difference of the sides
+          (the minimum element for vectors, the minimum for chained comparisons).
+          For '==' the margin is -abs(difference), i.e. at best 0.
+        * 'and' / 'or' / 'not' : minimum / maximum / negation of the margins
+        * tuples (trigger, response), see Temporal.E : tuple of the margins
+
+        Returns
+        -------
+            The robustness expression as string, or None if 'ex' is not built from comparisons
+        """
+
+        def margin(node: ast.AST) -> str | None:
+            if isinstance(node, ast.Compare):
+                margins = []
+                left = node.left
+                for op, right in zip(node.ops, node.comparators, strict=True):
+                    a, b = ast.unparse(left), ast.unparse(right)
+                    if isinstance(op, (ast.Lt, ast.LtE)):
+                        margins.append(f"np.min(({b}) - ({a}))")
+                    elif isinstance(op, (ast.Gt, ast.GtE)):
+                        margins.append(f"np.min(({a}) - ({b}))")
+                    elif isinstance(op, ast.Eq):
+                        margins.append(f"-np.max(np.abs(({a}) - ({b})))")
+                    elif isinstance(op, ast.NotEq):
+                        margins.append(f"np.min(np.abs(({a}) - ({b})))")
+                    else:  # 'in', 'is', ...
+                        return None
+                    left = right
+                return margins[0] if len(margins) == 1 else f"min({', '.join(margins)})"
+            elif isinstance(node, ast.BoolOp):
+                margins = [margin(v) for v in node.values]
+                if any(m is None for m in margins):
+                    return None
+                return f"{'min' if isinstance(node.op, ast.And) else 'max'}({', '.join(margins)})"  # type: ignore
+            elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+                m = margin(node.operand)
+                return None if m is None else f"-({m})"
+            elif isinstance(node, ast.Tuple):
+                margins = [margin(e) for e in node.elts]
+                return None if any(m is None for m in margins) else f"({', '.join(margins)})"  # type: ignore
+            return None
+
+        tree = ast.parse(ex, "<string>", "eval")
+        return margin(tree.body)
+
+    def _cross_case_refs(self, ex: str) -> str:
+        """Replace the symbols of other cases <case>.<symbol> (e.g. base.x) in the expression 'ex'
+        by the argument names <case>__<symbol> and register these as symbols.
+        An attribute is a symbol of another case if its value is not a symbol, but the attribute is.
+        """
+        found = False
+
+        class Replace(ast.NodeTransformer):
+            def visit_Attribute(_self, node: ast.Attribute):  # noqa: N805
+                nonlocal found
+                if (
+                    isinstance(node.value, ast.Name)
+                    and node.value.id not in self._order
+                    and node.attr in self._order
+                    and node.attr != "t"
+                ):
+                    name = f"{node.value.id}__{node.attr}"
+                    if name not in self._cross_index:
+                        self._cross_index[name] = (node.value.id, node.attr)
+                        self._sym_info[name] = self._sym_info.get(node.attr, ("none", node.attr, 1, "none"))
+                        self._order.setdefault(name, len(self._order))
+                    found = True
+                    return ast.copy_location(ast.Name(id=name, ctx=node.ctx), node)
+                return _self.generic_visit(node)
+
+        tree = Replace().visit(ast.parse(ex, "<string>", "eval"))
+        return ast.unparse(tree) if found else ex
+
+    def register_results(self, case_name: str, results: Any):
+        """Register the results object of the case 'case_name', for the use as <case>.<symbol> in expressions.
+        Only a weak reference is kept, i.e. the registration ends when the results object is discarded.
+        """
+        self._results[case_name] = results
+
+    def unregister_results(self, case_name: str):
+        """Remove the results of the case 'case_name' (if registered). See register_results()."""
+        self._results.pop(case_name, None)
+
     def syms(self, key: str):
         """Get the symbols of the expression 'key'."""
         try:
@@ -175,7 +272,7 @@ class Assertion:
                 funcs = []
             for n in ast.iter_child_nodes(node):
                 if isinstance(n, ast.Name):
-                    if n.id in self._symbols:
+                    if n.id in self._order:
                         if isinstance(syms, list) and n.id not in syms:
                             syms.append(n.id)
                     elif isinstance(node, ast.Call):
@@ -188,8 +285,9 @@ class Assertion:
 
         if expr in self._expr:  # assume that actually a key is queried
             expr = self._expr[expr]
+        expr = self._cross_case_refs(expr)
         syms, funcs = ast_walk(ast.parse(expr, "<string>", "exec"))
-        syms = sorted(syms, key=list(self._symbols.keys()).index)
+        syms = sorted(syms, key=self._order.__getitem__)
         return (syms, funcs)
 
     def temporal(self, key: str, typ: Temporal | str | None = None, args: tuple | None = None):
@@ -245,13 +343,29 @@ class Assertion:
         """Register the variables in varnames as symbols.
 
         Can be used directly from Cases with varnames = tuple( Cases.variables.keys())
+        In addition the summary statistics symbols <variable>_<stat> are registered (if not clashing with a variable).
+        The symbol information (see info()) and the symbol ordinals are tabulated here,
+        such that symbol resolution does not depend on the number of registered variables.
         """
         self._cases_variables = variables  # remember the full dict for retrieval of details
         for key, info in variables.items():
+            sym_info = (key, len(info["variables"]), info.get("model", "none"))
             for inst in info["instances"]:
                 if len(info["instances"]) == 1:  # the instance is unique
                     self.symbol(key, len(info["variables"]))  # we allow to use the 'short name' if unique
+                    self._sym_info[key] = (inst, *sym_info)
                 self.symbol(inst + "_" + key, len(info["variables"]))  # fully qualified name can always be used
+                self._sym_info[inst + "_" + key] = (inst, *sym_info)
+        for key, info in variables.items():
+            sym_info = (key, len(info["variables"]), info.get("model", "none"))
+            for inst in info["instances"]:
+                names = [inst + "_" + key] + ([key] if len(info["instances"]) == 1 else [])
+                for name in names:
+                    for stat in SeriesSummary.STATS:
+                        if name + "_" + stat not in self._symbols:
+                            self._summary_index[name + "_" + stat] = (inst, key, stat)
+                            self._sym_info[name + "_" + stat] = (inst, *sym_info)
+                            self._order.setdefault(name + "_" + stat, len(self._order))
 
     def make_locals(self, loc: dict):
         """Adapt the locals with 'allowed' functions."""
@@ -317,42 +431,54 @@ class Assertion:
                 float : Linear interpolation of result at the given float time
                 `bool` : (time, True/False) for first row evaluating to True.
                 `bool-list` : (times, True/False) for all data points in the series
-                `A` : Always true for the whole time-series. Same as 'bool'
+                `A` : Always true for the whole time-series. (time, False) for the first row evaluating to False
                 `F` : is True at end of time series.
+                `E`, `H`, `W` : The windowed temporal operators (see below), with the arguments of temporal(key)
                 Callable : run the given callable on times, expr(data)
                 None : Use the internal 'temporal(key)' setting
+
+            The windowed temporal operators are evaluated in linear time (sliding windows, see utils.streaming):
+
+                `E` (dt): The expression is a pair (trigger, response). Whenever the trigger is True,
+                   the response shall be True at some time within [t, t+dt]. Returns the time of the first violation.
+                   Triggers later than the end time - dt are not evaluated (the window is not complete).
+                `H` (dt): The expression holds continuously during [t, t+dt] for some t. Returns the first such t.
+                `W` (t0, t1): The expression is always True within [t0, t1]. Returns the time of the first violation.
         Results:
             tuple of (time(s), value(s)), depending on `ret` parameter
         """
         times = []  # return the independent variable values (normally time)
         results = []  # return the scalar results at all times
-        bool_type = (ret is None and self.temporal(key)["type"] in (Temporal.A, Temporal.F)) or (
-            isinstance(ret, str) and (ret in ["A", "F"] or ret.startswith("bool"))
+        windowed = (Temporal.E, Temporal.H, Temporal.W)
+        bool_type = (ret is None and self.temporal(key)["type"] in (Temporal.A, Temporal.F, *windowed)) or (
+            isinstance(ret, str) and (ret in ["A", "F", "E", "H", "W"] or ret.startswith("bool"))
         )
         argnames = self._syms[key]
         loc = self.make_locals(locals())
         exec(self._compiled[key], loc, loc)  # the function is then available as _<key> among locals()
         func = locals()["_" + key]  # scalar function of all used arguments
         _temp = self._temporal[key]["type"] if ret is None else Temporal.UNDEFINED
+        if isinstance(ret, str) and ret in ("E", "H", "W"):
+            _temp = Temporal[ret]
 
         for row in data:
-            if not isinstance(row, Iterable):  # can happen if the time itself is evaluated
-                time = row
-                row = [row]
-            elif "t" not in argnames:  # the independent variable is not explicitly used in the expression
-                time = row[0]
-                row = row[1:]
-                assert len(row), f"Time data in eval_series seems to be lacking. Data:{data}, Argnames:{argnames}"
-            else:  # time used also explicitly in the expression
-                time = row[0]
+            time, row = Assertion._row_args(row, argnames)
             res = func(*row)
-            if bool_type:
+            if _temp == Temporal.E:  # (trigger, response) pair
+                assert isinstance(res, tuple) and len(res) == 2, f"Expression {key} shall return (trigger, response)"
+                res = (bool(res[0]), bool(res[1]))
+            elif bool_type:
                 res = bool(res)
 
             times.append(time)
             results.append(res)  # Note: res is always a scalar result
 
-        if (ret is None and _temp == Temporal.A) or (isinstance(ret, str) and ret in ("A", "bool")):  # always True
+        if (ret is None and _temp == Temporal.A) or (isinstance(ret, str) and ret == "A"):  # always True
+            for t, v in zip(times, results, strict=False):
+                if not v:
+                    return (t, False)
+            return (times[-1], True)
+        elif isinstance(ret, str) and ret == "bool":  # first True
             for t, v in zip(times, results, strict=False):
                 if v:
                     return (t, True)
@@ -365,6 +491,8 @@ class Assertion:
                 elif not v and t_true < t:  # detected False after expression became True
                     t_true = times[-1]
             return (t_true, t_true < times[-1])
+        elif _temp in windowed:
+            return self._eval_window(_temp, self._temporal[key]["args"], np.array(times, float), results)
         elif isinstance(ret, str) and ret == "bool-list":
             return (times, results)
         elif (ret is None and _temp == Temporal.T) or (isinstance(ret, float)):
@@ -384,37 +512,251 @@ class Assertion:
         else:
             raise ValueError(f"Unknown return type '{ret}'") from None
 
-    def do_assert(self, key: str, result: Any, case_name: str | None = None):
-        """Perform assert action 'key' on data of 'result' object."""
-        assert isinstance(key, str) and key in self._temporal, f"Assertion key {key} not found"
-        from sim_explorer.case import Results
+    def _summary_value(self, sym: str, result: Any) -> Any:
+        """Get the value of the summary statistics symbol 'sym' from the 'result' object."""
+        inst, var, stat = self._summary_index[sym]
+        try:
+            value = result.summary[inst][var][stat]
+        except KeyError:
+            raise AssertionError(f"No summary of {inst}.{var} for {sym}. Record it as '{var}@summary'") from None
+        return np.array(value, dtype=float) if isinstance(value, list) else value
 
-        assert isinstance(result, Results), f"Results object expected. Found {result}"
-        inst = []
-        var = []
-        for sym in self._syms[key]:
-            inst.append(self.info(sym, "instance"))
-            var.append(self.info(sym, "variable"))
-        assert len(var), "No variables to retrieve"
-        if var[0] == "t":  # the independent variable is always the first column in data
-            inst.pop(0)
-            var.pop(0)
-
-        data = result.retrieve(zip(inst, var, strict=False))
-        res = self.eval_series(key, data, ret=None)
+    def _retrieve(self, keys: Iterable[str], result: Any) -> dict:
+        """Retrieve the data needed by the assertions 'keys' from the 'result' object in one pass.
+        The columns of the union of the symbols are retrieved once and shared between the assertions.
+        Symbols of other cases are retrieved once per case from the registered results (see register_results())
+        and linearly interpolated to the times of 'result'.
+
+        Returns
+        -------
+            dict with the elements 'columns' {symbol : column index}, 'times', 'values', 'present', 'found'
+            (see Results.retrieve_columns()), 'summary' {symbol : summary statistics value}
+            and 'ranges' {column index : (<case>.<symbol>, start, end)} of the symbols of other cases.
+            Times outside the time range of another case are marked as not present for its symbols
+        """
+        series: dict = {}  # {symbol : column index}
+        summary: dict = {}  # {symbol : summary statistics value}
+        cross: dict = {}  # {case : {symbol : symbol of the case}}
+        ranges: dict = {}  # {column index of a symbol of another case : (<case>.<symbol>, start time, end time)}
+        for key in keys:
+            assert isinstance(key, str) and key in self._temporal, f"Assertion key {key} not found"
+            assert len(self._syms[key]), "No variables to retrieve"
+            for sym in self._syms[key]:
+                if sym == "t" or sym in series or sym in summary:
+                    continue
+                elif sym in self._cross_index:
+                    case, ref = self._cross_index[sym]
+                    if case not in self._results:
+                        raise AssertionError(f"Results of case {case} not available for {case}.{ref}. Run it first")
+                    if ref in self._summary_index:
+                        summary[sym] = self._summary_value(ref, self._results[case])
+                    else:
+                        cross.setdefault(case, {})[sym] = ref
+                elif sym in self._summary_index:
+                    summary[sym] = self._summary_value(sym, result)
+                else:
+                    series[sym] = len(series)
+        times, values, present, found = result.retrieve_columns(self._sym_info[sym][:2] for sym in series)
+        for case, refs in cross.items():  # the symbols of other cases, interpolated to the times of result
+            _times, _values, _present, _ = self._results[case].retrieve_columns(
+                self._sym_info[ref][:2] for ref in refs.values()
+            )
+            inside = []  # times of result within the time range of the other case, per symbol
+            for (sym, ref), col, ok in zip(refs.items(), _values, _present, strict=True):
+                idx = np.flatnonzero(ok)
+                assert len(idx), f"No values of {ref} in the results of case {case}"
+                t, v = np.array(_times)[idx], np.array([col[i] for i in idx], dtype=float)
+                if v.ndim == 1:
+                    interpolated = np.interp(times, t, v)
+                else:  # vector variable. Element-wise interpolation
+                    interpolated = np.column_stack([np.interp(times, t, v[:, k]) for k in range(v.shape[1])])
+                series[sym] = len(values)
+                ranges[series[sym]] = (f"{case}.{ref}", t[0], t[-1])
+                values.append(list(interpolated))
+                # np.interp clamps at times outside the time range of the other case. These are flagged
+                inside.append((np.asarray(times) >= t[0] - 1e-9) & (np.asarray(times) <= t[-1] + 1e-9))
+            present = np.vstack([present, *inside])
+            found = np.vstack([found, np.ones((len(refs), len(times)), dtype=bool)])
+        return {
+            "columns": series,
+            "times": times,
+            "values": values,
+            "present": present,
+            "found": found,
+            "summary": summary,
+            "ranges": ranges,
+        }
+
+    def _assert_data(self, key: str, data: dict, case_name: str | None = None):
+        """Perform assert action 'key' on the shared data retrieved through _retrieve()."""
+        args = [sym for sym in self._syms[key] if sym != "t"]  # the independent variable is always the first column
+        cols = [data["columns"][sym] for sym in args if sym in data["columns"]]
+        summary = data["summary"]
+        if len(cols):  # complete records of the variables of this assertion (see Results.retrieve())
+            rows = np.flatnonzero(data["present"][cols].all(axis=0) & data["found"][cols].any(axis=0))
+            self._check_ranges(data, cols, self._temporal[key])
+            columns = [
+                summary[sym] if sym in summary else data["values"][data["columns"][sym]] for sym in args
+            ]  # constant summary statistics or time series
+            series = [
+                [data["times"][i]] + [col if sym in summary else col[i] for sym, col in zip(args, columns, strict=True)]
+                for i in rows
+            ]
+        else:  # only summary statistics. Evaluate once at the end time
+            series = [[max(data["times"]) if len(data["times"]) else 0.0] + [summary[sym] for sym in args]]
+        res = self.eval_series(key, series, ret=None if len(cols) else "bool")
+        self._robustness[key] = self.robustness(key, series)
         if self._temporal[key]["type"] == Temporal.A:
             self.assertions(key, res[1], None, case_name)
         elif self._temporal[key]["type"] == Temporal.F:
             self.assertions(key, res[1], f"@{res[0]}", case_name)
         elif self._temporal[key]["type"] == Temporal.T:
             self.assertions(key, res[1], f"@{res[0]} (interpolated)", case_name)
+        elif self._temporal[key]["type"] == Temporal.E:
+            self.assertions(key, res[1], None if res[1] else f"No response to trigger @{res[0]}", case_name)
+        elif self._temporal[key]["type"] == Temporal.H:
+            self.assertions(key, res[1], f"@{res[0]}" if res[1] else None, case_name)
+        elif self._temporal[key]["type"] == Temporal.W:
+            self.assertions(key, res[1], None if res[1] else f"Violated @{res[0]}", case_name)
         return res[1]
 
+    @staticmethod
+    def _check_ranges(data: dict, cols: list[int], temporal: dict):
+        """Ensure that the symbols of other cases (see _retrieve()) cover the times evaluated by the assertion.
+        These are the time argument for T, the complete records of the own symbols within the window for W
+        and all complete records of the own symbols otherwise.
+        An AssertionError is raised if an evaluated time lies outside the time range of another case.
+        """
+        cross = [c for c in cols if c in data["ranges"]]
+        own = [c for c in cols if c not in data["ranges"]]
+        times = np.asarray(data["times"], dtype=float)
+        if temporal["type"] == Temporal.T:
+            evaluated = np.array(temporal["args"][:1], dtype=float)
+            inside = {
+                c: (evaluated >= data["ranges"][c][1] - 1e-9) & (evaluated <= data["ranges"][c][2] + 1e-9)
+                for c in cross
+            }
+        elif len(own):
+            evaluated = times
+            complete = data["present"][own].all(axis=0) & data["found"][own].any(axis=0)
+            if temporal["type"] == Temporal.W:
+                complete &= (times >= temporal["args"][0]) & (times <= temporal["args"][1])
+            inside = {c: ~complete | data["present"][c] for c in cross}
+        else:  # only symbols of other cases. Their records are all inside
+            return
+        for c in cross:
+            outside = np.flatnonzero(~inside[c])
+            if len(outside):
+                name, start, end = data["ranges"][c]
+                raise AssertionError(f"Time {evaluated[outside[0]]} outside of the time range {start}..{end} of {name}")
+
+    @staticmethod
+    def _row_args(row: Any, argnames: list) -> tuple[float, Any]:
+        """Split the data row into the time and the function arguments (see eval_series)."""
+        if not isinstance(row, Iterable):  # can happen if the time itself is evaluated
+            return (row, [row])
+        elif "t" not in argnames:  # the independent variable is not explicitly used in the expression
+            assert len(row) > 1, f"Time data in eval_series seems to be lacking. Row:{row}, Argnames:{argnames}"
+            return (row[0], row[1:])
+        else:  # time used also explicitly in the expression
+            return (row[0], row)
+
+    def robustness(self, key: str, data: list[Any]) -> float | None:
+        """Calculate the robustness of the assertion 'key' on the (time) series 'data' (see eval_series()).
+
+        The robustness is the signed margin by which the assertion is satisfied (positive) or violated (negative).
+        The margins of the rows (see robustness_expr()) are reduced according to the temporal type:
+
+        * A: the minimum margin
+        * F: the maximum over t of the minimum margin from t to the end
+        * T: the margin interpolated at the time
+        * E: the minimum over the triggers of max(-trigger margin, maximum response margin within dt)
+        * H: the maximum over t of the minimum margin within [t, t+dt]
+        * W: the minimum margin within the window
+
+        Returns
+        -------
+            The robustness (float) or None if not available for the expression or temporal type
+        """
+        if self._compiled_robustness.get(key) is None or not len(data):
+            return None
+        argnames = self._syms[key]
+        loc = self.make_locals(locals())
+        exec(self._compiled_robustness[key], loc, loc)
+        func = loc["_" + key]
+        _times, _margins = [], []
+        for row in data:
+            time, row = Assertion._row_args(row, argnames)
+            _times.append(time)
+            _margins.append(func(*row))
+        times = np.array(_times, dtype=float)
+        margins = np.array(_margins, dtype=float)
+        typ, args = self._temporal[key]["type"], self._temporal[key]["args"]
+        if typ == Temporal.E:
+            assert margins.ndim == 2, f"Expression {key} shall return (trigger, response)"
+            complete = times + args[0] <= times[-1]
+            if not np.any(complete):
+                return None
+            return float(np.min(np.maximum(-margins[:, 0], window_max(times, margins[:, 1], args[0]))[complete]))
+        elif len(margins) == 1:  # single point evaluation
+            return float(margins[0])
+        elif typ == Temporal.A:
+            return float(np.min(margins))
+        elif typ == Temporal.F:  # the expression shall become True before the end and remain True
+            return float(np.max(np.minimum.accumulate(margins[::-1])[1:]))
+        elif typ == Temporal.T:
+            return float(np.interp(args[0], times, margins))
+        elif typ == Temporal.H:
+            complete = times + args[0] <= times[-1]
+            return float(np.max(window_min(times, margins, args[0])[complete])) if np.any(complete) else None
+        elif typ == Temporal.W:
+            window = (times >= args[0]) & (times <= args[1])
+            return float(np.min(margins[window])) if np.any(window) else None
+        return None
+
+    @staticmethod
+    def _eval_window(typ: Temporal, args: tuple, times: np.ndarray, results: list) -> tuple[float, bool]:
+        """Evaluate the windowed temporal operator typ (E, H or W) on the boolean results at times (see eval_series)."""
+        assert len(times), "No data to evaluate"
+        if typ == Temporal.E:
+            assert len(args) == 1, f"Time span dt expected as argument of Temporal.E. Found {args}"
+            trigger, response = (np.array(r, dtype=bool) for r in zip(*results, strict=True))
+            responded = window_max(times, response, args[0])
+            violated = trigger & ~responded & (times + args[0] <= times[-1])
+        elif typ == Temporal.H:
+            assert len(args) == 1, f"Time span dt expected as argument of Temporal.H. Found {args}"
+            holds = window_min(times, np.array(results, dtype=bool), args[0]) & (times + args[0] <= times[-1])
+            if np.any(holds):
+                return (float(times[np.argmax(holds)]), True)
+            return (float(times[-1]), False)
+        else:
+            assert len(args) == 2, f"Time window (t0, t1) expected as arguments of Temporal.W. Found {args}"
+            violated = (times >= args[0]) & (times <= args[1]) & ~np.array(results, dtype=bool)
+        if np.any(violated):
+            return (float(times[np.argmax(violated)]), False)
+        return (float(times[-1] if typ == Temporal.E else args[1]), True)
+
+    def do_assert(self, key: str, result: Any, case_name: str | None = None):
+        """Perform assert action 'key' on data of 'result' object."""
+        assert isinstance(key, str) and key in self._temporal, f"Assertion key {key} not found"
+        from sim_explorer.case import Results
+
+        assert isinstance(result, Results), f"Results object expected. Found {result}"
+        return self._assert_data(key, self._retrieve([key], result), case_name)
+
     def do_assert_case(self, result: Any) -> list[int]:
-        """Perform all assertions defined for the case related to the result object."""
+        """Perform all assertions defined for the case related to the result object.
+        The data of all assertions are retrieved in a single pass and shared between the assertions.
+        """
+        from sim_explorer.case import Results
+
+        assert isinstance(result, Results), f"Results object expected. Found {result}"
+        keys = result.asserts
+        data = self._retrieve(keys, result)
+        case_name = result.case_name
         count = [0, 0]
-        for key in result.case.asserts:
-            self.do_assert(key, result, result.case.name)
+        for key in keys:
+            self._assert_data(key, data, case_name)
             count[0] += self._assertions[key]["passed"]
             count[1] += 1
         return count
@@ -437,6 +779,7 @@ class Assertion:
                 temporal=self._temporal[key].get("type", None),
                 case=self._assertions[key].get("case", None),
                 details="No details",
+                robustness=self._robustness.get(key),
             )
 
         from sim_explorer.case import Case
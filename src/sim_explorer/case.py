@@ -1,23 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import multiprocessing
 import os
-from collections.abc import Callable
+import queue
+import re
+import shutil
+import threading
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from functools import partial
 from pathlib import Path
-from typing import Any, Iterable, List
+from time import perf_counter
+from typing import Any, Iterable
 
 import matplotlib.pyplot as plt
 import numpy as np
+from libcosimpy.CosimEnums import CosimVariableType  # type: ignore
 from libcosimpy.CosimLogging import CosimLogLevel, log_output_level  # type: ignore
+from matplotlib.figure import Figure
 
 from sim_explorer.assertion import Assertion  # type: ignore
-from sim_explorer.exceptions import CaseInitError
+from sim_explorer.exceptions import CaseCancelledError, CaseInitError
 from sim_explorer.json5 import Json5
+from sim_explorer.metrics import write_metrics
 from sim_explorer.models import AssertionResult, Temporal
+from sim_explorer.run_cache import RunCache
 from sim_explorer.simulator_interface import SimulatorInterface
-from sim_explorer.utils.misc import from_xml
+from sim_explorer.utils.misc import from_xml, minmax_decimate
 from sim_explorer.utils.paths import get_path, relative_path
+from sim_explorer.utils.streaming import SeriesSummary
 
 """
 sim_explorer module for definition and execution of simulation experiments
@@ -73,6 +87,9 @@ class Case:
         self.js = Json5(spec)
         self.description = self.js.jspath("$.description", str) or ""
         self.subs: list = []  # own subcases
+        if self.name == "results":
+            raise ValueError("'results' should not be used as case name. Add general results to 'base'")
+        self.cases.register_case(self)  # ensures uniqueness of the name
 
         if name == "base":
             self.parent = None
@@ -83,18 +100,25 @@ class Case:
             self.parent = parent_case
             self.parent.append(self)
 
-        if self.name == "results":
-            raise ValueError("'results' should not be used as case name. Add general results to 'base'")
-        elif self.name == "base":  # take over the results info and activities
+        if self.name == "base":  # take over the results info and activities
             assert special is not None, "startTime and stopTime settings needed for 'base'"
             self.special = special
             self.act_get: dict = {}
             self.act_set: dict = {}  # no set actions during results collection
+            self.act_summary: list = []  # get actions of variables where only summary statistics are kept
         else:
             assert isinstance(self.parent, Case), f"Parent case expected for case {self.name}"
             self.special = dict(self.parent.special)
             self.act_get = Case._actions_copy(self.parent.act_get)
             self.act_set = Case._actions_copy(self.parent.act_set)
+            self.act_summary = list(self.parent.act_summary)
+        # recording policies {case variable : policy}. Inherited from the parent case
+        self.record: dict[str, str] = {} if self.parent is None else dict(self.parent.record)
+        for k, v in (self.js.jspath("$.record", dict) or {}).items():
+            if k not in self.cases.variables:
+                raise CaseInitError(f"Recording policy for unknown variable {k} in case {self.name}") from None
+            _ = Case._record_policy(v)  # check the policy
+            self.record.update({k: v})
 
         for k, v in self.js.jspath("$.spec", dict, True).items():
             self.read_spec_item(k, v)
@@ -115,6 +139,7 @@ class Case:
 
     def add_results_object(self, res: Results):
         self.res = res
+        self.cases.assertion.register_results(self.name, res)  # make the results available as <case>.<symbol>
 
     def iter(self):
         """Construct an iterator, allowing iteration from base case to this case through the hierarchy."""
@@ -130,19 +155,21 @@ class Case:
 
     def case_by_name(self, name: str) -> "Case" | None:
         """Find the case 'name' within sub-hierarchy of this case. Return None if not found.
+        The case is looked up in the name index of Cases and accepted if this case is one of its ancestors.
 
         Args:
             name (str): the case name to find
         Returns:
             The case object or None
         """
-        for c in self.subs:
-            if c.name == name:
-                return c
-            else:
-                found = c.case_by_name(name)
-                if found is not None:
-                    return found
+        found = self.cases.case_by_name(name)
+        if found is None:
+            return None
+        parent = found.parent
+        while parent is not None:
+            if parent is self:
+                return found
+            parent = parent.parent
         return None
 
     def append(self, case: "Case"):
@@ -192,6 +219,56 @@ class Case:
         else:  # no action for this time yet
             dct.update({at_time: [partial(action, *args)]})
 
+    @staticmethod
+    def _record_policy(txt: str) -> tuple[str, float]:
+        """Disect the recording policy 'txt' of a variable into (type, threshold).
+
+        * 'change': record only when the value changes. Returns ('abs', 0.0)
+        * 'deadband <float>': record only when the value changes more than the absolute deadband. Returns ('abs', <float>)
+        * 'deadband <float>%': record only when the value changes more than the relative deadband. Returns ('rel', <float>/100)
+        """
+        words = txt.split() if isinstance(txt, str) else []
+        if words == ["change"]:
+            return ("abs", 0.0)
+        elif len(words) == 2 and words[0] == "deadband":
+            try:
+                if words[1].endswith("%"):
+                    return ("rel", float(words[1][:-1]) / 100)
+                return ("abs", float(words[1]))
+            except ValueError:
+                pass
+        raise CaseInitError(f"Unknown recording policy '{txt}'. Use 'change' or 'deadband <float>[%]'") from None
+
+    @staticmethod
+    def _record_changed(policy: tuple[str, float], old: list, new: list) -> bool:
+        """Check whether the value 'new' shall be recorded with respect to the last recorded value 'old'.
+        Non-numeric values are recorded when they change.
+        """
+        typ, threshold = policy
+        for o, n in zip(old, new, strict=False):
+            if isinstance(n, (bool, str)) or isinstance(o, (bool, str)):
+                if n != o:
+                    return True
+            elif typ == "abs":
+                if abs(n - o) > threshold:
+                    return True
+            elif abs(n - o) > threshold * abs(o):  # relative deadband
+                return True
+        return False
+
+    def _record_policies(self) -> dict[tuple[int, tuple], tuple[str, float]]:
+        """Translate the recording policies to {(instance id, value references) : policy} for the get actions."""
+        policies = {}
+        if len(self.record):
+            for actions in self.act_get.values():
+                for a in actions:
+                    _, var = self.cases.comp_refs_to_case_var(a.args[0], tuple(a.args[2]))
+                    if var.partition("[")[0] in self.record:
+                        policies[(a.args[0], tuple(a.args[2]))] = Case._record_policy(
+                            self.record[var.partition("[")[0]]
+                        )
+        return policies
+
     @staticmethod
     def _num_elements(obj) -> int:
         if obj is None:
@@ -203,7 +280,8 @@ class Case:
         else:
             return 1
 
-    def _disect_at_time_tl(self, txt: str, value: Any | None = None) -> tuple[str, Temporal, tuple]:
+    @staticmethod
+    def _disect_at_time_tl(txt: str, value: Any | None = None) -> tuple[str, Temporal, tuple]:
         """Disect the @txt argument into 'at_time_type' and 'at_time_arg' for Temporal specification.
 
         Args:
@@ -224,19 +302,21 @@ class Case:
                 arg_float = float(at)
                 return (Temporal["T"], (arg_float,))
             except ValueError:
-                for i in range(len(at) - 1, -1, -1):
-                    try:
-                        typ = Temporal[at[i]]
-                    except KeyError:
-                        pass
+                match = re.match(r"([A-Z]+)\s*(.*)$", at.strip())
+                try:
+                    typ = Temporal[match.group(1)]  # type: ignore [union-attr]
+                    arg = match.group(2).strip()  # type: ignore [union-attr]
+                    if arg == "":
+                        return (typ, ())
+                    elif typ in (Temporal.T, Temporal.E, Temporal.H):
+                        return (typ, (float(arg),))
+                    elif typ == Temporal.W:
+                        t0, t1 = (float(a) for a in arg.split(".."))
+                        return (typ, (t0, t1))
                     else:
-                        if at[i + 1 :].strip() == "":
-                            return (typ, ())
-                        elif typ == Temporal.T:
-                            return (typ, (float(at[i + 1 :].strip()),))
-                        else:
-                            return (typ, (at[i + 1 :].strip(),))
-                raise ValueError(f"Unknown Temporal specification {at}") from None
+                        return (typ, (arg,))
+                except (AttributeError, KeyError, ValueError):
+                    raise ValueError(f"Unknown Temporal specification {at}") from None
 
         pre, _, at = txt.partition("@")
         assert len(pre), f"'{txt}' is not allowed as basis for _disect_at_time"
@@ -258,7 +338,7 @@ class Case:
         -------
             tuple of pre, type, arg, where
             pre is the text before '@',
-            type is the type of action (get, set, step),
+            type is the type of action (get, set, step, summary),
             arg is the time argument, or -1
         """
 
@@ -269,7 +349,9 @@ class Case:
                 return ("set" if Case._num_elements(value) else "get", arg_float)
             except ValueError:
                 arg_float = float("-inf")
-                if at.startswith("step"):
+                if at.strip() == "summary":
+                    return ("summary", -1)  # running summary statistics, no time series
+                elif at.startswith("step"):
                     try:
                         return ("step", float(at[4:]))
                     except Exception:
@@ -279,7 +361,7 @@ class Case:
 
         pre, _, at = txt.partition("@")
         assert len(pre), f"'{txt}' is not allowed as basis for _disect_at_time"
-        if value in ("result", "res"):  # mark variable specification as 'get' or 'step' action
+        if value in ("result", "res"):  # mark variable specification as 'get', 'step' or 'summary' action
             value = None
         if not len(at):  # no @time spec
             if value is None:
@@ -303,6 +385,10 @@ class Case:
                * @A : The expression is expected to be Always (globally) true
                * @F : The expression is expected to be true during the end of the simulation
                * @<val> or @T<val>: The expression is expected to be true at the specific time value
+               * @E<dt>: The expression is a pair 'trigger, response'.
+                 Whenever the trigger is true, the response is expected to become true within dt
+               * @H<dt>: The expression is expected to hold continuously during at least dt
+               * @W<t0>..<t1>: The expression is expected to be true always within the time window [t0, t1]
             expr: A python expression using available variables
         """
         key, at_time_type, at_time_arg = self._disect_at_time_tl(key, expr_descr)
@@ -338,6 +424,9 @@ class Case:
            * @step optional-time-spec: Not allowed for set actions.
              Get actions performed at every communication point (no time-spec),
              or at time-spec time intervals
+           * @summary: Not allowed for set actions. The variable is read at every communication point,
+             but only running summary statistics (see SeriesSummary) are kept and stored in the results header.
+             The statistics are available as symbols <variable>_<stat> in assertions, e.g. 'x_max'
 
         Note: 'Get' actions can be specified in a few ways:
 
@@ -359,7 +448,7 @@ class Case:
             self.special.update({key: value})  # just keep these as a dictionary so far
         else:  # expect a  variable-alias : value(s) specificator
             key, at_time_type, at_time_arg = self._disect_at_time_spec(key, value)
-            if at_time_type in ("get", "step"):
+            if at_time_type in ("get", "step", "summary"):
                 value = None
             key, cvar_info, rng = self.cases.disect_variable(key)
             key = key.strip()
@@ -377,11 +466,20 @@ class Case:
                 if value is not None:
                     var_vals.append(value[i])
             # print(f"CASE.read_spec, {key}@{at_time_arg}({at_time_type}):{value}[{rng}], alias={cvar_info}")
-            if at_time_type in ("get", "step"):  # get actions
+            if at_time_type in ("get", "step", "summary"):  # get actions
                 for inst in cvar_info["instances"]:  # ask simulator to provide function to set variables:
                     _inst = self.cases.simulator.component_id_from_name(inst)
-                    if not self.cases.simulator.allowed_action("get", _inst, tuple(var_refs), 0):
-                        raise AssertionError(self.cases.simulator.message) from None
+                    msg = self.cases.simulator.action_error("get", _inst, tuple(var_refs), 0)
+                    if len(msg):
+                        raise AssertionError(msg) from None
+                    elif at_time_type == "summary":
+                        msg = f"No summary statistics of string variable {key}"
+                        assert cvar_info["type"] != CosimVariableType.STRING.value, msg
+                        action = partial(
+                            self.cases.simulator.get_variable_value, _inst, cvar_info["type"], tuple(var_refs)
+                        )
+                        if all(a.args != action.args for a in self.act_summary):
+                            self.act_summary.append(action)
                     elif at_time_type == "get" or at_time_arg == -1:  # normal get or step without time spec
                         self._add_action(
                             "get",
@@ -409,8 +507,9 @@ class Case:
                     assert at_time_arg <= self.special["startTime"], f"Initial settings at time {at_time_arg}?"
                     for inst in cvar_info["instances"]:  # ask simulator to provide function to set variables:
                         _inst = self.cases.simulator.component_id_from_name(inst)
-                        if not self.cases.simulator.allowed_action("set", _inst, tuple(var_refs), 0):
-                            raise AssertionError(self.cases.simulator.message) from None
+                        msg = self.cases.simulator.action_error("set", _inst, tuple(var_refs), 0)
+                        if len(msg):
+                            raise AssertionError(msg) from None
                         for ref, val in zip(var_refs, var_vals, strict=False):
                             self._add_action(
                                 at_time_type,
@@ -421,8 +520,9 @@ class Case:
                 else:
                     for inst in cvar_info["instances"]:  # ask simulator to provide function to set variables:
                         _inst = self.cases.simulator.component_id_from_name(inst)
-                        if not self.cases.simulator.allowed_action("set", _inst, tuple(var_refs), at_time_arg):
-                            raise AssertionError(self.cases.simulator.message) from None
+                        msg = self.cases.simulator.action_error("set", _inst, tuple(var_refs), at_time_arg)
+                        if len(msg):
+                            raise AssertionError(msg) from None
                         self._add_action(
                             at_time_type,
                             self.cases.simulator.set_variable_value,
@@ -477,29 +577,55 @@ class Case:
                 raise CaseInitError("'stepSize' should be specified as part of the 'base' specification.") from None
         return special
 
-    def run(self, dump: str | None = ""):
+    def results_file(self, dump: str = "") -> Path:
+        """Return the file where results are saved when the case is run with the argument 'dump' (see run())."""
+        if dump == "":
+            return self.cases.file.parent / (self.name + ".js5")
+        return Path(self.cases.file.parent / (dump if dump.endswith(".js5") else dump + ".js5"))
+
+    def run(
+        self,
+        dump: str | None = "",
+        writer: ResultsWriter | None = None,
+        on_saved: Callable | None = None,
+        cancel: Any = None,
+    ):
         """Set up case and run it.
 
         Args:
             dump (str): Optionally save the results as json file.
                 None: do not save, '': use default file name, str (with or without '.js5'): save with that file name
+            writer (ResultsWriter)=None: Optional background writer, saving the results while the next case is run
+            on_saved (Callable)=None: Optional function, called with the results file as argument when results are saved
+            cancel (Event)=None: Optional event (threading.Event or multiprocessing Event).
+                If set, the simulation is stopped, the simulator is reset and CaseCancelledError raised.
+                The event is checked at most every 0.1 seconds (wall time), since checking a Manager event
+                is a round trip to the manager process
         """
 
+        def add_result(time: int, a: partial):
+            """Perform the get action a and add the value to the results, if allowed by the recording policy."""
+            values = a()
+            counts["get"] += 1
+            key = (a.args[0], a.args[2])
+            policy = policies.get(key)
+            if policy is not None:
+                # values at the last executed step are always recorded (stopTime need not be a multiple of stepSize)
+                if time + tstep <= tstop and key in last and not Case._record_changed(policy, last[key], values):
+                    return
+                last[key] = values
+            self.res.add(time / self.cases.timefac, a.args[0], a.args[1], a.args[2], values)
+
         def do_actions(_t: float, _a, _iter, time: int, record: bool = True):
             while time >= _t:  # issue the _a - actions
                 if len(_a):
                     if record:
                         for a in _a:
-                            self.res.add(
-                                time / self.cases.timefac,
-                                a.args[0],
-                                a.args[1],
-                                a.args[2],
-                                a(),
-                            )
+                            add_result(time, a)
                     else:  # do not record
                         for a in _a:
                             a()
+                        counts["set"] += len(_a)
                     try:
                         _t, _a = next(_iter)
                     except StopIteration:
@@ -520,6 +646,12 @@ class Case:
         get_iter = self.act_get.items().__iter__()  # iterator over get actions => time, action_list
         act_step = None
         self.add_results_object(Results(self))
+        policies = self._record_policies()  # {(instance, refs) : recording policy}
+        last: dict[tuple[int, tuple], list] = {}  # last recorded values of variables with recording policy
+        counts = {"steps": 0, "get": 0, "set": 0}  # throughput telemetry
+        summaries = [(a, SeriesSummary(() if len(a.args[2]) == 1 else len(a.args[2]))) for a in self.act_summary]
+        wall = perf_counter()
+        next_poll = wall  # wall time of the next check of the cancel event
 
         while True:
             try:
@@ -540,16 +672,35 @@ class Case:
             time += tstep
             if time > tstop:
                 break
+            if cancel is not None and perf_counter() >= next_poll:
+                if cancel.is_set():
+                    self.cases.simulator.reset()  # releases the CosimExecution
+                    raise CaseCancelledError(f"Run of case {self.name} cancelled at time {time / self.cases.timefac}")
+                next_poll = perf_counter() + 0.1
             self.cases.simulator.simulator.simulate_until(time)
+            counts["steps"] += 1
             t_get, a_get = do_actions(t_get, a_get, get_iter, time)  # issue the current get actions
 
             if act_step is not None:  # there are step-always actions
                 for a in act_step:
-                    self.res.add(time / self.cases.timefac, a.args[0], a.args[1], a.args[2], a())
-
+                    add_result(time, a)
+            for a, summary in summaries:  # running summary statistics
+                summary.add(time / self.cases.timefac, a())
+            counts["get"] += len(summaries)
+
+        for a, summary in summaries:
+            if summary.count:
+                self.res.add_summary(a.args[0], a.args[2], summary.as_dict())
+        simulated = counts["steps"] * tstep / self.cases.timefac
+        self.res.add_telemetry(perf_counter() - wall, simulated, counts["steps"], counts["get"], counts["set"])
         self.cases.simulator.reset()
         if dump is not None:
-            self.res.save(dump)
+            if writer is None:
+                self.res.save(dump)
+                if on_saved is not None:
+                    on_saved(self.res.file)
+            else:
+                writer.put(self.res, dump, on_saved)
 
     @staticmethod
     def _actions_copy(actions: dict) -> dict:
@@ -565,6 +716,23 @@ class Case:
             res.update({t: action_list})
         return res
 
+    def branch_time(self, other: Case) -> float:
+        """Determine the time up to which this case and the case 'other' perform identical simulations,
+        i.e. the first time where their set actions differ (get actions do not influence the simulation).
+        If the simulations are identical, the smaller stopTime is returned.
+
+        This is the time up to which sibling cases could share a simulated prefix.
+        Note: The simulator does not provide saving and restoring of FMU states (fmi2GetFMUstate/fmi2SetFMUstate),
+        such that each case is still run from startTime.
+        """
+        if any(self.special[k] != other.special[k] for k in ("startTime", "stepSize")):
+            return self.special["startTime"]
+        for t in sorted(set(self.act_set) | set(other.act_set)):
+            actions = {(a.func.__name__, a.args) for a in self.act_set.get(t, [])}
+            if actions != {(a.func.__name__, a.args) for a in other.act_set.get(t, [])}:
+                return max(t / self.cases.timefac, self.special["startTime"])
+        return min(self.special["stopTime"], other.special["stopTime"])
+
     @staticmethod
     def str_act(action: Callable):
         """Prepare a human readable view of the action."""
@@ -597,10 +765,11 @@ class Cases:
         "variables",
         "base",
         "assertion",
+        "_case_index",
+        "_ref_index",
         "_comp_refs_to_case_var_cache",
         "results_print_type",
     )
-    assertion_results: List[AssertionResult] = []
 
     def __init__(self, spec: str | Path, simulator: SimulatorInterface | None = None):
         self.file = Path(spec)  # everything relative to the folder of this file!
@@ -630,6 +799,7 @@ class Cases:
         self.assertion = Assertion()
         self.assertion.register_vars(self.variables)  # register variables as symbols
         self._comp_refs_to_case_var_cache: dict = dict()  # cache used by comp_refs_to_case_var()
+        self._case_index: dict[str, Case] = {}  # name index of all cases, filled by register_case()
         self.read_cases()
 
     def get_case_variables(self) -> dict[str, dict]:
@@ -643,8 +813,12 @@ class Cases:
                         'variability': CosimVariableVariability}.
 
         Optionally a description of the alias variable may be provided (and added to the dictionary).
+
+        In addition the reverse index self._ref_index { (instance, valueReference) : {c_var_name : element index}}
+        is built, which is used to find case variables from simulator references (see case_var_by_ref()).
         """
         variables = {}
+        self._ref_index: dict[tuple[str, int], dict[str, int]] = {}
         for k, v in self.js.jspath("$.header.variables", dict, True).items():
             if not isinstance(v, list):
                 raise CaseInitError(f"List of 'component(s)' and 'variable(s)' expected. Found {v}") from None
@@ -686,6 +860,9 @@ class Cases:
                 }
             )
             variables.update({k: var})
+            for inst in comp:
+                for idx, ref in enumerate(_vars):
+                    self._ref_index.setdefault((inst, ref), {}).setdefault(k, idx)
         return variables
 
     #     def get_alias_from_spec(self, modelname: str, instance: str, ref: Union[int, str]) -> str:
@@ -741,6 +918,29 @@ class Cases:
         else:
             raise CaseInitError(f"Main section 'base' is needed. Found {list(self.js.js_py.keys())}") from None
 
+    def register_case(self, case: Case):
+        """Register the case in the name index. Case names shall be unique within the cases file.
+
+        Args:
+            case (Case): the case object to register
+        """
+        if case.name == "header":
+            raise CaseInitError("The name 'header' is reserved and not allowed as case name") from None
+        elif case.name in self._case_index:
+            raise CaseInitError(f"Case name '{case.name}' is not unique") from None
+        self._case_index[case.name] = case
+
+    def unregister_case(self, case: Case):
+        """Remove the (virtual) case from the name index, from the sub-cases of its parent and its results
+        from the results registered for assertions (see Assertion.register_results()).
+        Used to discard cases which are generated on the fly, e.g. the samples of a Monte Carlo study.
+        """
+        assert self._case_index.get(case.name) is case, f"Case {case.name} is not registered"
+        del self._case_index[case.name]
+        self.assertion.unregister_results(case.name)
+        if case.parent is not None:
+            case.parent.subs.remove(case)
+
     def case_by_name(self, name: str) -> Case | None:
         """Find the case 'name' amoung all defined cases. Return None if not found.
 
@@ -751,13 +951,7 @@ class Cases:
         """
         if name == "header":
             raise ValueError("The name 'header' is reserved and not allowed as case name") from None
-        elif name == "base":
-            return self.base
-        else:
-            found = self.base.case_by_name(name)
-            if found is not None:
-                return found
-        return None
+        return self._case_index.get(name)
 
     def case_var_by_ref(self, comp: int | str, ref: int | tuple[int, ...]) -> tuple[str, tuple]:
         """Get the case variable name related to the component model `comp` and the reference `ref`
@@ -765,13 +959,21 @@ class Cases:
         """
         component = self.simulator.component_name_from_id(comp) if isinstance(comp, int) else comp
         refs = (ref,) if isinstance(ref, int) else ref
-
-        for var, info in self.variables.items():
-            if component in info["instances"] and all(r in info["variables"] for r in refs):
-                if len(refs) == len(info["variables"]):  # the whole variable is addressed
+        if not len(refs):
+            return ("", ())
+        # candidates are the case variables containing the first ref. The others shall be in the same variable
+        for var, idx0 in self._ref_index.get((component, refs[0]), {}).items():
+            idx = [idx0]
+            for r in refs[1:]:
+                i = self._ref_index.get((component, r), {}).get(var)
+                if i is None:
+                    break
+                idx.append(i)
+            else:
+                if len(refs) == len(self.variables[var]["variables"]):  # the whole variable is addressed
                     return (var, ())
                 else:
-                    return (var, tuple([info["variables"].index(r) for r in refs]))
+                    return (var, tuple(idx))
         return ("", ())
 
     def disect_variable(self, key: str, err_level: int = 2) -> tuple[str, dict, list | range]:
@@ -905,9 +1107,23 @@ class Cases:
             self._comp_refs_to_case_var_cache[comp].update({refs: (component, var)})
         return component, var
 
-    def run_case(self, name: str | Case, dump: str | None = "", run_subs: bool = False, run_assertions: bool = False):
+    def run_case(
+        self,
+        name: str | Case,
+        dump: str | None = "",
+        run_subs: bool = False,
+        run_assertions: bool = False,
+        cache: RunCache | None = None,
+        metrics: str | Path | None = None,
+    ):
         """Initiate case run. If done from here, the case name can be chosen.
         If run_subs = True, also the sub-cases are run.
+        The results of the sub-cases are then saved by a background writer, while the next case is run.
+        All results are saved when the function returns and saving errors are raised.
+        If a RunCache is provided (and results are saved), cases which were run before with identical
+        case specification and system are not simulated, but their stored results are used.
+        If a metrics file is provided, the throughput telemetry of the cases (see Results.telemetry)
+        is written to that file in the Prometheus exposition format.
         """
         if isinstance(name, str):
             c = self.case_by_name(name)
@@ -917,17 +1133,267 @@ class Cases:
         else:
             raise ValueError(f"Invalid argument name:{name}") from None
 
-        c.run(dump)
+        if not run_subs or dump is None:
+            self._run_case(c, dump, run_subs, run_assertions, None, cache)
+        else:
+            writer = ResultsWriter()
+            try:
+                self._run_case(c, dump, run_subs, run_assertions, writer, cache)
+            except BaseException:
+                writer.close(raise_errors=False)  # flush what is there, but report the original error
+                raise
+            writer.close()
+        if metrics is not None:
+            write_metrics(metrics, [_c.res for _c in (c.list_cases(as_name=False, flat=True) if run_subs else [c])])
+
+    def _run_case(
+        self,
+        c: Case,
+        dump: str | None,
+        run_subs: bool,
+        run_assertions: bool,
+        writer: ResultsWriter | None,
+        cache: RunCache | None,
+    ):
+        """Run the case c and optionally (run_subs) its sub-cases recursively. See run_case()."""
+        key = cache.key(c) if cache is not None and dump is not None else None
+        cached = cache.load(key) if cache is not None and key is not None else None
+        on_saved = partial(cache.store, key) if cache is not None and key is not None else None
+        # the writer gets the results only after the assertions, since saving changes the results header
+        deferred = writer is not None and run_assertions and dump is not None
+        if cached is not None and dump is not None:  # use the stored results instead of simulating
+            wall = perf_counter()
+            file = c.results_file(dump)
+            shutil.copyfile(cached, file)
+            res = Results(file=file)
+            res.add_telemetry(perf_counter() - wall, 0.0, 0, 0, 0, cached=True)  # nothing simulated in this run
+            c.add_results_object(res)
+            deferred = False
+        else:
+            c.run(None if deferred else dump, writer, on_saved)
 
         if run_assertions and c:
             # Run assertions on every case after running the case -> results will be saved in memory for now
             self.assertion.do_assert_case(c.res)
+        if deferred:
+            assert writer is not None and dump is not None, "Deferred saving needs a writer"
+            writer.put(c.res, dump, on_saved)
 
         if not run_subs:
             return None
 
         for _c in c.subs:
-            self.run_case(_c, dump, run_subs, run_assertions)
+            self._run_case(_c, dump, run_subs, run_assertions, writer, cache)
+
+    async def arun_case(
+        self, name: str | Case, dump: str = "", run_assertions: bool = True, executor: Executor | None = None
+    ) -> tuple[Results, list[AssertionResult]]:
+        """Asynchronous counterpart of run_case() for a single case (without sub-cases).
+        The simulation is run in an executor (see arun_cases()), i.e. the event loop is not blocked.
+
+        Returns
+        -------
+            The results object and the list of assertion results of the case
+        """
+        case = name if isinstance(name, Case) else self.case_by_name(name)
+        assert isinstance(case, Case), f"Case {name} not found"
+        async with contextlib.aclosing(self._arun({case: dump}, run_assertions, executor, 1)) as finished:
+            async for _, res, asserts in finished:
+                return (res, asserts)
+        raise AssertionError(f"No results for case {case.name}")  # not reached
+
+    async def arun_cases(
+        self,
+        names: list[str] | None = None,
+        run_subs: bool = False,
+        run_assertions: bool = True,
+        executor: Executor | None = None,
+        max_concurrent: int | None = None,
+    ) -> AsyncIterator[tuple[Case, Results, list[AssertionResult]]]:
+        """Run cases concurrently and iterate asynchronously over the finished cases, in order of completion.
+        Results are saved with the default file names and added to the cases (offline results when run in another process).
+
+        Args:
+            names (list)=None: Names of the cases to run. None: the 'base' case
+            run_subs (bool)=False: Run also all sub-cases of the named cases
+            run_assertions (bool)=True: Evaluate the assertions of the cases
+            executor (Executor)=None: Optional ThreadPoolExecutor or ProcessPoolExecutor running the simulations.
+                Every run uses its own Cases object and simulator. None: a thread pool with max_concurrent threads
+            max_concurrent (int)=None: The maximum number of concurrent simulations. None: no limit
+
+        Yields
+        ------
+            Tuples of case object, results object and list of assertion results
+
+        Cancellation (of the consuming task or through aclose()) stops the running simulations (see Case.run())
+        and returns when their simulators are released.
+        """
+        todo = self._todo(names, run_subs)
+        async with contextlib.aclosing(self._arun(todo, run_assertions, executor, max_concurrent)) as finished:
+            async for item in finished:
+                yield item
+
+    def _todo(self, names: list[str] | None, run_subs: bool) -> dict[Case, str]:
+        """Collect the cases to run {case : dump, ...}, using the default results file names."""
+        todo: dict[Case, str] = {}
+        for name in names or ["base"]:
+            case = self.case_by_name(name)
+            assert isinstance(case, Case), f"Case {name} not found"
+            for c in case.list_cases(as_name=False, flat=True) if run_subs else [case]:
+                todo[c] = ""  # type: ignore[index]
+        return todo
+
+    def run_cases(
+        self,
+        names: list[str] | None = None,
+        run_subs: bool = False,
+        run_assertions: bool = True,
+        max_workers: int | None = None,
+    ) -> list[tuple[Case, Results, list[AssertionResult]]]:
+        """Run cases in a thread pool. Each run uses its own Cases object and simulator (see arun_cases()).
+        libcosim releases the GIL while stepping the simulation, such that independent systems are stepped in parallel.
+
+        Args:
+            names (list)=None: Names of the cases to run. None: the 'base' case
+            run_subs (bool)=False: Run also all sub-cases of the named cases
+            run_assertions (bool)=True: Evaluate the assertions of the cases
+            max_workers (int)=None: The number of threads. None: the ThreadPoolExecutor default
+
+        Returns
+        -------
+            List of tuples of case object, results object and list of assertion results, in order of the cases
+        """
+        assert isinstance(self.simulator.sysconfig, Path), "Concurrent runs need a system defined through a file"
+        todo = self._todo(names, run_subs)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_run_case_task, str(self.file.resolve()), c.name, dump, run_assertions, None, True)
+                for c, dump in todo.items()
+            ]
+            finished = []
+            for case, future in zip(todo, futures, strict=True):
+                res, asserts = future.result()
+                assert isinstance(res, Results), f"Results object expected. Found {res}"
+                case.add_results_object(res)
+                finished.append((case, res, asserts))
+        return finished
+
+    async def _arun(
+        self,
+        todo: dict[Case, str],
+        run_assertions: bool,
+        executor: Executor | None,
+        max_concurrent: int | None,
+    ) -> AsyncIterator[tuple[Case, Results, list[AssertionResult]]]:
+        """Run the cases {case : dump, ...} in the executor. See arun_cases()."""
+        assert isinstance(self.simulator.sysconfig, Path), "Concurrent runs need a system defined through a file"
+        own = executor is None
+        pool: Executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_concurrent)
+        manager = multiprocessing.Manager() if isinstance(pool, ProcessPoolExecutor) else None
+        cancel = threading.Event() if manager is None else manager.Event()
+        limit = asyncio.Semaphore(max_concurrent or len(todo))
+        running: list[Future] = []
+
+        async def run(case: Case, dump: str) -> tuple[Case, Results, list[AssertionResult]]:
+            async with limit:
+                future = pool.submit(
+                    _run_case_task, str(self.file.resolve()), case.name, dump, run_assertions, cancel, manager is None
+                )
+                running.append(future)
+                res, asserts = await asyncio.wrap_future(future)
+            if not isinstance(res, Results):  # results file from another process
+                res = await asyncio.to_thread(Results, file=res)
+            case.add_results_object(res)
+            return (case, res, asserts)
+
+        tasks = [asyncio.ensure_future(run(c, dump)) for c, dump in todo.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            cancel.set()  # stop running simulations (no effect if all are done)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if len(running):  # wait until the simulators of the running cases are released
+                await asyncio.gather(*(asyncio.wrap_future(f) for f in running), return_exceptions=True)
+            if own:
+                pool.shutdown(wait=False)
+            if manager is not None:
+                manager.shutdown()
+
+
+def _run_case_task(
+    file: str, name: str, dump: str, run_assertions: bool, cancel: Any = None, in_process: bool = False
+) -> tuple[Results | str, list[AssertionResult]]:
+    """Run the case 'name' of the cases file 'file' in a new Cases object.
+    This is the executor task of Cases.run_cases() and the asynchronous API (see Cases.arun_cases()),
+    i.e. the Cases object and the simulator are not shared between concurrent runs.
+
+    Returns
+    -------
+        The results object (in_process=True, e.g. in threads) or the results file
+        and the list of assertion results of the case
+    """
+    cases = Cases(file)
+    case = cases.case_by_name(name)
+    assert isinstance(case, Case), f"Case {name} not found in {file}"
+    case.run(dump, cancel=cancel)
+    res: Results | str = case.res if in_process else str(case.res.file)
+    if not run_assertions:
+        return (res, [])
+    cases.assertion.do_assert_case(case.res)
+    return (res, list(cases.assertion.report(case)))
+
+
+class ResultsWriter:
+    """Save Results objects (see Results.save()) in a background thread.
+
+    Serialization and file output of results then overlap with the next simulation run
+    (the simulator releases the GIL during simulation steps).
+    The queue of results waiting to be saved is bounded, i.e. put() blocks if the writer falls behind.
+
+    Args:
+        maxsize (int)=2: The maximum number of results waiting to be saved
+    """
+
+    def __init__(self, maxsize: int = 2):
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.errors: list[Exception] = []
+        self.thread = threading.Thread(target=self._work, name="ResultsWriter", daemon=True)
+        self.thread.start()
+
+    def put(self, res: Results, dump: str, on_saved: Callable | None = None):
+        """Hand the results 'res' over for saving (see Results.save()). Blocks while the queue is full.
+        The optional function on_saved is called with the results file as argument after saving.
+        """
+        assert self.thread.is_alive(), "The results writer is closed"
+        self.queue.put((res, dump, on_saved))
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:  # sentinel: close the writer
+                    return
+                res, dump, on_saved = item
+                res.save(dump)
+                if on_saved is not None:
+                    on_saved(res.file)
+            except Exception as err:
+                self.errors.append(err)
+            finally:
+                self.queue.task_done()
+
+    def close(self, raise_errors: bool = True):
+        """Save all remaining results and stop the writer thread.
+        The first error during saving is raised (if raise_errors).
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if raise_errors and len(self.errors):
+            raise self.errors[0]
 
 
 class Results:
@@ -937,6 +1403,10 @@ class Results:
     * Save case results as Json5 file
     * Read results from file and work with them
 
+    The header of saved results contains the case variable definitions and the assertions of the case.
+    Results read from such a file are worked with offline, i.e. without instantiating Cases or the simulator
+    (self.case is None). Results files without this information are read through the cases definition.
+
     Args:
         case (Case,str,Path)=None: The case object, the results relate to.
             When instantiating from Case (for collecting data) this shall be explicitly provided.
@@ -961,6 +1431,16 @@ class Results:
         self.file = Path(file)
         assert self.file.exists(), f"File {file} is expected to exist."
         self.res = Json5(self.file)
+        self._assertion: Assertion | None = None
+        variables = self.res.jspath("$.header.variables", dict)
+        if variables is not None:  # offline results. Variable metadata included in header
+            self.case = None
+            self.variables = {
+                k: dict(v, instances=tuple(v["instances"]), variables=tuple(v["variables"]))
+                for k, v in variables.items()
+            }
+            self._header_transform(False)
+            return
         case = Path(self.file.parent / (self.res.jspath("$.header.cases", str, True) + ".cases"))
         try:
             cases = Cases(Path(case))
@@ -969,12 +1449,15 @@ class Results:
         self.case: Case | None = cases.case_by_name(name=self.res.jspath(path="$.header.case", typ=str, errorMsg=True))
         assert isinstance(self.case, Case), f"Case {self.res.jspath( '$.header.case', str, True)} not found"
         assert isinstance(self.case.cases, Cases), "Cases object not defined"
+        self.variables = self.case.cases.variables
         self._header_transform(False)
         self.case.add_results_object(self)  # make Results object known to self.case
 
     def _init_new(self, case: Case, file: str | Path | None = ""):
         assert isinstance(case, Case), f"Case object expected as 'case' in Results. Found {type(case)}"
         self.case = case
+        self.variables = case.cases.variables
+        self._assertion = None
         if file is not None:  # use that for storing results data as Json5
             if file == "":  # use default file name (can be changed through self.save():
                 self.file = self.case.cases.file.parent / (self.case.name + ".js5")
@@ -1001,10 +1484,123 @@ class Results:
                 "casesDate": datetime.fromtimestamp(os.path.getmtime(self.case.cases.file)).isoformat(),
                 "timeUnit": self.case.cases.js.jspath("$.header.timeUnit", str) or "sec",
                 "timeFactor": self.case.cases.timefac,
+                "variables": {  # variable metadata, so that results can be used offline
+                    k: dict(v, instances=list(v["instances"]), variables=list(v["variables"]))
+                    for k, v in self.variables.items()
+                },
             }
         }
+        _assert = self.case.js.jspath("$.assert", dict)
+        if _assert is not None and len(_assert):  # the assertions of the case, for offline evaluation
+            results["header"].update({"assert": _assert})
+        if len(self.case.record):  # recording policies. These variables are reconstructed with zero-order hold
+            results["header"].update({"record": dict(self.case.record)})
         return results
 
+    @property
+    def case_name(self) -> str:
+        """The name of the case the results relate to."""
+        return self.res.jspath("$.header.case", str, True)
+
+    @property
+    def asserts(self) -> list:
+        """The list of assertion keys of the case."""
+        if self.case is not None:
+            return self.case.asserts
+        _assert = self.res.jspath("$.header.assert", dict) or {}
+        return [Case._disect_at_time_tl(k, v)[0] for k, v in _assert.items()]
+
+    @property
+    def assertion(self) -> Assertion:
+        """The Assertion object to evaluate the assertions of the case.
+        For offline results, the Assertion object is made from the variables and assertions in the header.
+        """
+        if self.case is not None:
+            return self.case.cases.assertion
+        if self._assertion is None:
+            self._assertion = Assertion()
+            self._assertion.register_vars(self.variables)
+            for k, v in (self.res.jspath("$.header.assert", dict) or {}).items():
+                key, at_time_type, at_time_arg = Case._disect_at_time_tl(k, v)
+                assert isinstance(v, list), f"Assertion expression {v} should include a description."
+                self._assertion.expr(key, v[0])
+                self._assertion.description(key, v[1])
+                self._assertion.temporal(key, at_time_type, at_time_arg)
+        return self._assertion
+
+    def add_telemetry(
+        self,
+        wall_time: float,
+        simulated_time: float,
+        steps: int,
+        get_actions: int,
+        set_actions: int,
+        cached: bool = False,
+    ):
+        """Add the throughput telemetry of the case run to the header.
+
+        Args:
+            wall_time (float): The wall-clock time of the simulation loop in seconds
+            simulated_time (float): The simulated time in seconds
+            steps (int): The number of macro time steps
+            get_actions (int): The number of get actions executed
+            set_actions (int): The number of set actions executed
+            cached (bool)=False: True if the results were taken from the run cache instead of simulating
+        """
+        telemetry = {
+            "wallTime": wall_time,
+            "simulatedTime": simulated_time,
+            "steps": steps,
+            "getActions": get_actions,
+            "setActions": set_actions,
+            "cached": cached,
+        }
+        self.res.update("$.header.telemetry", telemetry)
+
+    def add_summary(self, comp: int, refs: tuple[int, ...], stats: dict[str, Any]):
+        """Add the summary statistics of a variable recorded with '@summary' to the header.
+
+        Args:
+            comp (int): The index of the component
+            refs (tuple): The variable references of the summarized variable
+            stats (dict): {stat : value} as provided by SeriesSummary.as_dict()
+        """
+        compname, varname = self.case.cases.comp_refs_to_case_var(comp, tuple(refs))  # type: ignore [union-attr]
+        summary = self.res.jspath("$.header.summary", dict) or {}
+        summary.setdefault(compname, {}).update({varname: stats})
+        self.res.update("$.header.summary", summary)
+
+    @property
+    def summary(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """The summary statistics of the variables recorded with '@summary' (empty dict if not available).
+
+        Returns
+        -------
+            dict {component : {variable : {stat : value}}}, with the stats of SeriesSummary.STATS
+            (min, max, mean, rms, integral, argmin, argmax). Values of vector variables are lists.
+        """
+        return self.res.jspath("$.header.summary", dict) or {}
+
+    @property
+    def telemetry(self) -> dict[str, float]:
+        """The throughput telemetry of the case run (empty dict if not available).
+
+        Returns
+        -------
+            dict with the elements wallTime, simulatedTime, steps, getActions, setActions, cached (see add_telemetry()),
+            realTimeFactor (simulated seconds per wall-clock second) and stepsPerSecond (macro steps per wall-clock second)
+        """
+        telemetry = self.res.jspath("$.header.telemetry", dict)
+        if telemetry is None:
+            return {}
+        wall = max(telemetry["wallTime"], 1e-9)
+        return dict(
+            telemetry,
+            cached=telemetry.get("cached", False),
+            realTimeFactor=telemetry["simulatedTime"] / wall,
+            stepsPerSecond=telemetry["steps"] / wall,
+        )
+
     def _header_transform(self, tostring: bool = True):
         """Transform the header back- and forth between python types and string.
         tostring=True is used when saving to file and =False is used when reading from file.
@@ -1020,10 +1616,8 @@ class Results:
                 "$.header.casesDate",
                 res.jspath("$.header.casesDate", datetime, True).isoformat(),
             )
-            res.update(
-                "$.header.file",
-                relative_path(res.jspath("$.header.file", Path, True), self.file),
-            )
+            file = res.jspath("$.header.file", Path, True)
+            res.update("$.header.file", relative_path(file, self.file) if file.exists() else str(file))
         else:
             res.update(
                 "$.header.dateTime",
@@ -1033,10 +1627,13 @@ class Results:
                 "$.header.casesDate",
                 datetime.fromisoformat(res.jspath("$.header.casesDate", str, True)),
             )
-            res.update(
-                "$.header.file",
-                get_path(res.jspath("$.header.file", str, True), self.file.parent),
-            )
+            try:
+                file = get_path(res.jspath("$.header.file", str, True), self.file.parent)
+            except Exception:
+                if self.case is not None:
+                    raise
+                file = Path(res.jspath("$.header.file", str, True))  # cases file not needed for offline results
+            res.update("$.header.file", file)
 
     def add(self, time: float, comp: int, typ: int, refs: int | list[int], values: tuple):
         """Add the results of a get action to the results dict for the case.
@@ -1072,7 +1669,10 @@ class Results:
             if isinstance(jsfile, str):
                 if not jsfile.endswith(".js5"):
                     jsfile += ".js5"
-            jsfile = Path(self.case.cases.file.parent / jsfile)  # type: ignore [union-attr]
+            if self.case is None:  # offline results
+                jsfile = Path(self.file.parent / jsfile)
+            else:
+                jsfile = Path(self.case.cases.file.parent / jsfile)  # type: ignore [union-attr]
             self.file = jsfile  # remember the new file name
         self._header_transform(tostring=True)
         self.res.write(jsfile)
@@ -1090,8 +1690,6 @@ class Results:
             The info-dict is and element of Cases.variables. See Cases.get_case_variables() for definition.
         """
         cont: dict = {}
-        assert isinstance(self.case, Case)
-        assert isinstance(self.case.cases, Cases)
         for _time, components in self.res.js_py.items():
             if _time != "header":
                 time = float(_time)
@@ -1104,8 +1702,8 @@ class Results:
                                     cont[ident]["range"][1] = time  # update upper bound
                                     cont[ident]["len"] += 1  # update length
                                 else:  # new entry
-                                    v_name, v_info, v_range = self.case.cases.disect_variable(v, err_level=0)
-                                    assert len(v_name), f"Variable {v} not found in cases spec {self.case.cases.file}"
+                                    v_info = self.variables.get(v.partition("[")[0], {})
+                                    assert len(v_info), f"Variable {v} not found in case variables of {self.file}"
                                     cont.update(
                                         {
                                             ident: {
@@ -1124,11 +1722,31 @@ class Results:
             comp_var (Iterable): iterable of (<component-name>, <variable_name>[, element])
                Alternatively, the jspath syntax <component-name>.<variable_name>[[element]] can be used as comp_var.
                Time is not explicitly including in comp_var
-               A record is only included if all variable are found for a given time
-        Returns:
+               A record is only included if all variable are found for a given time.
+               Variables recorded with a recording policy (see Case.record) are reconstructed with zero-order hold,
+               i.e. the last recorded value is used for times where no value was recorded.
+
+        Returns
+        -------
             Data table (list of lists), time and one column per variable
         """
-        data = []
+        times, values, present, found = self.retrieve_columns(comp_var)
+        rows = np.flatnonzero(present.all(axis=0) & found.any(axis=0))
+        return [[times[i]] + [col[i] for col in values] for i in rows]
+
+    def retrieve_columns(self, comp_var: Iterable) -> tuple[list[float], list[list], np.ndarray, np.ndarray]:
+        """Retrieve the variables column-wise in a single pass through the results.
+        This is the basis of retrieve() and allows to retrieve the union of the variables of several evaluations
+        once, where each evaluation selects its complete records through the masks (see retrieve()).
+
+        Args:
+            comp_var (Iterable): iterable of (<component-name>, <variable_name>[, element]), see retrieve()
+
+        Returns
+        -------
+            tuple of times (all result times), values (one list per variable, None where not available),
+            present (bool array variables x times: value recorded or held) and found (bool array: value recorded)
+        """
         _comp_var = []
         for _cv in comp_var:
             el = None
@@ -1141,47 +1759,86 @@ class Results:
                 comp, var = _cv
             _comp_var.append((comp, var, el))
 
-        for key, values in self.res.js_py.items():
+        hold = self.res.jspath("$.header.record", dict) or {}  # variables with zero-order hold
+        held: dict[tuple[str, str], Any] = {}  # {(component, variable) : last recorded value}
+        times: list[float] = []
+        values: list[list] = [[] for _ in _comp_var]
+        present: list[list[bool]] = [[] for _ in _comp_var]
+        found: list[list[bool]] = [[] for _ in _comp_var]
+        for key, recorded in self.res.js_py.items():
             if key != "header":
-                time = float(key)
-                record = [time]
-                is_complete = True
-                for comp, var, el in _comp_var:
+                times.append(float(key))
+                for i, (comp, var, el) in enumerate(_comp_var):
                     try:
-                        _rec = values[comp][var]
+                        _rec = recorded[comp][var]
                     except KeyError:
-                        is_complete = False
-                        break  # give up
+                        _rec = held.get((comp, var))
+                        found[i].append(False)
                     else:
-                        record.append(_rec if el is None else _rec[el])
-
-                if is_complete:
-                    data.append(record)
-        return data
-
-    def plot_time_series(self, comp_var: Iterable, title: str = ""):
+                        found[i].append(True)
+                        if var.partition("[")[0] in hold:
+                            held[(comp, var)] = _rec
+                    present[i].append(_rec is not None)
+                    values[i].append(_rec if el is None or _rec is None else _rec[el])
+        shape = (len(_comp_var), len(times))
+        return (times, values, np.array(present, dtype=bool).reshape(shape), np.array(found, dtype=bool).reshape(shape))
+
+    def plot_time_series(
+        self,
+        comp_var: Iterable,
+        title: str = "",
+        file: str | Path | None = None,
+        decimate: bool = True,
+    ):
         """Extract the provided alias variables and plot the data found in the same plot.
 
         Args:
             comp_var (Iterable): Iterable of (<component-instance>,<variable>) tuples (as used in retrieve)
                Alternatively, the jspath syntax <component>.<variable> is also accepted
             title (str): optional title of the plot
+            file (str,Path)=None: Optional file (e.g. .png or .svg) to render the plot to (headless), instead of showing it
+            decimate (bool)=True: Plot only the min/max envelope per pixel column of the series.
+               The full resolution data are kept and the visible range is decimated again when zooming (interactive backends).
         """
+        comp_var = list(comp_var)
         data = self.retrieve(comp_var)
-        times = [rec[0] for rec in data]
+        times = np.array([rec[0] for rec in data], dtype=float)
+        fig = plt.figure() if file is None else Figure()
+        ax = fig.add_subplot()
+        buckets = int(ax.bbox.width) if decimate else 0  # number of pixels along x-axis
+        series = []  # (line, full resolution values)
         for i, var in enumerate(comp_var):
             if isinstance(var, str):
                 label = var
             else:
                 label = var[0] + "." + var[1]
                 if len(var) > 2:
-                    label += "[" + var[2] + "]"
-            values = [rec[i + 1] for rec in data]
-            plt.plot(times, values, label=var, linewidth=3)
+                    label += "[" + str(var[2]) + "]"
+            values = np.array([rec[i + 1] for rec in data], dtype=float)
+            if values.ndim == 1:  # scalar variable
+                columns = [(label, values)]
+            else:  # plot all elements of the variable
+                columns = [(f"{label}[{k}]", values[:, k]) for k in range(values.shape[1])]
+            for _label, y in columns:
+                (line,) = ax.plot(*minmax_decimate(times, y, buckets), label=_label, linewidth=3)
+                series.append((line, y))
+
+        def on_xlim_changed(ax):
+            """Decimate the visible part of the full resolution data."""
+            lo, hi = ax.get_xlim()
+            i0 = max(int(np.searchsorted(times, lo)) - 1, 0)
+            i1 = min(int(np.searchsorted(times, hi)) + 1, len(times))
+            for line, y in series:
+                line.set_data(*minmax_decimate(times[i0:i1], y[i0:i1], buckets))
 
         if len(title):
-            plt.title(title)
-        plt.xlabel("Time")
-        # plt.ylabel('Values')
-        plt.legend()
-        plt.show()
+            ax.set_title(title)
+        ax.set_xlabel("Time")
+        # ax.set_ylabel('Values')
+        ax.legend()
+        if file is not None:
+            fig.savefig(file)
+        else:
+            if decimate:
+                ax.callbacks.connect("xlim_changed", on_xlim_changed)
+            plt.show()
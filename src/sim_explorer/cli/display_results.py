@@ -46,7 +46,10 @@ def log_assertion_results(results: dict[str, list[AssertionResult]]):
             assertion_name = reconstruct_assertion_name(assertion)
 
             # Need to add some padding to show that the assertion belongs to a case
-            console.print(f"   [{status_color}]{status_icon}[/] [cyan]{assertion_name}[/cyan]: {assertion.description}")
+            margin = f" [dim](margin {assertion.robustness:.4g})[/dim]" if assertion.robustness is not None else ""
+            console.print(
+                f"   [{status_color}]{status_icon}[/] [cyan]{assertion_name}[/cyan]: {assertion.description}{margin}"
+            )
 
             if not assertion.result:
                 console.print("      [red]⚠️ Error:[/] [dim]Assertion has failed[/dim]")
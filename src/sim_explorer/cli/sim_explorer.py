@@ -7,8 +7,12 @@ import logging
 import sys
 from pathlib import Path
 
+from sim_explorer import work_queue
 from sim_explorer.case import Case, Cases
 from sim_explorer.cli.display_results import group_assertion_results, log_assertion_results
+from sim_explorer.diff import diff_many, diff_report
+from sim_explorer.run_cache import RunCache
+from sim_explorer.sensitivity import MEASURES, sensitivity, sensitivity_report
 from sim_explorer.utils.logging import configure_logging
 
 # Remove current directory from Python search path.
@@ -39,6 +43,23 @@ def _argparser() -> argparse.ArgumentParser:
         help="The sim-explorer specification file.",
     )
 
+    _ = parser.add_argument(
+        "--metrics",
+        action="store",
+        type=str,
+        help="write the throughput metrics of the run cases to METRICS (Prometheus text format).",
+        default=None,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Simulate all cases, even if stored results of an identical run exist in the run cache.",
+        default=False,
+        required=False,
+    )
+
     _ = parser.add_argument(
         "--info",
         action="store_true",
@@ -115,11 +136,265 @@ def _argparser() -> argparse.ArgumentParser:
     return parser
 
 
+def _diff_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sim-explorer diff",
+        usage="%(prog)s a b [options [args]]",
+        epilog="_________________sim-explorer___________________",
+        prefix_chars="-",
+        add_help=True,
+        description=(
+            "Compare results b with respect to results a. "
+            "a and b are results files, or folders where results files with the same name are compared."
+        ),
+    )
+
+    _ = parser.add_argument("a", metavar="a", type=str, help="The reference results file or folder.")
+    _ = parser.add_argument("b", metavar="b", type=str, help="The results file or folder to compare.")
+
+    _ = parser.add_argument(
+        "--rtol",
+        action="store",
+        type=float,
+        help="relative tolerance.",
+        default=1e-6,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--atol",
+        action="store",
+        type=float,
+        help="absolute tolerance.",
+        default=1e-9,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--all",
+        action="store_true",
+        help="list all compared series, not only the changed.",
+        default=False,
+        required=False,
+    )
+
+    return parser
+
+
+def diff(argv: list[str]) -> None:
+    """Run the 'diff' command (sim-explorer diff a b [options])."""
+    args = _diff_argparser().parse_args(argv)
+    a, b = Path(args.a), Path(args.b)
+    if a.is_dir() and b.is_dir():  # compare the results files with the same name
+        pairs = [(f, b / f.name) for f in sorted(a.glob("*.js5")) if (b / f.name).exists()]
+    elif a.is_file() and b.is_file():
+        pairs = [(a, b)]
+    else:
+        logger.error(f"sim-explorer.py diff: {a} and {b} shall both be files or both be folders.")
+        return
+    for (fa, _), diffs in zip(pairs, diff_many(pairs, args.rtol, args.atol), strict=True):
+        print(diff_report(diffs, fa.name, args.all), end="")
+
+
+def _worker_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sim-explorer worker",
+        usage="%(prog)s queue [options [args]]",
+        epilog="_________________sim-explorer___________________",
+        prefix_chars="-",
+        add_help=True,
+        description="Run case tasks from the work queue (a folder on a shared filesystem) until the queue is empty.",
+    )
+
+    _ = parser.add_argument("queue", metavar="queue", type=str, help="The work queue folder.")
+
+    _ = parser.add_argument(
+        "--wait",
+        action="store",
+        type=float,
+        help="time in seconds to wait for new tasks before stopping when the queue is empty.",
+        default=0.0,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--max-tasks",
+        action="store",
+        type=int,
+        help="maximum number of tasks to run.",
+        default=None,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--requeue",
+        action="store",
+        type=float,
+        help="first move tasks not refreshed by their worker for REQUEUE seconds (crashed workers) back to the queue.",
+        default=None,
+        required=False,
+    )
+
+    return parser
+
+
+def worker(argv: list[str]) -> None:
+    """Run the 'worker' command (sim-explorer worker queue [options])."""
+    args = _worker_argparser().parse_args(argv)
+    if args.requeue is not None:
+        work_queue.requeue(args.queue, args.requeue)
+    count = work_queue.work(args.queue, wait=args.wait, max_tasks=args.max_tasks)
+    print(f"{count} tasks run")
+
+
+def _submit_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sim-explorer submit",
+        usage="%(prog)s queue cases [options [args]]",
+        epilog="_________________sim-explorer___________________",
+        prefix_chars="-",
+        add_help=True,
+        description="Submit case tasks to the work queue (a folder on a shared filesystem), to be run by workers.",
+    )
+
+    _ = parser.add_argument("queue", metavar="queue", type=str, help="The work queue folder.")
+    _ = parser.add_argument("cases", metavar="cases", type=str, help="The sim-explorer specification file.")
+
+    _ = parser.add_argument(
+        "--case",
+        action="append",
+        type=str,
+        help="name of a case to run. Can be repeated. Default: base.",
+        default=None,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--subs",
+        action="store_true",
+        help="submit also all sub-cases of the cases.",
+        default=False,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--results",
+        action="store",
+        type=str,
+        help="folder where the results files are written. Default: the folder of the cases file.",
+        default=None,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--collect",
+        action="store",
+        type=float,
+        nargs="?",
+        const=-1.0,
+        help="wait (optionally at most COLLECT seconds) until all tasks are done and report the results.",
+        default=None,
+        required=False,
+    )
+
+    return parser
+
+
+def submit(argv: list[str]) -> None:
+    """Run the 'submit' command (sim-explorer submit queue cases [options])."""
+    args = _submit_argparser().parse_args(argv)
+    ids = work_queue.submit(args.queue, args.cases, args.case, args.results, args.subs)
+    print(f"{len(ids)} tasks submitted to {args.queue}")
+    if args.collect is not None:
+        timeout = None if args.collect < 0 else args.collect
+        summaries = work_queue.collect(args.queue, ids, timeout=timeout)
+        print(work_queue.report(summaries, ids), end="")
+
+
+def _sensitivity_argparser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sim-explorer sensitivity",
+        usage="%(prog)s cases --parameter p --output o [options [args]]",
+        epilog="_________________sim-explorer___________________",
+        prefix_chars="-",
+        add_help=True,
+        description=(
+            "One-at-a-time sensitivity analysis: perturb each parameter of a case and rank the "
+            "finite-difference sensitivities of the output measures."
+        ),
+    )
+
+    _ = parser.add_argument("cases", metavar="cases", type=str, help="The sim-explorer specification file.")
+
+    _ = parser.add_argument(
+        "--case",
+        action="store",
+        type=str,
+        help="name of the case around which the parameters are perturbed.",
+        default="base",
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--parameter",
+        action="append",
+        type=str,
+        help="parameter (case variable or element, e.g. e or x[2]) to perturb. Can be repeated.",
+        required=True,
+    )
+
+    _ = parser.add_argument(
+        "--output",
+        action="append",
+        type=str,
+        help="output as <component>.<variable>[<element>], e.g. bb.x[2]. Can be repeated.",
+        required=True,
+    )
+
+    _ = parser.add_argument(
+        "--measure",
+        action="append",
+        type=str,
+        choices=MEASURES,
+        help="output measure. Can be repeated. Default: final, max and integral.",
+        default=None,
+        required=False,
+    )
+
+    _ = parser.add_argument(
+        "--rel",
+        action="store",
+        type=float,
+        help="relative perturbation of the parameters.",
+        default=0.01,
+        required=False,
+    )
+
+    return parser
+
+
+def sensitivity_cmd(argv: list[str]) -> None:
+    """Run the 'sensitivity' command (sim-explorer sensitivity cases [options])."""
+    args = _sensitivity_argparser().parse_args(argv)
+    measures = args.measure or ["final", "max", "integral"]
+    table = sensitivity(args.cases, args.case, args.parameter, args.output, args.rel, measures)
+    print(sensitivity_report(table), end="")
+
+
 def main() -> None:
     """Entry point for console script as configured in pyproject.toml.
 
     Runs the command line interface and parses arguments and options entered on the console.
     """
+    commands = {  # commands with their own arguments
+        "diff": diff,
+        "worker": worker,
+        "submit": submit,
+        "sensitivity": sensitivity_cmd,
+    }
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        commands[sys.argv[1]](sys.argv[2:])
+        return
     parser = _argparser()
     args = parser.parse_args()
 
@@ -150,6 +425,10 @@ def main() -> None:
 
     case: Case | None = None
 
+    def run_cache() -> RunCache | None:
+        """Create the run cache (and its directory) only when cases are actually run."""
+        return None if args.no_cache else RunCache(cases.file.parent / ".sim-explorer-cache")
+
     if args.info is not None and args.info:
         print(cases.info())
 
@@ -162,7 +441,7 @@ def main() -> None:
 
         logger.info(f"{log_msg_stub}\t option: run \t\t\t{args.run}\n")
         # Invoke API
-        cases.run_case(case, run_subs=False, run_assertions=True)
+        cases.run_case(case, run_subs=False, run_assertions=True, cache=run_cache(), metrics=args.metrics)
 
         # Display assertion results
         assertion_results = [assertion for assertion in cases.assertion.report()]
@@ -176,7 +455,7 @@ def main() -> None:
             return
         logger.info(f"{log_msg_stub}\t --Run \t\t\t{args.Run}\n")
         # Invoke API
-        cases.run_case(case, run_subs=True, run_assertions=True)
+        cases.run_case(case, run_subs=True, run_assertions=True, cache=run_cache(), metrics=args.metrics)
 
         # Display assertion results
         assertion_results = [assertion for assertion in cases.assertion.report()]
@@ -0,0 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from sim_explorer.json5 import Json5
+
+"""
+sim_explorer module for regression comparison of two sets of results (e.g. the same cases run with new FMU versions).
+
+* results are read directly from the Json5 results files (no Cases or simulator needed)
+* all numeric series are extracted per <component>.<variable>[<element>]
+* both series are evaluated on the union of their time grids (vectorized),
+  through linear interpolation or zero-order hold for variables recorded with a change or deadband policy
+* per series the maximum absolute and relative error and the first time of divergence are calculated
+* parts of the union of the time ranges which are not covered by both series are reported as divergence
+"""
+
+
+def _js_py(results: Any) -> dict:
+    """Get the Json5 dict of results (see results_series())."""
+    if isinstance(results, (str, Path)):
+        return Json5(Path(results)).js_py
+    elif isinstance(results, Json5):
+        return results.js_py
+    elif isinstance(results, dict):
+        return results
+    else:  # expect a Results object
+        return results.res.js_py
+
+
+def results_series(results: Any) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Extract all numeric series from results.
+
+    Args:
+        results (Results, Json5, dict, str, Path): Results object, Json5 object, Json5 dict or results file
+    Returns:
+        Dictionary {<component>.<variable>[<element>] : (times, values), ...}
+    """
+    js_py = _js_py(results)
+    collect: dict[str, tuple[list, list]] = {}
+    for key, components in js_py.items():
+        if key == "header":
+            continue
+        time = float(key)
+        for comp, variables in components.items():
+            for var, value in variables.items():
+                if isinstance(value, list):
+                    items = [(f"{comp}.{var}[{i}]", v) for i, v in enumerate(value)]
+                else:
+                    items = [(f"{comp}.{var}", value)]
+                for ident, v in items:
+                    if isinstance(v, (int, float)):  # includes bool. Other types are not compared
+                        times, values = collect.setdefault(ident, ([], []))
+                        times.append(time)
+                        values.append(float(v))
+    return {k: (np.array(t), np.array(v)) for k, (t, v) in collect.items()}
+
+
+def _held(ident: str, record: dict) -> bool:
+    """Check whether the series ident is recorded with a change or deadband policy (see $.header.record)."""
+    return ident.partition(".")[2].partition("[")[0] in record
+
+
+def diff_series(
+    a: tuple[np.ndarray, np.ndarray],
+    b: tuple[np.ndarray, np.ndarray],
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    hold: tuple[bool, bool] = (False, False),
+) -> dict[str, Any]:
+    """Compare the series b with respect to the series a over the union of their time ranges.
+    Within the time range which is covered by both, a and b are evaluated at the union of their times,
+    through linear interpolation or zero-order hold (if hold is True for the series, see header.record of results).
+    A value is considered as divergent if abs(a-b) > atol + rtol*max(abs(a), abs(b)),
+    i.e. the same scale is used for the relative error and the comparison is symmetric.
+    Parts of the union of the time ranges which are only covered by one of the series
+    (e.g. a truncated series b) are reported as 'uncovered' and count as divergence.
+
+    Returns
+    -------
+        dict with elements 'max_abs', 'max_rel', 'first_divergence' (time or None),
+        'uncovered' (list of (start, end) time intervals) and 'passed' (bool)
+    """
+    ta, tb = a[0], b[0]
+    union = (float(min(ta[0], tb[0])), float(max(ta[-1], tb[-1])))
+    start, end = max(ta[0], tb[0]), min(ta[-1], tb[-1])  # time range covered by both
+    if start > end:  # no overlap
+        return {
+            "max_abs": float("nan"),
+            "max_rel": float("nan"),
+            "first_divergence": union[0],
+            "uncovered": [union],
+            "passed": False,
+        }
+    uncovered = [
+        (float(t0), float(t1))
+        for t0, t1 in ((union[0], start), (end, union[1]))
+        if t1 > t0 and not np.isclose(t0, t1, rtol=0.0, atol=1e-9)
+    ]
+    times = np.union1d(ta, tb)
+    times = times[(times >= start) & (times <= end)]
+    ya, yb = (
+        y[np.searchsorted(t, times, side="right") - 1] if held else np.interp(times, t, y)
+        for (t, y), held in zip((a, b), hold, strict=True)
+    )
+    err = np.abs(ya - yb)
+    scale = np.maximum(np.abs(ya), np.abs(yb))
+    rel = np.divide(err, scale, out=np.zeros_like(err), where=scale > 0)
+    diverged = [float(t) for t in times[err > atol + rtol * scale][:1]] + [t0 for t0, _ in uncovered]
+    return {
+        "max_abs": float(err.max()),
+        "max_rel": float(rel.max()),
+        "first_divergence": min(diverged) if len(diverged) else None,
+        "uncovered": uncovered,
+        "passed": not len(diverged),
+    }
+
+
+def diff_results(a: Any, b: Any, rtol: float = 1e-6, atol: float = 1e-9) -> dict[str, dict[str, Any]]:
+    """Compare all numeric series of the results b with respect to the results a.
+
+    Args:
+        a, b (Results, Json5, dict, str, Path): The results to compare (see results_series())
+        rtol (float): relative tolerance
+        atol (float): absolute tolerance
+    Returns:
+        Dictionary {<component>.<variable>[<element>] : diff-dict (see diff_series())}.
+        Series which are only found in one of the results are reported with 'missing' : 'a' or 'b'.
+        Series recorded with a change or deadband policy (see header.record) are compared with zero-order hold.
+    """
+    ja, jb = _js_py(a), _js_py(b)
+    sa, sb = results_series(ja), results_series(jb)
+    ra, rb = (js.get("header", {}).get("record", {}) for js in (ja, jb))
+    diffs: dict[str, dict[str, Any]] = {}
+    for ident, series in sa.items():
+        if ident in sb:
+            diffs[ident] = diff_series(series, sb[ident], rtol, atol, (_held(ident, ra), _held(ident, rb)))
+        else:
+            diffs[ident] = {"missing": "b", "passed": False}
+    for ident in sb:
+        if ident not in sa:
+            diffs[ident] = {"missing": "a", "passed": False}
+    return diffs
+
+
+def _diff_files(args: tuple) -> dict[str, dict[str, Any]]:
+    return diff_results(*args)
+
+
+def diff_many(
+    pairs: list[tuple[Any, Any]], rtol: float = 1e-6, atol: float = 1e-9, max_workers: int | None = None
+) -> list[dict[str, dict[str, Any]]]:
+    """Compare many pairs of results (see diff_results()) in parallel processes.
+    Results files are read in the worker processes.
+    From Results and Json5 objects only the (picklable) Json5 dict is passed to the workers.
+    The list of diffs is returned in the order of the pairs.
+    """
+    if len(pairs) <= 1:
+        return [diff_results(a, b, rtol, atol) for a, b in pairs]
+
+    def picklable(results: Any) -> str | dict:
+        if isinstance(results, (str, Path)):
+            return str(results)
+        return results.js_py if isinstance(results, Json5) else results.res.js_py
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_diff_files, [(picklable(a), picklable(b), rtol, atol) for a, b in pairs]))
+
+
+def diff_report(diffs: dict[str, dict[str, Any]], name: str = "", show_all: bool = False) -> str:
+    """Make a compact report from the diff-dict (see diff_results()). Only changed series are listed if not show_all."""
+    failed = [k for k, d in diffs.items() if not d["passed"]]
+    txt = f"{name}: " if len(name) else ""
+    txt += f"{len(failed)} of {len(diffs)} series changed\n"
+    for ident, d in diffs.items():
+        if show_all or not d["passed"]:
+            if "missing" in d:
+                txt += f"   {ident}: missing in {d['missing']}\n"
+            else:
+                txt += f"   {ident}: max abs {d['max_abs']:.3g}, max rel {d['max_rel']:.3g}"
+                txt += f", diverges @{d['first_divergence']}" if d["first_divergence"] is not None else ""
+                txt += "".join(f", not covered {t0}..{t1}" for t0, t1 in d["uncovered"]) + "\n"
+    return txt
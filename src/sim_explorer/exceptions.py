@@ -13,3 +13,9 @@ class CaseUseError(Exception):
     """Special error indicating that something is wrong during usage of cases."""
 
     pass
+
+
+class CaseCancelledError(CaseUseError):
+    """Special error indicating that a case run was cancelled (e.g. through asyncio cancellation)."""
+
+    pass
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+from typing import Any
+
+"""
+sim_explorer module for exporting the throughput telemetry of case runs (see Results.telemetry)
+as metrics text file in the Prometheus exposition format.
+
+The file is written atomically, such that it can be picked up by a textfile collector (e.g. of the node exporter).
+Every case run is a sample with the labels 'cases' (name of the cases definition) and 'case' (name of the case).
+"""
+
+# metric name : (telemetry key, help text)
+METRICS = {
+    "sim_explorer_real_time_factor": ("realTimeFactor", "Simulated seconds per wall-clock second."),
+    "sim_explorer_steps_per_second": ("stepsPerSecond", "Macro time steps per wall-clock second."),
+    "sim_explorer_wall_time_seconds": ("wallTime", "Wall-clock time of the simulation loop."),
+    "sim_explorer_simulated_time_seconds": ("simulatedTime", "Simulated time."),
+    "sim_explorer_steps": ("steps", "Number of macro time steps."),
+    "sim_explorer_get_actions": ("getActions", "Number of get actions executed."),
+    "sim_explorer_set_actions": ("setActions", "Number of set actions executed."),
+    "sim_explorer_cached": ("cached", "1 if the results were taken from the run cache (nothing simulated), else 0."),
+}
+
+
+def _label(value: str) -> str:
+    """Escape a label value according to the exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def exposition(results: list[Any]) -> str:
+    """Make the metrics text of the telemetry of the results objects 'results' (see Results.telemetry).
+    Results without telemetry are skipped.
+    """
+    samples = []
+    for res in results:
+        telemetry = res.telemetry
+        if len(telemetry):
+            cases = res.res.jspath("$.header.cases", str) or ""
+            samples.append((f'cases="{_label(cases)}",case="{_label(res.case_name)}"', telemetry))
+    txt = ""
+    for name, (key, help_txt) in METRICS.items():
+        txt += f"# HELP {name} {help_txt}\n# TYPE {name} gauge\n"
+        for labels, telemetry in samples:
+            txt += f"{name}{{{labels}}} {int(telemetry[key]) if isinstance(telemetry[key], bool) else telemetry[key]}\n"
+    return txt
+
+
+def write_metrics(file: Path | str, results: list[Any]):
+    """Write the metrics of the results objects 'results' (see exposition()) atomically to 'file'."""
+    file = Path(file)
+    tmp = file.with_name(f".{file.name}.{os.getpid()}.tmp")
+    tmp.write_text(exposition(results))
+    os.replace(tmp, file)
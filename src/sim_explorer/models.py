@@ -11,6 +11,12 @@ class Temporal(IntEnum):
     FINALLY = 2
     T = 3
     TIME = 3
+    E = 4
+    EVENTUALLY = 4  # eventually within a time span after a trigger
+    H = 5
+    HOLDS = 5  # holds continuously for at least a time span
+    W = 6
+    WINDOW = 6  # always within a time window
 
 
 class AssertionResult(BaseModel):
@@ -22,3 +28,4 @@ class AssertionResult(BaseModel):
     description: str
     case: str | None
     details: str
+    robustness: float | None = None  # signed margin of the assertion (positive: satisfied). None: not available
@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from sim_explorer.case import Case, Cases
+from sim_explorer.utils.streaming import P2Quantile, Welford
+
+"""
+sim_explorer module for Monte Carlo studies with streaming statistics.
+
+Parameters (keys of the case spec, e.g. 'e' or 'x[2]') are sampled from declared distributions,
+given as [<distribution>, <arg>, ...], where <distribution> is the name of a numpy.random.Generator method,
+e.g. ['normal', 0.5, 0.05] (mean, std), ['uniform', 1.0, 2.0] (low, high) or ['triangular', 0.0, 0.5, 1.0].
+Each sample is run as virtual case (a sub-case of the base case) on a process pool.
+
+* Every sample draws its parameters from its own random stream, spawned from the seed (numpy.random.SeedSequence).
+  The study is thus reproducible, independent of the number of processes and the order of completion.
+* The trajectories of the outputs are not stored. Per time step, count, mean, variance, min/max (Welford)
+  and the requested quantiles (P² algorithm) are accumulated, in sample order.
+  Only a bounded number of samples is in flight, i.e. memory use is independent of the number of samples.
+"""
+
+_worker_cases: dict[str, Cases] = {}  # Cases objects of the worker process {cases file : Cases}
+
+
+def draw(distributions: dict[str, list], seed: np.random.SeedSequence) -> dict[str, float]:
+    """Draw the parameter values of one sample from its random stream 'seed'."""
+    rng = np.random.default_rng(seed)
+    return {p: float(getattr(rng, d[0])(*d[1:])) for p, d in distributions.items()}
+
+
+def _run_sample(
+    file: str, base: str, distributions: dict[str, list], outputs: list[str], seed: np.random.SeedSequence, idx: int
+) -> dict[str, np.ndarray]:
+    """Run sample number idx as virtual case of base. This is the task function of the process pool.
+
+    Returns
+    -------
+        Dictionary {output : array of (time, value) rows}
+    """
+    if file not in _worker_cases:
+        _worker_cases[file] = Cases(file)
+    cases = _worker_cases[file]
+    case = Case(cases, f"{base}_mc_{idx}", spec={"parent": base, "spec": draw(distributions, seed)})
+    try:
+        case.run(dump=None)
+        return {out: np.array(case.res.retrieve((out,)), dtype=float) for out in outputs}
+    finally:
+        cases.unregister_case(case)  # the worker keeps no trace of the sample
+
+
+def monte_carlo(
+    cases: Cases | str | Path,
+    base: str,
+    distributions: dict[str, list],
+    outputs: list[str],
+    samples: int,
+    seed: int = 0,
+    quantiles: tuple | list = (0.05, 0.5, 0.95),
+    max_workers: int | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Perform a Monte Carlo study around the case 'base'.
+
+    Args:
+        cases (Cases, str, Path): The cases object or the cases file
+        base (str): The name of the case, which is the parent of the sample cases
+        distributions (dict): {parameter : [<distribution>, <arg>, ...], ...}, see module description
+        outputs (list): The outputs in Results.retrieve() syntax <component>.<variable>[<element>], e.g. 'bb.x[2]'
+        samples (int): The number of samples
+        seed (int)=0: The seed of the random streams
+        quantiles (tuple)=(0.05, 0.5, 0.95): The quantiles to estimate per time step
+        max_workers (int)=None: The number of processes. None: the number of CPUs
+
+    Returns
+    -------
+        Dictionary {output : {'time', 'count', 'mean', 'var', 'std', 'min', 'max', 'q<p>' (e.g. 'q0.05'), ...}}
+        with numpy arrays (one element per time step)
+    """
+    for p, d in distributions.items():
+        assert isinstance(d, (list, tuple)) and hasattr(np.random.Generator, d[0]), f"Unknown distribution {d} of {p}"
+    _cases = cases if isinstance(cases, Cases) else Cases(cases)
+    assert isinstance(_cases.case_by_name(base), Case), f"Case {base} not found"
+    file = str(_cases.file.resolve())
+    seeds = np.random.SeedSequence(seed).spawn(samples)
+    workers = max_workers or os.cpu_count() or 1
+    stats: dict[str, tuple[np.ndarray, Welford, list[P2Quantile]]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running: dict[int, Future] = {}
+        submitted = 0
+        for idx in range(samples):
+            while submitted < samples and submitted - idx < 2 * workers:  # bounded number of samples in flight
+                running[submitted] = pool.submit(
+                    _run_sample, file, base, distributions, outputs, seeds[submitted], submitted
+                )
+                submitted += 1
+            data = running.pop(idx).result()  # accumulate in sample order (reproducible quantile estimates)
+            for out, arr in data.items():
+                if out not in stats:
+                    stats[out] = (arr[:, 0], Welford(len(arr)), [P2Quantile(q, len(arr)) for q in quantiles])
+                time, welford, estimators = stats[out]
+                assert len(arr) == len(time), f"Sample {idx}: {len(arr)} values of {out}. Expected {len(time)}"
+                welford.add(arr[:, 1])
+                for est in estimators:
+                    est.add(arr[:, 1])
+    summary: dict[str, dict[str, Any]] = {}
+    for out, (time, welford, estimators) in stats.items():
+        summary[out] = {
+            "time": time,
+            "count": welford.count,
+            "mean": welford.mean,
+            "var": welford.var,
+            "std": welford.std,
+            "min": welford.min,
+            "max": welford.max,
+        }
+        summary[out].update({f"q{est.p}": est.value for est in estimators})
+    return summary
@@ -0,0 +1,104 @@
+import hashlib
+import importlib.metadata
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from sim_explorer.system_metadata import fmu_hash
+
+"""
+sim_explorer module providing a content-addressed cache of case runs.
+
+The key of a case run is a hash of everything which determines the results of the case:
+
+* the resolved case: name, (inherited) special settings, the effective set, get and summary actions,
+  recording policies, case variables and assertions
+* the system: the content of the OspSystemStructure file and of the FMU files
+* the version of the simulator (libcosimpy)
+
+On a cache hit, the stored results are used instead of simulating the case (see Cases.run_case()).
+The cache directory is bounded in size. The least recently used results are deleted first.
+"""
+
+
+class RunCache:
+    """Cache of saved case results, addressed through the hash of the case run (see key()).
+
+    Args:
+        directory (Path): The cache directory. Created if it does not exist
+        max_bytes (int)=1e9: The maximum size of the cache directory in bytes
+    """
+
+    def __init__(self, directory: Path | str, max_bytes: int = 1_000_000_000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._system_keys: dict[Path, str] = {}  # {system structure file : hash of system}
+
+    def _system_key(self, sysconfig: Path, fmus: list[Path]) -> str:
+        """Hash of the system structure file, the FMU files and the simulator version. Calculated once per system."""
+        if sysconfig not in self._system_keys:
+            sha = hashlib.sha1(sysconfig.read_bytes())
+            for fmu in sorted(set(fmus)):
+                sha.update(fmu_hash(fmu).encode())
+            sha.update(importlib.metadata.version("libcosimpy").encode())
+            self._system_keys[sysconfig] = sha.hexdigest()
+        return self._system_keys[sysconfig]
+
+    def key(self, case: Any) -> str | None:
+        """Calculate the key of a run of 'case'.
+        None is returned if the system is not defined through files (explicitly supplied simulator).
+        """
+        simulator = case.cases.simulator
+        if simulator.metadata is None:
+            return None
+
+        def actions(act: dict) -> list:
+            return [(t, [(a.func.__name__, a.args) for a in acts]) for t, acts in act.items()]
+
+        sha = hashlib.sha1(
+            self._system_key(simulator.sysconfig.resolve(), list(simulator.metadata.components.values())).encode()
+        )
+        spec = (
+            case.name,
+            sorted(case.special.items()),
+            case.cases.timefac,
+            actions(case.act_set),
+            actions(case.act_get),
+            [(a.func.__name__, a.args) for a in case.act_summary],
+            sorted(case.record.items()),
+            case.cases.variables,
+            case.js.jspath("$.assert", dict),
+        )
+        sha.update(repr(spec).encode())
+        return sha.hexdigest()
+
+    def file(self, key: str) -> Path:
+        """Return the cache file related to 'key'."""
+        return self.directory / f"{key}.js5"
+
+    def load(self, key: str) -> Path | None:
+        """Return the cache file of 'key' if it exists (cache hit) and mark it as recently used, else None."""
+        file = self.file(key)
+        if not file.exists():
+            return None
+        os.utime(file)  # the modification time is used as last usage time
+        return file
+
+    def store(self, key: str, results_file: Path):
+        """Store the saved results file 'results_file' as cache entry 'key' and limit the size of the cache."""
+        tmp = self.file(key).with_suffix(".tmp")
+        shutil.copyfile(results_file, tmp)
+        os.replace(tmp, self.file(key))  # atomic, such that incomplete files are never found
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used cache files until the cache size is within max_bytes."""
+        files = sorted(self.directory.glob("*.js5"), key=lambda f: f.stat().st_mtime)
+        size = sum(f.stat().st_size for f in files)
+        for f in files:
+            if size <= self.max_bytes:
+                break
+            size -= f.stat().st_size
+            f.unlink()
@@ -0,0 +1,170 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from sim_explorer.case import Case, Cases
+
+"""
+sim_explorer module for one-at-a-time sensitivity analysis.
+
+Starting from a base case, each of the selected parameters (case variable aliases) is perturbed
+by a relative amount in a virtual case (a sub-case of the base case, which is not part of the cases file).
+The nominal and the perturbed runs are performed on a process pool.
+From the results, finite-difference sensitivities of output measures are calculated:
+
+* final: the value at the end of the simulation
+* max, min: the maximum/minimum value
+* integral: the time integral (trapezoidal rule)
+
+The sensitivities are reported as dy/dp and normalized as (dy/y)/(dp/p), ranked by the absolute normalized value.
+"""
+
+MEASURES = ("final", "max", "min", "integral")
+
+
+def nominal_value(case: Case, alias: str) -> float:
+    """Find the value of the parameter 'alias' (key in the spec sections, e.g. 'e' or 'x[2]') as set for 'case'.
+    The case hierarchy is searched, i.e. the value is set in the case or one of its parents.
+    If the parameter is not set in any of the cases, the start value of the FMU variable is used (see start_value()).
+    """
+    value = None
+    for c in case.iter():
+        spec = c.js.jspath("$.spec", dict) or {}
+        if alias in spec:
+            value = spec[alias]
+    if value is None:
+        value = start_value(case.cases, alias)
+    assert isinstance(value, (int, float)), f"No numeric value of parameter {alias} found for case {case.name}"
+    return float(value)
+
+
+def start_value(cases: Cases, alias: str) -> Any:
+    """Find the start value of the parameter 'alias' (e.g. 'e' or 'x[2]') in the modelDescription of the FMU.
+
+    Returns
+    -------
+        The start value (see system_metadata.model_description_variables()) or None if not available
+    """
+    name, _, element = alias.partition("[")
+    var = cases.variables.get(name)
+    assert var is not None, f"Unknown case variable {name} in parameter {alias}"
+    assert len(element) or len(var["variables"]) == 1, f"Element of the vector variable {name} expected"
+    ref = var["variables"][int(element.rstrip("]")) if len(element) else 0]
+    metadata = cases.simulator.metadata
+    if metadata is None:  # the system is not defined through a file
+        return None
+    for info in metadata.variables(var["instances"][0]).values():
+        if info["reference"] == ref and info["type"] == var["type"]:
+            return info["start"]
+    return None
+
+
+def perturbed_name(case: str, alias: str) -> str:
+    """Make the name of the virtual case where 'alias' is perturbed."""
+    return f"{case}_sens_{re.sub(r'[^0-9a-zA-Z]+', '_', alias).strip('_')}"
+
+
+def output_measures(data: list, measures: tuple | list = MEASURES) -> dict[str, float]:
+    """Calculate the measures of the time series 'data' (as retrieved through Results.retrieve())."""
+    arr = np.array(data, dtype=float)
+    assert arr.ndim == 2 and arr.shape[1] == 2 and len(arr), f"Time series of scalar values expected. Found {data}"
+    t, y = arr[:, 0], arr[:, 1]
+    values = {
+        "final": lambda: y[-1],
+        "max": lambda: y.max(),
+        "min": lambda: y.min(),
+        "integral": lambda: np.sum((y[1:] + y[:-1]) * np.diff(t)) / 2,
+    }
+    return {m: float(values[m]()) for m in measures}
+
+
+def _run_perturbed(
+    file: str, base: str, alias: str | None, value: float | None, outputs: list[str], measures: list[str]
+) -> dict[str, dict[str, float]]:
+    """Run the base case (alias None) or the virtual case with the perturbed parameter in a new Cases object.
+    This is the task function of the process pool.
+
+    Returns
+    -------
+        Dictionary {output : {measure : value}}
+    """
+    cases = Cases(file)
+    case = cases.case_by_name(base)
+    assert isinstance(case, Case), f"Case {base} not found in {file}"
+    if alias is not None:
+        case = Case(cases, perturbed_name(base, alias), spec={"parent": base, "spec": {alias: value}})
+    case.run(dump=None)
+    return {out: output_measures(case.res.retrieve((out,)), measures) for out in outputs}
+
+
+def sensitivity(
+    cases: Cases | str | Path,
+    base: str,
+    parameters: list[str],
+    outputs: list[str],
+    rel: float = 0.01,
+    measures: tuple | list = ("final", "max", "integral"),
+    max_workers: int | None = None,
+) -> list[dict[str, Any]]:
+    """Perform a one-at-a-time sensitivity analysis.
+
+    Args:
+        cases (Cases, str, Path): The cases object or the cases file
+        base (str): The name of the case around which the parameters are perturbed
+        parameters (list): The parameters to perturb, as keys of the case spec (e.g. 'e' or 'x[2]').
+           Parameters which are not set in the cases start from the start value of the FMU variable
+        outputs (list): The outputs in Results.retrieve() syntax <component>.<variable>[<element>], e.g. 'bb.x[2]'
+        rel (float)=0.01: Relative perturbation of the parameters (absolute, if the nominal value is 0)
+        measures (tuple)=('final','max','integral'): The output measures (see MEASURES)
+        max_workers (int)=None: The number of processes. None: the ProcessPoolExecutor default
+
+    Returns
+    -------
+        List of dicts with elements parameter, nominal, delta, output, measure, y0, y1, sensitivity (dy/dp)
+        and normalized ((dy/y)/(dp/p), nan if y0 or nominal is 0), ranked by the absolute normalized sensitivity
+    """
+    assert all(m in MEASURES for m in measures), f"Unknown measure in {measures}. Available: {MEASURES}"
+    _cases = cases if isinstance(cases, Cases) else Cases(cases)
+    case = _cases.case_by_name(base)
+    assert isinstance(case, Case), f"Case {base} not found"
+    nominal = {p: nominal_value(case, p) for p in parameters}
+    delta = {p: rel * abs(v) if v != 0 else rel for p, v in nominal.items()}
+    file = str(_cases.file.resolve())
+    runs: list[tuple[str | None, float | None]] = [(None, None)] + [(p, nominal[p] + delta[p]) for p in parameters]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_run_perturbed, file, base, p, v, outputs, list(measures)) for p, v in runs]
+        results = [f.result() for f in futures]
+    table = []
+    for p, res in zip(parameters, results[1:], strict=True):
+        for out in outputs:
+            for m in measures:
+                y0, y1 = results[0][out][m], res[out][m]
+                sens = (y1 - y0) / delta[p]
+                normalized = sens * nominal[p] / y0 if y0 != 0 and nominal[p] != 0 else float("nan")
+                table.append(
+                    {
+                        "parameter": p,
+                        "nominal": nominal[p],
+                        "delta": delta[p],
+                        "output": out,
+                        "measure": m,
+                        "y0": y0,
+                        "y1": y1,
+                        "sensitivity": sens,
+                        "normalized": normalized,
+                    }
+                )
+    table.sort(key=lambda r: -abs(r["normalized"]) if not np.isnan(r["normalized"]) else float("inf"))
+    return table
+
+
+def sensitivity_report(table: list[dict[str, Any]]) -> str:
+    """Make a ranked text table from the results of sensitivity()."""
+    txt = f"{'parameter':<16} {'output':<20} {'measure':<9} {'dy/dp':>12} {'(dy/y)/(dp/p)':>14}\n"
+    for r in table:
+        txt += f"{r['parameter']:<16} {r['output']:<20} {r['measure']:<9} {r['sensitivity']:>12.4g}"
+        txt += f" {r['normalized']:>14.4g}\n"
+    return txt
@@ -1,4 +1,6 @@
 # pyright: reportMissingImports=false, reportGeneralTypeIssues=false
+import hashlib
+import threading
 import xml.etree.ElementTree as ET  # noqa: N817
 from enum import Enum
 from pathlib import Path
@@ -10,7 +12,8 @@ from libcosimpy.CosimLogging import CosimLogLevel, log_output_level  # type: ign
 from libcosimpy.CosimManipulator import CosimManipulator  # type: ignore
 from libcosimpy.CosimObserver import CosimObserver  # type: ignore
 
-from sim_explorer.utils.misc import from_xml, match_with_wildcard
+from sim_explorer.system_metadata import SystemMetadata
+from sim_explorer.utils.misc import PrefixIndex, from_xml
 
 # type definitions
 PyVal: TypeAlias = str | float | int | bool  # simple python types / Json5 atom
@@ -18,6 +21,9 @@ Json5: TypeAlias = dict[str, "Json5Val"]  # Json5 object
 Json5List: TypeAlias = list["Json5Val"]  # Json5 list
 Json5Val: TypeAlias = PyVal | Json5 | Json5List  # Json5 values
 
+# Loading of FMUs by libcosim is not thread safe. Executions are therefore instantiated one at a time
+_instantiate_lock = threading.Lock()
+
 
 """
 sim_explorer module for definition and execution of simulation experiments
@@ -60,6 +66,12 @@ class SimulatorInterface:
     Unfortunately, an instantiated simulator does not seem to have functions to access the FMU,
     therefore only the (reduced) info from the simulator is used here (FMUs not used directly).
 
+    If the system is defined through an OspSystemStructure file, the component and variable information
+    is read from the modelDescription.xml of the FMUs (see SystemMetadata)
+    and the simulator is only instantiated when it is first used (e.g. when a case is run).
+    Component ids then relate to the order of definition in the system structure file
+    and are translated to the simulator slave indices when the simulator is accessed.
+
     Args:
         system (Path): Path to system model definition file
         name (str)="System": Possibility to provide an explicit system name (if not provided by system file)
@@ -82,24 +94,62 @@ class SimulatorInterface:
         self.description = description  # overwrite if the system includes that
         self.sysconfig: Path | None = None
         log_output_level(log_level)
-        self.simulator: CosimExecution
+        self._simulator: CosimExecution | None = None
+        self._manipulator: CosimManipulator | None = None
+        self._observer: CosimObserver | None = None
+        self.metadata: SystemMetadata | None = None
         if simulator is None:  # instantiate the simulator through the system config file
             self.sysconfig = Path(system)
             assert self.sysconfig.exists(), f"File {self.sysconfig.name} not found"
             ck, msg = self._check_system_structure(self.sysconfig)
             assert ck, msg
-            self.simulator = cast(CosimExecution, self._simulator_from_config(self.sysconfig))
+            if self.sysconfig.is_file() and self.sysconfig.name.endswith(".xml"):  # instantiation deferred
+                self.metadata = SystemMetadata(self.sysconfig)
+            else:
+                self._instantiate()
         else:
-            self.simulator = simulator
+            self._simulator = simulator
+            self._instantiate()
+        self._component_table()  # id <-> name tables of the system
+        self._variables_cache: dict[int, tuple[dict, PrefixIndex]] = {}  # {model ID : (variables, index)}
         self.components = self.get_components()  # dict of {component name : modelId}
-        # Instantiate a suitable manipulator for changing variables.
-        self.manipulator = CosimManipulator.create_override()
-        assert self.simulator.add_manipulator(manipulator=self.manipulator), "Could not add manipulator object"
 
-        # Instantiate a suitable observer for collecting results.
-        self.observer = CosimObserver.create_last_value()
-        assert self.simulator.add_observer(observer=self.observer), "Could not add observer object"
-        self.message = ""  # possibility to save additional message for (optional) retrieval by client
+    @property
+    def simulator(self) -> CosimExecution:
+        """The simulator (CosimExecution) object. Instantiated when first accessed."""
+        if self._simulator is None:
+            self._instantiate()
+        return self._simulator
+
+    @property
+    def manipulator(self) -> CosimManipulator:
+        """The manipulator object for changing variables, added to the simulator."""
+        if self._simulator is None:
+            self._instantiate()
+        return self._manipulator
+
+    @property
+    def observer(self) -> CosimObserver:
+        """The observer object for collecting results, added to the simulator."""
+        if self._simulator is None:
+            self._instantiate()
+        return self._observer
+
+    def _instantiate(self):
+        """Instantiate the simulator (if not explicitly supplied) and add manipulator and observer."""
+        with _instantiate_lock:
+            if self._simulator is None:
+                assert isinstance(self.sysconfig, Path), "The system structure is needed to instantiate the simulator"
+                self._simulator = cast(CosimExecution, self._simulator_from_config(self.sysconfig))
+            # Instantiate a suitable manipulator for changing variables.
+            if self._manipulator is None:
+                self._manipulator = CosimManipulator.create_override()
+            assert self._simulator.add_manipulator(manipulator=self._manipulator), "Could not add manipulator object"
+            # Instantiate a suitable observer for collecting results.
+            if self._observer is None:
+                self._observer = CosimObserver.create_last_value()
+            assert self._simulator.add_observer(observer=self._observer), "Could not add observer object"
+            self._slave_table()
 
     @property
     def path(self):
@@ -120,13 +170,35 @@ class SimulatorInterface:
         """Reset the simulator interface, so that a new simulation can be run."""
         assert isinstance(self.sysconfig, Path), "Simulator resetting does not work with explicitly supplied simulator."
         assert self.sysconfig.exists(), "Simulator resetting does not work with explicitly supplied simulator."
-        assert isinstance(self.manipulator, CosimManipulator)
-        assert isinstance(self.observer, CosimObserver)
-        # self.simulator = self._simulator_from_config(self.sysconfig)
-        self.simulator = CosimExecution.from_osp_config_file(str(self.sysconfig))
-        assert self.simulator.add_manipulator(manipulator=self.manipulator), "Could not add manipulator object"
-        assert self.simulator.add_observer(observer=self.observer), "Could not add observer object"
-        # for case in cases:
+        self._simulator = None  # a new simulator is instantiated when next used
+
+    def _component_table(self):
+        """Build the tables component id -> name and name -> id from the system metadata or the simulator.
+        These are used by component_name_from_id() and component_id_from_name(), avoiding repeated calls into libcosim.
+        """
+        self._comp_names: dict[int, str] = {}
+        self._comp_ids: dict[str, int] = {}
+        if self.metadata is not None:
+            for idx, name in enumerate(self.metadata.components):
+                self._comp_names[idx] = name
+                self._comp_ids[name] = idx
+        elif self._simulator is not None:
+            for comp in self._simulator.slave_infos():
+                self._comp_names[comp.index] = comp.name.decode()
+                self._comp_ids[comp.name.decode()] = comp.index
+        self._comp_index = PrefixIndex(self._comp_ids)  # used for matching of component names
+
+    def _slave_table(self):
+        """Build the table component id -> simulator slave index for the current simulator.
+        The slave indices are only known after instantiation and are not guaranteed to follow the order of definition.
+        """
+        if self.metadata is None:  # component ids are the slave indices
+            self._slave_ids = {comp.index: comp.index for comp in self._simulator.slave_infos()}
+        else:
+            self._slave_ids = {
+                idx: self._simulator.slave_index_from_instance_name(name)
+                for idx, name in enumerate(self.metadata.components)
+            }
 
     def _simulator_from_config(self, file: Path):
         """Instantiate a simulator object through the a suitable configuration file.
@@ -158,19 +230,51 @@ class SimulatorInterface:
             return CosimExecution.from_ssp_file(str(file))
 
     def same_model(self, ref: int, refs: list[int] | set[int]):
-        ref_vars = self.get_variables(ref)
+        ref_vars = self.model_fingerprint(ref)
         for r in refs:
-            r_vars = self.get_variables(r)
-            yield (r, r_vars == ref_vars)
+            yield (r, self.model_fingerprint(r) == ref_vars)
+
+    def model_fingerprint(self, comp: int) -> str:
+        """Calculate a fingerprint (hash) of the variable list of the component `comp`.
+        Components with equal variable lists (name, reference, type, causality, variability)
+        are considered as instances of the same basic model (FMU).
+        """
+        variables = sorted(
+            (k, v["reference"], v["type"], v["causality"], v["variability"])
+            for k, v in self._component_variables(comp).items()
+        )
+        return hashlib.sha1(repr(variables).encode()).hexdigest()
+
+    def _component_variables(self, component: int) -> dict:
+        """Read the variables dict (see get_variables()) of 'component' from the system metadata or the simulator."""
+        if self.metadata is not None:
+            return {
+                k: {e: v[e] for e in ("reference", "type", "causality", "variability")}
+                for k, v in self.metadata.variables(self._comp_names[component]).items()
+            }
+        variables = {}
+        for struct in self.simulator.slave_variables(component):
+            variables.update(
+                {
+                    struct.name.decode(): {
+                        "reference": struct.reference,
+                        "type": struct.type,
+                        "causality": struct.causality,
+                        "variability": struct.variability,
+                    }
+                }
+            )
+        return variables
 
     def get_components(self, model: int = -1) -> dict:
         """Provide a dict of `{ component_instances_name : model_ID, ...}` in the system model.
         For each component a unique ID per basic model (FMU) is used.
         In this way, if comps[x]==comps[y] the components x and y relate to the same basic model.
         If model != -1, only the components (instances) related to model are returned.
+        The model ID is the index of the first component instance with the given model fingerprint.
         """
         comps = {}
-        if self.simulator is None:
+        if not len(self._comp_names):
             pass  # nothing to do we return an empty dict
 
         elif model >= 0:  # use self.components to extract only components related to the provided model
@@ -179,14 +283,9 @@ class SimulatorInterface:
                     comps.update({comp: self.components[comp]})
 
         else:
-            comp_infos = self.simulator.slave_infos()
-            for comp in comp_infos:
-                for r, same in self.same_model(comp.index, set(comps.values())):
-                    if same:
-                        comps.update({comp.name.decode(): r})
-                        break
-                if comp.name.decode() not in comps:  # new model
-                    comps.update({comp.name.decode(): comp.index})
+            models: dict[str, int] = {}  # {fingerprint : model ID}
+            for idx, name in self._comp_names.items():
+                comps.update({name: models.setdefault(self.model_fingerprint(idx), idx)})
         return comps
 
     def get_models(self) -> list:
@@ -207,12 +306,12 @@ class SimulatorInterface:
         collect = []
         model = ""
         for c in comps:
-            for k, v in self.components.items():
-                if match_with_wildcard(c, k):
-                    if not len(model):
-                        model = v
-                    if v == model and k not in collect:
-                        collect.append(k)
+            for k in self._comp_index.match(c):
+                v = self.components[k]
+                if model == "":  # first match defines the model
+                    model = v
+                if v == model and k not in collect:
+                    collect.append(k)
         return (model, tuple(collect))
 
     def match_variables(self, component: str, varname: str) -> tuple[int]:
@@ -243,8 +342,9 @@ class SimulatorInterface:
         assert len(self.components), "Need the dictionary of components before maching variables"
 
         accepted = None
-        variables = self.get_variables(component)
-        for k, v in variables.items():
+        variables, index = self._model_variables(self.component_id_from_name(component))
+        for k in index.prefix(varname):
+            v = variables[k]
             if accept_as_alias(k):
                 if accepted is None:
                     accepted = v
@@ -268,11 +368,18 @@ class SimulatorInterface:
         return tuple(var)
 
     def is_output_var(self, comp: int, ref: int) -> bool:
-        for idx in range(self.simulator.num_slave_variables(comp)):
-            struct = self.simulator.slave_variables(comp)[idx]
-            if struct.reference == ref:
-                return struct.causality == 2
-        return False
+        variables, _ = self._model_variables(comp)
+        return any(v["reference"] == ref and v["causality"] == 2 for v in variables.values())
+
+    def _model_variables(self, component: int) -> tuple[dict, PrefixIndex]:
+        """Get the variables dict (see get_variables()) and the prefix index of variable names of the model of 'component'.
+        The information is retrieved once per basic model (FMU) and cached.
+        """
+        model = self.components[self._comp_names[component]]
+        if model not in self._variables_cache:
+            variables = self._component_variables(component)
+            self._variables_cache[model] = (variables, PrefixIndex(variables))
+        return self._variables_cache[model]
 
     def get_variables(self, comp: str | int, single: int | str | None = None, as_numbers: bool = True) -> dict:
         """Get the registered variables for a given component from the simulator.
@@ -288,37 +395,33 @@ class SimulatorInterface:
             A dictionary of variable {names:info, ...}, where info is a dictionary containing reference, type, causality and variability
         """
         if isinstance(comp, str):
-            component = self.simulator.slave_index_from_instance_name(comp)
-            if component is None:  # component not found
+            component = self.component_id_from_name(comp)
+            if component < 0:  # component not found
                 return {}
         elif isinstance(comp, int):
-            if comp < 0 or comp >= self.simulator.num_slaves():  # invalid id
+            if comp not in self._comp_names:  # invalid id
                 return {}
             component = comp
         else:
             raise AssertionError(f"Unallowed argument {comp} in 'get_variables'")
-        variables = {}
-        for idx in range(self.simulator.num_slave_variables(component)):
-            struct = self.simulator.slave_variables(component)[idx]
-            if (
-                single is None
-                or (isinstance(single, int) and struct.reference == single)
-                or struct.name.decode() == single
-            ):
-                typ = struct.type if as_numbers else CosimVariableType(struct.type).name
-                causality = struct.causality if as_numbers else CosimVariableCausality(struct.causality).name
-                variability = struct.variability if as_numbers else CosimVariableVariability(struct.variability).name
-                variables.update(
-                    {
-                        struct.name.decode(): {
-                            "reference": struct.reference,
-                            "type": typ,
-                            "causality": causality,
-                            "variability": variability,
-                        }
-                    }
-                )
-        return variables
+        cached, _ = self._model_variables(component)
+        if single is None:
+            variables = dict(cached)
+        elif isinstance(single, str):
+            variables = {single: cached[single]} if single in cached else {}
+        else:
+            variables = {k: v for k, v in cached.items() if v["reference"] == single}
+        if as_numbers:
+            return variables
+        return {
+            k: {
+                "reference": v["reference"],
+                "type": CosimVariableType(v["type"]).name,
+                "causality": CosimVariableCausality(v["causality"]).name,
+                "variability": CosimVariableVariability(v["variability"]).name,
+            }
+            for k, v in variables.items()
+        }
 
     #     def identify_variable_groups(self, component: str, include_all: bool = False) -> dict[str, any]:
     #         """Try to identify variable groups of the 'component', based on the assumption that variable names are structured.
@@ -394,14 +497,16 @@ class SimulatorInterface:
         The signature is the same as the manipulator functions slave_real_values()...,
         only that variables are set individually and the type is added as argument.
         """
+        simulator = self.simulator
+        slave = self._slave_ids[instance]
         if typ == CosimVariableType.REAL.value:
-            return self.simulator.real_initial_value(instance, var_ref, self.pytype(typ, var_val))
+            return simulator.real_initial_value(slave, var_ref, self.pytype(typ, var_val))
         elif typ == CosimVariableType.INTEGER.value:
-            return self.simulator.integer_initial_value(instance, var_ref, self.pytype(typ, var_val))
+            return simulator.integer_initial_value(slave, var_ref, self.pytype(typ, var_val))
         elif typ == CosimVariableType.STRING.value:
-            return self.simulator.string_initial_value(instance, var_ref, self.pytype(typ, var_val))
+            return simulator.string_initial_value(slave, var_ref, self.pytype(typ, var_val))
         elif typ == CosimVariableType.BOOLEAN.value:
-            return self.simulator.boolean_initial_value(instance, var_ref, self.pytype(typ, var_val))
+            return simulator.boolean_initial_value(slave, var_ref, self.pytype(typ, var_val))
 
     def set_variable_value(self, instance: int, typ: int, var_refs: tuple[int], var_vals: tuple[PyVal]) -> bool:
         """Provide a manipulator function which sets the 'variable' (of the given 'instance' model) to 'value'.
@@ -412,14 +517,16 @@ class SimulatorInterface:
             var_vals (tuple): Tuple of values (of the correct type), used to set model variables
         """
         _vals = [self.pytype(typ, x) for x in var_vals]  # ensure list and correct type
+        manipulator = self.manipulator
+        slave = self._slave_ids[instance]
         if typ == CosimVariableType.REAL.value:
-            return self.manipulator.slave_real_values(instance, list(var_refs), _vals)
+            return manipulator.slave_real_values(slave, list(var_refs), _vals)
         elif typ == CosimVariableType.INTEGER.value:
-            return self.manipulator.slave_integer_values(instance, list(var_refs), _vals)
+            return manipulator.slave_integer_values(slave, list(var_refs), _vals)
         elif typ == CosimVariableType.BOOLEAN.value:
-            return self.manipulator.slave_boolean_values(instance, list(var_refs), _vals)
+            return manipulator.slave_boolean_values(slave, list(var_refs), _vals)
         elif typ == CosimVariableType.STRING.value:
-            return self.manipulator.slave_string_values(instance, list(var_refs), _vals)
+            return manipulator.slave_string_values(slave, list(var_refs), _vals)
         else:
             raise CaseUseError(f"Unknown type {typ}") from None
 
@@ -430,14 +537,16 @@ class SimulatorInterface:
             instance (int): identifier of the instance model for which the variable is to be set
             var_refs (tuple): Tuple of variable references for which the values shall be retrieved
         """
+        observer = self.observer
+        slave = self._slave_ids[instance]
         if typ == CosimVariableType.REAL.value:
-            return self.observer.last_real_values(instance, list(var_refs))
+            return observer.last_real_values(slave, list(var_refs))
         elif typ == CosimVariableType.INTEGER.value:
-            return self.observer.last_integer_values(instance, list(var_refs))
+            return observer.last_integer_values(slave, list(var_refs))
         elif typ == CosimVariableType.BOOLEAN.value:
-            return self.observer.last_boolean_values(instance, list(var_refs))
+            return observer.last_boolean_values(slave, list(var_refs))
         elif typ == CosimVariableType.STRING.value:
-            return self.observer.last_string_values(instance, list(var_refs))
+            return observer.last_string_values(slave, list(var_refs))
         else:
             raise CaseUseError(f"Unknown type {typ}") from None
 
@@ -487,8 +596,14 @@ class SimulatorInterface:
         else:
             return (0, 2, 2, 3)[code]  # default value in table
 
-    def allowed_action(self, action: str, comp: int | str, var: int | str | tuple, time: float):
+    def allowed_action(self, action: str, comp: int | str, var: int | str | tuple, time: float) -> bool:
+        """Check whether the action would be allowed according to FMI2 rules. See action_error()."""
+        return not len(self.action_error(action, comp, var, time))
+
+    def action_error(self, action: str, comp: int | str, var: int | str | tuple, time: float) -> str:
         """Check whether the action would be allowed according to FMI2 rules, see FMI2.01, p.49.
+        The reason why the action is not allowed is returned (empty string if the action is allowed),
+        i.e. no state is kept and the check can be used concurrently.
 
         * Unfortunately, the OSP interface does not explicitly provide the 'initial' setting,
           such that we need to assume the default value as listed on p.50.
@@ -502,6 +617,10 @@ class SimulatorInterface:
             comp (int,str): The instantiated component within the system (as index or name)
             var (int,str,tuple): The variable(s) (of component) as reference or name
             time (float): The time at which the action will be performed
+
+        Returns
+        -------
+            Error message or empty string if the action is allowed
         """
 
         def _description(name: str, info: dict, initial: int) -> str:
@@ -510,9 +629,12 @@ class SimulatorInterface:
             descr += f", initial {('exact','approx','calculated','none')[initial]}"
             return descr
 
+        error = ""
+
         def _check(cond, msg):
+            nonlocal error
             if cond:
-                self.message = msg
+                error = msg
                 return True
             return False
 
@@ -522,7 +644,7 @@ class SimulatorInterface:
         for v in var:
             variables = self.get_variables(comp, v)
             if _check(len(variables) != 1, f"Variable {v} of component {comp} was not found"):
-                return False
+                return error
             name, var_info = next(variables.items().__iter__())
             if _type < 0 or _causality < 0 or _variability < 0:  # define the properties and check whether allowed
                 _type = var_info["type"]
@@ -537,12 +659,12 @@ class SimulatorInterface:
                         _variability == 0,
                         f"Variable {name} is defined as 'constant' and cannot be set",
                     ):
-                        return False
+                        return error
                     if _check(
                         _variability == 0,
                         f"Variable {name} is defined as 'constant' and cannot be set",
                     ):
-                        return False
+                        return error
 
                     if time == 0:  # initialization
                         # initial settings 'exact', 'approx' or 'input'
@@ -550,31 +672,31 @@ class SimulatorInterface:
                             not (initial in (0, 1) or _causality == 0),
                             _description(name, var_info, initial) + " cannot be set before or during initialization.",
                         ):
-                            return False
+                            return error
                     else:  # at communication points
                         # 'parameter', 'tunable' or 'input
                         if _check(
                             not ((_causality == 1 and _variability == 2) or _causality == 0),
                             _description(name, var_info, initial) + " cannot be set at communication points.",
                         ):
-                            return False
+                            return error
             else:  # check whether the properties are equal
                 if _check(
                     _type != var_info["type"],
                     _description(name, var_info, initial) + f" != type {_type}",
                 ):
-                    return False
+                    return error
                 if _check(
                     _causality != var_info["causality"],
                     _description(name, var_info, initial) + f" != causality { _causality}",
                 ):
-                    return False
+                    return error
                 if _check(
                     _variability != var_info["variability"],
                     _description(name, var_info, initial) + f" != variability {_variability}",
                 ):
-                    return False
-        return True
+                    return error
+        return ""
 
     def variable_name_from_ref(self, comp: int | str, ref: int) -> str:
         for name, info in self.get_variables(comp).items():
@@ -584,12 +706,8 @@ class SimulatorInterface:
 
     def component_name_from_id(self, idx: int) -> str:
         """Retrieve the component name from the given index, or an empty string if not found."""
-        for slave_info in self.simulator.slave_infos():
-            if slave_info.index == idx:
-                return slave_info.name.decode()
-        return ""
+        return self._comp_names.get(idx, "")
 
     def component_id_from_name(self, name: str) -> int:
         """Get the component id from the name. -1 if not found."""
-        id = self.simulator.slave_index_from_instance_name(name)
-        return id if id is not None else -1
+        return self._comp_ids.get(name, -1)
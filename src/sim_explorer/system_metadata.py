@@ -0,0 +1,104 @@
+import hashlib
+import xml.etree.ElementTree as ET  # noqa: N817
+from pathlib import Path
+
+from sim_explorer.utils.misc import from_xml
+
+"""
+Metadata of a system model, read directly from the OspSystemStructure file and the modelDescription.xml of the FMUs.
+
+The metadata provides the same variable information as the simulator (see SimulatorInterface.get_variables()),
+but does not need an instantiated simulator (CosimExecution).
+This makes it possible to instantiate and validate cases without loading the FMUs into the simulator.
+The variable information is cached per FMU (identified through the hash of the FMU file).
+The hash itself is memoized per (resolved path, modification time, size) of the file,
+so that the FMU is only read again when it changed on disk.
+
+Note: The enumeration numbers are the same as in libcosimpy.CosimEnums
+"""
+
+# Enumerations are handled as integers and 'independent' as 'local' by the simulator
+TYPES = {"Real": 0, "Integer": 1, "String": 2, "Boolean": 3, "Enumeration": 1}
+CAUSALITIES = {"input": 0, "parameter": 1, "output": 2, "calculatedParameter": 3, "local": 4, "independent": 4}
+VARIABILITIES = {"constant": 0, "fixed": 1, "tunable": 2, "discrete": 3, "continuous": 4}
+# conversion of 'start' attributes per type
+STARTS = {"Real": float, "Integer": int, "String": str, "Boolean": lambda s: s in ("true", "1"), "Enumeration": int}
+
+_fmu_variables_cache: dict[str, dict[str, dict]] = {}  # {FMU hash : variables dict}
+_fmu_hash_cache: dict[tuple[str, int, int], str] = {}  # {(resolved path, mtime, size) : FMU hash}
+
+
+def fmu_hash(fmu: Path) -> str:
+    """Calculate the hash of the FMU file, which is used to identify FMUs in the cache.
+
+    The hash is memoized per (resolved path, modification time, size) of the file.
+    """
+    path = Path(fmu).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _fmu_hash_cache:
+        sha = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        _fmu_hash_cache[key] = sha.hexdigest()
+    return _fmu_hash_cache[key]
+
+
+def model_description_variables(md: ET.Element) -> dict[str, dict]:
+    """Extract the variables from the modelDescription root element 'md'.
+
+    Returns
+    -------
+        A dictionary of variables {names:info, ...},
+        where info is a dictionary containing reference, type, causality, variability, initial (or None)
+        and start (the start value converted to the variable type, or None)
+    """
+    assert md.get("fmiVersion", "").startswith("2"), f"Only FMI2 modelDescription is handled. Found {md.attrib}"
+    variables = {}
+    for sv in md.findall(".//ScalarVariable"):
+        el = next(el for el in sv if el.tag in TYPES)
+        start = el.get("start", None)
+        variables.update(
+            {
+                sv.attrib["name"]: {
+                    "reference": int(sv.attrib["valueReference"]),
+                    "type": TYPES[el.tag],
+                    "causality": CAUSALITIES[sv.get("causality", "local")],
+                    "variability": VARIABILITIES[sv.get("variability", "continuous")],
+                    "initial": sv.get("initial", None),
+                    "start": None if start is None else STARTS[el.tag](start),
+                }
+            }
+        )
+    return variables
+
+
+def fmu_variables(fmu: Path) -> dict[str, dict]:
+    """Get the variables of the FMU file 'fmu' (see model_description_variables()). The results are cached per FMU hash."""
+    key = fmu_hash(fmu)
+    if key not in _fmu_variables_cache:
+        md = from_xml(fmu, sub="modelDescription.xml")
+        assert isinstance(md, ET.Element), f"ElementTree element expected. Found {md}"
+        _fmu_variables_cache[key] = model_description_variables(md)
+    return _fmu_variables_cache[key]
+
+
+class SystemMetadata:
+    """Component and variable information of a system defined through an OspSystemStructure file.
+
+    Args:
+        sysconfig (Path): Path to the OspSystemStructure file
+    """
+
+    def __init__(self, sysconfig: Path):
+        self.sysconfig = Path(sysconfig)
+        el = from_xml(self.sysconfig)
+        assert isinstance(el, ET.Element), f"ElementTree element expected. Found {el}"
+        self.components: dict[str, Path] = {}  # {component instance name : FMU file} in order of definition
+        for s in el.findall(".//{*}Simulator"):
+            self.components[s.attrib["name"]] = self.sysconfig.parent / s.attrib["source"]
+
+    def variables(self, component: str) -> dict[str, dict]:
+        """Get the variables dict of the component (instance) with name 'component'."""
+        return fmu_variables(self.components[component])
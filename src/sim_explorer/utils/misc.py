@@ -1,11 +1,24 @@
 import re
 import xml.etree.ElementTree as ET  # noqa: N817
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable
 from zipfile import BadZipFile, ZipFile, is_zipfile
 
+import numpy as np
+
+
+@lru_cache(maxsize=1024)
+def wildcard_regex(findtxt: str) -> re.Pattern:
+    """Compile the wildcard pattern 'findtxt' to a regular expression. Compiled patterns are cached.
+    All characters except '*' are taken literally.
+    """
+    return re.compile(".*".join(re.escape(part) for part in findtxt.split("*")), re.DOTALL)
+
 
 def match_with_wildcard(findtxt: str, matchtxt: str) -> bool:
-    """Check whether 'findtxt' matches 'matchtxt'.
+    """Check whether 'findtxt' matches 'matchtxt'. The whole of 'matchtxt' shall match (anchored match).
 
     Args:
         findtxt (str): the text string which is checked. It can contain wildcard characters '*', matching zero or more of any character.
@@ -15,8 +28,40 @@ def match_with_wildcard(findtxt: str, matchtxt: str) -> bool:
     if "*" not in findtxt:  # no wildcard characters
         return matchtxt == findtxt
     else:  # there are wildcards
-        m = re.search(findtxt.replace("*", ".*"), matchtxt)
-        return m is not None
+        return wildcard_regex(findtxt).fullmatch(matchtxt) is not None
+
+
+class PrefixIndex:
+    """Index over a list of names, providing fast retrieval of names with a given prefix or matching a wildcard pattern.
+    The names are kept sorted, such that names with a common prefix are found through bisection.
+    Retrieved names are returned in the original order.
+
+    Args:
+        names (Iterable): the names to index (duplicates are ignored)
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: list[str] = list(dict.fromkeys(names))  # original order
+        self._positions = {name: pos for pos, name in enumerate(self.names)}
+        self._sorted = sorted(self._positions.items())
+
+    def prefix(self, pre: str) -> list[str]:
+        """Return all names starting with 'pre'."""
+        found = []
+        for i in range(bisect_left(self._sorted, (pre, -1)), len(self._sorted)):
+            if not self._sorted[i][0].startswith(pre):
+                break
+            found.append(self._sorted[i][1])
+        return [self.names[pos] for pos in sorted(found)]
+
+    def match(self, findtxt: str) -> list[str]:
+        """Return all names matching the wildcard pattern 'findtxt' (see match_with_wildcard()).
+        Only names sharing the literal prefix of the pattern (before the first '*') are checked.
+        """
+        pre, star, _ = findtxt.partition("*")
+        if not len(star):  # no wildcard
+            return [findtxt] if findtxt in self._positions else []
+        return [name for name in self.prefix(pre) if match_with_wildcard(findtxt, name)]
 
 
 def from_xml(file: Path, sub: str | None = None, xpath: str | None = None) -> ET.Element | list[ET.Element]:
@@ -44,3 +89,26 @@ def from_xml(file: Path, sub: str | None = None, xpath: str | None = None) -> ET
         return et
     else:
         return et.findall(xpath)
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """Decimate the series (x,y) for plotting, keeping the minimum and the maximum value within each of 'buckets' buckets.
+    Buckets are typically chosen as the number of pixels along the x-axis, such that the envelope of the plot is preserved.
+
+    Args:
+        x (np.ndarray): the x-values (ordered)
+        y (np.ndarray): the y-values, of the same length as x
+        buckets (int): the number of buckets
+    Returns:
+        Decimated (x,y) with at most 2*buckets points, in the original order
+    """
+    n = len(y)
+    if buckets <= 0 or n <= 2 * buckets:
+        return (x, y)
+    size = -(-n // buckets)  # ceil(n/buckets) points per bucket
+    padded = np.pad(y, (0, size * (-(-n // size)) - n), mode="edge").reshape(-1, size)
+    offset = np.arange(padded.shape[0]) * size
+    imin = np.minimum(np.argmin(padded, axis=1) + offset, n - 1)
+    imax = np.minimum(np.argmax(padded, axis=1) + offset, n - 1)
+    idx = np.sort(np.stack((imin, imax), axis=1), axis=1).ravel()
+    return (x[idx], y[idx])
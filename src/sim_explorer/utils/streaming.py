@@ -0,0 +1,212 @@
+from collections import deque
+
+import numpy as np
+
+"""
+Streaming (single pass, constant memory) statistics of series of observations.
+
+Each observation is an array (e.g. the values of a variable at all time steps of a simulation run),
+and the statistics are calculated element-wise, i.e. memory use depends on the size of an observation,
+but not on the number of observations.
+"""
+
+
+class Welford:
+    """Element-wise count, mean, variance, minimum and maximum (Welford's algorithm).
+
+    Args:
+        shape (tuple): The shape of the observations
+    """
+
+    def __init__(self, shape: tuple | int):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)  # sum of squared differences from the mean
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    def add(self, x: np.ndarray):
+        """Add the observation x."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        np.minimum(self.min, x, out=self.min)
+        np.maximum(self.max, x, out=self.max)
+
+    def merge(self, other: "Welford"):
+        """Merge the statistics of 'other' into this object (Chan's parallel algorithm)."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+
+    @property
+    def var(self) -> np.ndarray:
+        """The (unbiased) sample variance. nan for less than two observations."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.full_like(self.m2, np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        """The sample standard deviation."""
+        return np.sqrt(self.var)
+
+
+class P2Quantile:
+    """Element-wise estimation of the p-quantile with the P² algorithm (Jain & Chlamtac, 1985).
+    Five markers per element are adjusted with each observation, i.e. no observations are stored.
+
+    Args:
+        p (float): The quantile to estimate (0 < p < 1)
+        shape (tuple): The shape of the observations
+    """
+
+    def __init__(self, p: float, shape: tuple | int):
+        assert 0.0 < p < 1.0, f"Quantile 0 < p < 1 expected. Found {p}"
+        self.p = p
+        self.count = 0
+        size = int(np.prod(shape))
+        self.shape = shape
+        self.q = np.zeros((5, size))  # marker heights
+        self.n = np.tile(np.arange(5.0)[:, None], (1, size))  # actual marker positions
+        self.nd = np.tile(np.array([0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0])[:, None], (1, size))  # desired positions
+        self.dn = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])[:, None]  # increments of the desired positions
+
+    def add(self, x: np.ndarray):
+        """Add the observation x."""
+        x = np.asarray(x, dtype=float).ravel()
+        if self.count < 5:  # initialization with the first five observations
+            self.q[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                self.q.sort(axis=0)
+            return
+        self.count += 1
+        q, n = self.q, self.n
+        cols = np.arange(q.shape[1])
+        # find the cell k with q[k] <= x < q[k+1], extending the extreme markers if needed
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        k = np.clip(np.sum(x[None, :] >= q[1:4], axis=0), 0, 3)
+        n += np.arange(5)[:, None] > k[None, :]
+        self.nd += self.dn
+        for i in (1, 2, 3):
+            d = self.nd[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            if not np.any(move):
+                continue
+            s = np.sign(d)
+            # piecewise-parabolic prediction
+            qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+            )
+            # linear prediction, if the parabolic prediction is not between the neighbours
+            j = np.where(s > 0, i + 1, i - 1)
+            ql = q[i] + s * (q[j, cols] - q[i]) / (n[j, cols] - n[i])
+            qp = np.where((q[i - 1] < qp) & (qp < q[i + 1]), qp, ql)
+            q[i] = np.where(move, qp, q[i])
+            n[i] = np.where(move, n[i] + s, n[i])
+
+    @property
+    def value(self) -> np.ndarray:
+        """The current estimate of the quantile. For less than five observations the exact quantile is returned."""
+        if self.count < 5:
+            assert self.count > 0, "No observations"
+            return np.quantile(self.q[: self.count], self.p, axis=0).reshape(self.shape)
+        return self.q[2].reshape(self.shape)
+
+
+class SeriesSummary:
+    """Element-wise running summary of a single time series, which is observed one time step at a time:
+    minimum, maximum, mean, root mean square (RMS), integral (trapezoidal rule)
+    and the times of the (first) minimum and maximum (argmin, argmax).
+
+    Args:
+        shape (tuple): The shape of the observations (values of the variable at one time)
+    """
+
+    STATS = ("min", "max", "mean", "rms", "integral", "argmin", "argmax")
+
+    def __init__(self, shape: tuple | int):
+        self.count = 0
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.argmin = np.zeros(shape)
+        self.argmax = np.zeros(shape)
+        self.sum = np.zeros(shape)
+        self.sum2 = np.zeros(shape)  # sum of squares
+        self.integral = np.zeros(shape)
+        self._last: tuple[float, np.ndarray] | None = None  # the last observation (time, values)
+
+    def add(self, t: float, x: np.ndarray | tuple | float):
+        """Add the observation x at time t. The times shall be increasing."""
+        x = np.asarray(x, dtype=float).reshape(self.min.shape)
+        self.count += 1
+        smaller = x < self.min
+        self.min[smaller] = x[smaller]
+        self.argmin[smaller] = t
+        larger = x > self.max
+        self.max[larger] = x[larger]
+        self.argmax[larger] = t
+        self.sum += x
+        self.sum2 += x * x
+        if self._last is not None:
+            self.integral += (x + self._last[1]) * (t - self._last[0]) / 2
+        self._last = (t, x)
+
+    def value(self, stat: str) -> np.ndarray:
+        """Return the current value of the statistic 'stat' (one of STATS)."""
+        assert self.count > 0, "No observations"
+        if stat == "mean":
+            return self.sum / self.count
+        elif stat == "rms":
+            return np.sqrt(self.sum2 / self.count)
+        assert stat in SeriesSummary.STATS, f"Unknown statistic {stat}. Available: {SeriesSummary.STATS}"
+        return getattr(self, stat)
+
+    def as_dict(self) -> dict[str, float | list[float]]:
+        """All statistics as dict {stat : value}, with python floats (scalar observations) or lists of floats."""
+        return {s: self.value(s).tolist() for s in SeriesSummary.STATS}
+
+
+def window_max(times: np.ndarray, values: np.ndarray, width: float) -> np.ndarray:
+    """Maximum of the values within the forward time window [t, t+width] for all times t of the series,
+    calculated in a single pass with a monotone deque (O(n), independent of the window width).
+
+    Args:
+        times (np.ndarray): The increasing times of the series
+        values (np.ndarray): The values of the series
+        width (float): The width of the time window (>= 0)
+
+    Returns
+    -------
+        Array of window maxima (one element per time)
+    """
+    n = len(times)
+    result = np.empty(n, dtype=np.asarray(values).dtype)
+    window: deque = deque()  # indices of the window with decreasing values
+    j = 0
+    for i in range(n):
+        while j < n and times[j] <= times[i] + width:  # extend the window to the right
+            while len(window) and values[window[-1]] <= values[j]:
+                window.pop()
+            window.append(j)
+            j += 1
+        while window[0] < i:  # drop indices which left the window
+            window.popleft()
+        result[i] = values[window[0]]
+    return result
+
+
+def window_min(times: np.ndarray, values: np.ndarray, width: float) -> np.ndarray:
+    """Minimum of the values within the forward time window [t, t+width], see window_max()."""
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return ~window_max(times, ~values, width)
+    return -window_max(times, -values, width)
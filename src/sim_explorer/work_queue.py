@@ -0,0 +1,253 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from sim_explorer.case import Case, Cases
+
+"""
+sim_explorer module for distributed case execution through a work queue on a shared filesystem.
+
+The queue is a directory (e.g. on a network drive), which is accessible to the submitter and all workers,
+with the sub-folders
+
+* pending: task files, written by the submitter (submit())
+* running: tasks claimed by a worker. Claiming is an atomic rename from 'pending',
+  i.e. exactly one worker succeeds when several workers try to claim the same task.
+  While running the task, the worker regularly refreshes the modification time of the task file (heartbeat),
+  such that requeue() only moves tasks of crashed workers back to 'pending'
+* done: summaries of finished tasks (results file, assertion results or error), written by the workers
+
+A task is a json file {id, cases, case, results}, where 'cases' is the (absolute) path of the cases file,
+'case' the name of the case to run and 'results' the (absolute) path of the results file.
+Workers (work()) run tasks through Cases.run_case() until the queue is empty.
+The submitter collects (collect()) and reports (report()) the task summaries.
+No network services are needed. Only atomic rename within the queue directory is required from the filesystem.
+"""
+
+FOLDERS = ("pending", "running", "done")
+
+
+def _write_atomic(file: Path, content: dict):
+    """Write content as json to file, such that readers never see incomplete files."""
+    tmp = file.with_name(f".{file.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(content, indent=2))
+    os.replace(tmp, file)
+
+
+def _queue(queue: Path | str) -> Path:
+    """Ensure that the queue directory and its sub-folders exist."""
+    queue = Path(queue)
+    for folder in FOLDERS:
+        (queue / folder).mkdir(parents=True, exist_ok=True)
+    return queue
+
+
+def submit(
+    queue: Path | str,
+    cases: Path | str,
+    names: list[str] | None = None,
+    results: Path | str | None = None,
+    run_subs: bool = False,
+) -> list[str]:
+    """Submit case tasks to the queue.
+
+    Args:
+        queue (Path, str): The queue directory
+        cases (Path, str): The cases file. Must be accessible from all workers
+        names (list)=None: Names of the cases to run. None: the 'base' case
+        results (Path, str)=None: Folder where the results files are written (<case name>.js5).
+           None: the folder of the cases file
+        run_subs (bool)=False: Submit also all sub-cases of the named cases, each as a separate task
+
+    Returns
+    -------
+        The list of task ids
+    """
+    queue = _queue(queue)
+    _cases = Cases(cases)
+    results = Path(results).resolve() if results is not None else _cases.file.parent.resolve()
+    results.mkdir(parents=True, exist_ok=True)
+    todo: list[Case] = []
+    for name in names or ["base"]:
+        case = _cases.case_by_name(name)
+        assert isinstance(case, Case), f"Case {name} not found in {_cases.file}"
+        for c in case.list_cases(as_name=False, flat=True) if run_subs else [case]:
+            if c not in todo:
+                todo.append(c)  # type: ignore[arg-type]
+    ids = []
+    for c in todo:
+        task_id = f"{c.name}-{uuid.uuid4().hex[:12]}"
+        task = {
+            "id": task_id,
+            "cases": str(_cases.file.resolve()),
+            "case": c.name,
+            "results": str(results / f"{c.name}.js5"),
+        }
+        _write_atomic(queue / "pending" / f"{task_id}.json", task)
+        ids.append(task_id)
+    return ids
+
+
+def claim(queue: Path | str) -> Path | None:
+    """Claim a pending task of the queue by renaming it to the 'running' folder.
+
+    Returns
+    -------
+        The claimed task file or None if no task is pending
+    """
+    queue = Path(queue)
+    for task in sorted((queue / "pending").glob("*.json")):
+        claimed = queue / "running" / task.name
+        try:
+            os.rename(task, claimed)  # atomic. Fails if another worker was faster
+        except FileNotFoundError:
+            continue
+        os.utime(claimed)  # claim time, used by requeue()
+        return claimed
+    return None
+
+
+def run_task(task: dict[str, Any], worker: str = "") -> dict[str, Any]:
+    """Run the case task 'task' (see submit()) and return the summary.
+
+    Returns
+    -------
+        The task dict, extended with 'worker', 'passed', 'assertions' (list of AssertionResult dicts),
+        'error' (None or error message) and 'duration' (seconds)
+    """
+    summary = dict(task, worker=worker, passed=False, assertions=[], error=None)
+    start = time.perf_counter()
+    try:
+        cases = Cases(task["cases"])
+        case = cases.case_by_name(task["case"])
+        assert isinstance(case, Case), f"Case {task['case']} not found in {task['cases']}"
+        cases.run_case(case, dump=task["results"], run_subs=False, run_assertions=True)
+        summary["assertions"] = [r.model_dump() for r in cases.assertion.report(case)]
+        summary["passed"] = all(r["result"] for r in summary["assertions"])
+    except Exception as err:  # reported to the submitter. The worker continues with the next task
+        summary["error"] = f"{type(err).__name__}: {err}"
+    summary["duration"] = time.perf_counter() - start
+    return summary
+
+
+def _heartbeat(claimed: Path, interval: float, stop: threading.Event):
+    """Refresh the modification time of the claimed task file every 'interval' seconds until 'stop' is set."""
+    while not stop.wait(interval):
+        try:
+            os.utime(claimed)
+        except FileNotFoundError:  # re-queued in the meantime
+            return
+
+
+def work(
+    queue: Path | str,
+    worker: str | None = None,
+    wait: float = 0.0,
+    max_tasks: int | None = None,
+    heartbeat: float = 10.0,
+) -> int:
+    """Work on the tasks of the queue until it is empty.
+
+    Args:
+        queue (Path, str): The queue directory
+        worker (str)=None: Name of the worker, reported in the summaries. Default: <host>:<process id>
+        wait (float)=0.0: Time in seconds to wait for new tasks before stopping when the queue is empty
+        max_tasks (int)=None: Optional maximum number of tasks to run
+        heartbeat (float)=10.0: Interval in seconds at which the claimed task file is refreshed while running.
+           Tasks are only re-queued (see requeue()) if they were not refreshed for longer than that
+
+    Returns
+    -------
+        The number of tasks run by this worker
+    """
+    queue = _queue(queue)
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    count = 0
+    idle = time.monotonic()
+    while max_tasks is None or count < max_tasks:
+        claimed = claim(queue)
+        if claimed is None:
+            if time.monotonic() - idle >= wait:
+                break
+            time.sleep(min(0.5, wait))
+            continue
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(claimed, heartbeat, stop), daemon=True)
+        beat.start()
+        try:
+            summary = run_task(json.loads(claimed.read_text()), worker)
+        finally:
+            stop.set()
+            beat.join()
+        _write_atomic(queue / "done" / claimed.name, summary)
+        claimed.unlink(missing_ok=True)  # the task might have been re-queued in the meantime
+        count += 1
+        idle = time.monotonic()
+    return count
+
+
+def requeue(queue: Path | str, older_than: float) -> list[str]:
+    """Move tasks which were not refreshed by their worker (see work()) for more than 'older_than' seconds
+    (e.g. claimed by a crashed worker) back to pending. 'older_than' should exceed the heartbeat interval of the workers.
+
+    Returns
+    -------
+        The ids of the re-queued tasks
+    """
+    queue = _queue(queue)
+    ids = []
+    for task in (queue / "running").glob("*.json"):
+        try:
+            if time.time() - task.stat().st_mtime > older_than:
+                os.rename(task, queue / "pending" / task.name)
+                ids.append(task.stem)
+        except FileNotFoundError:  # finished in the meantime
+            continue
+    return ids
+
+
+def collect(
+    queue: Path | str, ids: list[str] | None = None, timeout: float | None = None, poll: float = 0.5
+) -> dict[str, dict[str, Any]]:
+    """Collect the summaries of finished tasks.
+
+    Args:
+        queue (Path, str): The queue directory
+        ids (list)=None: The task ids to wait for. None: collect all finished tasks without waiting
+        timeout (float)=None: Maximum time to wait in seconds. None: wait until all tasks are done
+        poll (float)=0.5: Polling interval in seconds
+
+    Returns
+    -------
+        Dictionary {task id : summary (see run_task())}
+    """
+    queue = _queue(queue)
+    start = time.monotonic()
+    while ids is not None:
+        missing = [i for i in ids if not (queue / "done" / f"{i}.json").exists()]
+        if not len(missing) or (timeout is not None and time.monotonic() - start > timeout):
+            break
+        time.sleep(poll)
+    files = (queue / "done").glob("*.json") if ids is None else (queue / "done" / f"{i}.json" for i in ids)
+    return {f.stem: json.loads(f.read_text()) for f in files if f.exists()}
+
+
+def report(summaries: dict[str, dict[str, Any]], ids: list[str] | None = None) -> str:
+    """Make a compact report of the task summaries (see collect()). Tasks in ids which are not finished are listed."""
+    txt = ""
+    for task_id in ids or list(summaries.keys()):
+        s = summaries.get(task_id, None)
+        if s is None:
+            txt += f"{task_id}: not finished\n"
+        elif s["error"] is not None:
+            txt += f"{s['case']}: ERROR ({s['worker']}) {s['error']}\n"
+        else:
+            passed = sum(a["result"] for a in s["assertions"])
+            txt += f"{s['case']}: {'PASSED' if s['passed'] else 'FAILED'} {passed} of {len(s['assertions'])} "
+            txt += f"assertions ({s['worker']}, {s['duration']:.1f}s) -> {s['results']}\n"
+    return txt
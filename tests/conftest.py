@@ -1,7 +1,7 @@
 import logging
 import os
 from pathlib import Path
-from shutil import rmtree
+from shutil import copy, rmtree
 
 import pytest
 
@@ -24,6 +24,17 @@ def test_dir() -> Path:
     return Path(__file__).parent.absolute()
 
 
+@pytest.fixture
+def bouncing_ball_3d(tmp_path: Path) -> Path:
+    """
+    Fixture that copies the BouncingBall3D system (cases, FMU and system structure) to 'tmp_path'.
+    Returns the path of the copied cases file.
+    """
+    for f in ("BouncingBall3D.cases", "BouncingBall3D.fmu", "OspSystemStructure.xml"):
+        copy(Path(__file__).parent / "data" / "BouncingBall3D" / f, tmp_path / f)
+    return tmp_path / "BouncingBall3D.cases"
+
+
 output_dirs = [
     "results",
 ]
@@ -1,6 +1,7 @@
 # type: ignore
 
 import ast
+import gc
 from math import cos, sin
 from pathlib import Path
 
@@ -9,7 +10,8 @@ import numpy as np
 import pytest
 
 from sim_explorer.assertion import Assertion, Temporal
-from sim_explorer.case import Cases, Results
+from sim_explorer.case import Case, Cases, Results
+from sim_explorer.utils.streaming import window_max, window_min
 
 _t = [0.1 * float(x) for x in range(100)]
 _x = [0.3 * sin(t) for t in _t]
@@ -94,6 +96,80 @@ def test_temporal():
     assert str(err.value) == "'G'", f"Found:{err.value}"
 
 
+def test_window():
+    rng = np.random.default_rng(1)
+    times = np.cumsum(rng.uniform(0.01, 0.1, 500))
+    values = rng.normal(size=500)
+    for width in (0.0, 0.05, 0.3, 100.0):
+        expected = [values[(times >= t) & (times <= t + width)].max() for t in times]
+        assert np.array_equal(window_max(times, values, width), expected), f"Window width {width}"
+    flags = values > 0
+    expected = [flags[(times >= t) & (times <= t + 0.3)].all() for t in times]
+    assert np.array_equal(window_min(times, flags, 0.3), expected)
+
+
+def test_windowed_temporal():
+    assert Case._disect_at_time_tl("1@E0.5", []) == ("1", Temporal.E, (0.5,))
+    assert Case._disect_at_time_tl("2@HOLDS 1.5", []) == ("2", Temporal.H, (1.5,))
+    assert Case._disect_at_time_tl("3@W2..3.5", []) == ("3", Temporal.W, (2.0, 3.5))
+    assert Case._disect_at_time_tl("4@FINALLY", []) == ("4", Temporal.F, ())
+    assert Case._disect_at_time_tl("5@TIME 2", []) == ("5", Temporal.T, (2.0,))
+    with pytest.raises(ValueError, match="Unknown Temporal specification W2"):
+        Case._disect_at_time_tl("6@W2", [])
+
+    asserts = Assertion()
+    asserts.symbol("x")
+    asserts.expr("1", "x > 0.2, x < -0.2")  # trigger, response: positive swing followed by a negative swing
+    asserts.temporal("1", Temporal.E, (3.5,))
+    data = list(zip(_t, _x, strict=True))  # 0.3*sin(t), period 2*pi
+    assert asserts.eval_series("1", data) == (_t[-1], True)
+    asserts.temporal("1", Temporal.E, (2.0,))
+    assert asserts.eval_series("1", data) == (0.8, False), "The first negative swing is more than 2s after 0.8"
+    asserts.expr("2", "x > 0.2")
+    asserts.temporal("2", Temporal.H, (1.5,))
+    assert asserts.eval_series("2", data) == (0.8, True), "x > 0.2 during [0.8, 2.4]"
+    asserts.temporal("2", Temporal.H, (1.7,))
+    assert asserts.eval_series("2", data)[1] is False
+    asserts.temporal("2", Temporal.W, (1.0, 2.0))
+    assert asserts.eval_series("2", data) == (2.0, True)
+    asserts.temporal("2", Temporal.W, (1.0, 2.5))
+    assert asserts.eval_series("2", data) == (2.5, False)
+
+
+def test_robustness():
+    assert Assertion.robustness_expr("x[2] < 3.0") == "np.min((3.0) - (x[2]))"
+    assert Assertion.robustness_expr("not g == 1.5") == "-(-np.max(np.abs((g) - (1.5))))"
+    expected = "max(min(np.min((x) - (0)), np.min((1) - (x))), np.min((y) - (2)))"
+    assert Assertion.robustness_expr("0 < x <= 1 or y > 2") == expected
+    assert Assertion.robustness_expr("x.dot(v)") is None, "Not a comparison"
+    asserts = Assertion()
+    asserts.symbol("x")
+    data = list(zip(_t, _x, strict=True))  # 0.3*sin(t)
+    asserts.expr("1", "x < 0.5")
+    for typ, args, expected in (
+        (Temporal.A, (), 0.5 - max(_x)),
+        (Temporal.F, (), 0.5 - max(_x[-2:])),
+        (Temporal.T, (1.0,), 0.5 - 0.3 * sin(1.0)),
+        (Temporal.H, (2.0,), max(0.5 - max(_x[i : i + 21]) for i in range(80))),  # best window of width 2
+        (Temporal.W, (7.0, 8.0), 0.5 - max(_x[70:81])),
+    ):
+        asserts.temporal("1", typ, args)
+        assert asserts.robustness("1", data) == pytest.approx(expected, abs=1e-12), f"Temporal {typ.name}"
+        assert asserts.eval_series("1", data)[1] == (expected > 0), f"Verdict and margin agree for {typ.name}"
+    asserts.expr("4", "x < 0.2")
+    asserts.temporal("4", Temporal.A, ())
+    assert asserts.eval_series("4", data) == (0.8, False), "Always True fails at the first violation"
+    assert asserts.robustness("4", data) == pytest.approx(0.2 - max(_x), abs=1e-12)
+    asserts.expr("2", "x > 0.2, x < -0.2")
+    asserts.temporal("2", Temporal.E, (2.0,))
+    assert not asserts.eval_series("2", data)[1]
+    assert asserts.robustness("2", data) < 0, "Violated"
+    asserts.temporal("2", Temporal.E, (3.5,))
+    assert asserts.robustness("2", data) > 0, "Satisfied"
+    asserts.expr("3", "x.dot(x)")
+    assert asserts.robustness("3", data) is None
+
+
 def test_assertion():
     # show_data()print("Analyze", analyze( "t>8 & x>0.1"))
     asserts = Assertion()
@@ -154,6 +230,25 @@ def test_assertion():
     )
 
 
+def test_symbol_table():
+    asserts = Assertion()
+    variables = {f"v{i}": {"instances": ("comp",), "variables": (1, 2, 3), "model": "M"} for i in range(2000)}
+    variables.update({"w": {"instances": ("a", "b"), "variables": (4,), "model": "N"}})
+    asserts.register_vars(variables)
+    assert asserts.info("v1999") == "comp"
+    assert asserts.info("comp_v7", "variable") == "v7"
+    assert asserts.info("b_w", "length") == 1
+    assert asserts.info("v3", "model") == "M"
+    assert asserts.info("a_w_max", "variable") == "w", "Summary statistics symbols are included"
+    assert asserts.info("t", "length") == 1
+    with pytest.raises(KeyError, match="does not seem to represent a registered variable"):
+        asserts.info("w")  # not unique
+    with pytest.raises(KeyError, match="Unknown typ"):
+        asserts.info("v1", "unit")
+    syms, _ = asserts.expr_get_symbols_functions("b_w + v1999[0] * t - v0_max[1] + comp_v5[2]")
+    assert syms == ["t", "comp_v5", "v1999", "b_w", "v0_max"], "In the order of registration"
+
+
 def test_assertion_spec():
     cases = Cases(Path(__file__).parent / "data" / "SimpleTable" / "test.cases")
     _c = cases.case_by_name("case1")
@@ -250,8 +345,65 @@ def test_do_assert(show):
         "details": "@1.1547 (interpolated)",
         "case": None,
     }, f"Found {asserts.assertions('4')}"
-    count = asserts.do_assert_case(res)  # do all
+    single = {k: dict(asserts.assertions(k), case="restitutionAndGravity") for k in ("1", "2", "3", "4")}
+    count = asserts.do_assert_case(res)  # do all, retrieving the union of the variables once
     assert count == [4, 4], "Expected 4 of 4 passed"
+    assert all(asserts.assertions(k) == single[k] for k in single), "Same results as the single assertions"
+    report = {r.key: r for r in asserts.report(case)}
+    assert report["1"].robustness == 0.0, "g==1.5 is exactly satisfied"
+    times, values = zip(*res.retrieve(["bb.x[2]"]), strict=True)
+    assert report["4"].robustness == pytest.approx(0.4 - abs(np.interp(1.1547, times, values)))
+    asserts.expr("5", "x[2] > 0.5")
+    asserts.temporal("5", Temporal.A, ())
+    assert not asserts.do_assert("5", res), "The ball falls below 0.5m"
+    assert asserts._robustness["5"] == pytest.approx(min(values) - 0.5), "Negative margin of the failed assertion"
+
+
+def test_cross_case():
+    cases = Cases(spec=Path(__file__).parent / "data" / "BouncingBall3D" / "BouncingBall3D.cases")
+    asserts = cases.assertion
+    asserts.expr("10", "x[2] <= base.x[2] + 1e-9")
+    asserts.temporal("10", Temporal.W, (0.0, 3.0))
+    asserts.description("10", "The restitution case bounces lower than base")
+    assert asserts.syms("10") == ["x", "base__x"]
+    assert asserts.expr("10") == "x[2] <= base.x[2] + 1e-9", "The expression is kept as given"
+    restitution = cases.case_by_name("restitution")
+    restitution.run(dump=None)
+    with pytest.raises(AssertionError, match="Results of case base not available"):
+        asserts.do_assert("10", restitution.res)
+    cases.case_by_name("base").run(dump=None)
+    assert asserts.do_assert("10", restitution.res)
+    assert asserts.do_assert("10", cases.case_by_name("base").res), "Also true for the base case itself"
+    assert asserts._robustness["10"] == pytest.approx(1e-9)
+    asserts.expr("12", "abs(base.x[2] - x[2]) < 1e-9")
+    asserts.temporal("12", Temporal.T, (0.4,))
+    assert asserts.do_assert("12", restitution.res), "Identical before the first bounce"
+    short = Case(cases, "short", spec={"parent": "base", "spec": {"stopTime": 2.0}})
+    short.run(dump=None)
+    asserts.expr("13", "x[2] <= short.x[2] + 1e-9")
+    asserts.temporal("13", Temporal.A, ())
+    with pytest.raises(AssertionError, match="Time 2.01 outside of the time range 0.01..2.0 of short.x"):
+        asserts.do_assert("13", restitution.res)
+    assert asserts.do_assert("13", short.res)
+    asserts.expr("14", "abs(short.x[2] - x[2]) < 1e-9")
+    asserts.temporal("14", Temporal.T, (0.4,))
+    assert asserts.do_assert("14", restitution.res), "Only the time 0.4 is evaluated"
+    asserts.temporal("14", Temporal.T, (2.5,))
+    with pytest.raises(AssertionError, match="Time 2.5 outside of the time range 0.01..2.0 of short.x"):
+        asserts.do_assert("14", restitution.res)
+    asserts.temporal("13", Temporal.W, (0.0, 1.5))
+    assert asserts.do_assert("13", restitution.res), "Only the records within the window are evaluated"
+    asserts.temporal("13", Temporal.W, (0.0, 2.5))
+    with pytest.raises(AssertionError, match="Time 2.01 outside of the time range 0.01..2.0 of short.x"):
+        asserts.do_assert("13", restitution.res)
+    cases.unregister_case(short)
+    assert "short" not in asserts._results, "Results of discarded cases are not kept"
+    gravity = cases.case_by_name("gravity")
+    gravity.run(dump=None)
+    assert "gravity" in asserts._results
+    del gravity.res
+    gc.collect()
+    assert "gravity" not in asserts._results, "Only weak references to the results are kept"
 
 
 if __name__ == "__main__":
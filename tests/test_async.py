@@ -0,0 +1,101 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from sim_explorer.case import Case, Cases
+from sim_explorer.exceptions import CaseCancelledError
+from sim_explorer.models import AssertionResult
+
+
+def test_arun_case(tmp_path, bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        tick = asyncio.ensure_future(ticker())
+        res, asserts = await cases.arun_case("restitutionAndGravity")
+        tick.cancel()
+        return ticks, res, asserts
+
+    ticks, res, asserts = asyncio.run(main())
+    assert ticks > 0, "The event loop is not blocked during the simulation"
+    assert res.retrieve((("bb", "g"),)) == [[0.0, 1.5]]
+    assert cases.case_by_name("restitutionAndGravity").res is res  # type: ignore
+    assert len(asserts) == 4 and all(isinstance(a, AssertionResult) and a.result for a in asserts)
+    assert (tmp_path / "restitutionAndGravity.js5").exists()
+
+
+def test_arun_cases(tmp_path, bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+
+    async def main():
+        return [(c.name, len(a)) async for c, _, a in cases.arun_cases(["base"], run_subs=True, max_concurrent=2)]
+
+    finished = asyncio.run(main())
+    assert sorted(finished) == [("base", 0), ("gravity", 1), ("restitution", 0), ("restitutionAndGravity", 4)]
+    for name, _ in finished:
+        assert (tmp_path / f"{name}.js5").exists()
+
+
+def test_aclose(bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+    futures: list[Future] = []
+
+    class Executor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs) -> Future:
+            futures.append(super().submit(*args, **kwargs))
+            return futures[-1]
+
+    async def main():
+        with Executor(max_workers=1) as executor:
+            finished = cases.arun_cases(["base"], True, False, executor, max_concurrent=1)
+            first = await anext(finished)
+            await finished.aclose()
+            return first, [f.done() for f in futures]
+
+    first, done = asyncio.run(main())
+    assert first[0].name == "base"
+    assert all(done), "Running simulations are stopped and released when the generator is closed"
+
+
+def test_arun_process(bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+
+    async def main():
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return [c.name async for c, _, _ in cases.arun_cases(["restitution"], True, True, executor)]
+
+    assert sorted(asyncio.run(main())) == ["restitution", "restitutionAndGravity"]
+
+
+def test_cancel(bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+    case = cases.case_by_name("gravity")
+    assert isinstance(case, Case)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(CaseCancelledError):
+        case.run(cancel=cancel)
+    assert cases.simulator._simulator is None, "Simulator released"
+
+    async def main():
+        task = asyncio.ensure_future(cases.arun_case("gravity"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        start = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 5.0
@@ -3,6 +3,7 @@ from pathlib import Path
 import pytest
 
 from sim_explorer.case import Case, Cases
+from sim_explorer.exceptions import CaseInitError
 from sim_explorer.simulator_interface import SimulatorInterface
 
 # def test_tuple_iter():
@@ -30,6 +31,11 @@ def test_cases_management():
         (1,),
     ), f"Case variable of model 0, ref 1: {cases.case_var_by_ref( 0, 1)}"
     assert cases.case_var_by_ref("tab", 1) == ("x", (1,)), "Same with model by name"
+    assert cases.case_var_by_ref("tab", (2, 0)) == ("x", (2, 0)), "Arbitrary subsets of refs"
+    assert cases.case_var_by_ref("tab", (0, 1, 2)) == ("x", ()), "The whole variable"
+    assert cases.case_var_by_ref("tab", (1, 99)) == ("", ()), "Unknown reference"
+    assert cases._ref_index[("tab", 2)] == {"x": 2}
+    assert cases.simulator._simulator is None, "Cases are set up without instantiating the simulator"
 
 
 def test_cases():
@@ -81,6 +87,17 @@ def test_cases():
     assert all(x in vs for x in ("v_min", "v_z", "v"))
 
 
+def test_case_index():
+    cases = Cases(Path(__file__).parent / "data" / "BouncingBall0" / "BouncingBall.cases")
+    names = cases.base.list_cases(as_name=True, flat=True)
+    assert list(cases._case_index.keys()) == names, f"Found {list(cases._case_index.keys())}"
+    assert cases.case_by_name("base") is cases.base
+    with pytest.raises(CaseInitError) as err:
+        _ = Case(cases, "gravity", spec={"spec": {"g": 1.0}})
+    assert str(err.value) == "Case name 'gravity' is not unique"
+    assert cases.case_by_name("gravity") is not None and len(cases.base.subs) == len(names) - 2
+
+
 if __name__ == "__main__":
     retcode = pytest.main(["-rA", "-v", __file__])
     assert retcode == 0, f"Non-zero return code {retcode}"
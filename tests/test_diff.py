@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sim_explorer.case import Results
+from sim_explorer.cli.sim_explorer import diff
+from sim_explorer.diff import diff_many, diff_report, diff_results, diff_series, results_series
+from sim_explorer.json5 import Json5
+
+
+def _results(values: list[float], dt: float = 0.1, e: float = 0.5) -> Json5:
+    js = {"header": {"case": "test"}}
+    for i, v in enumerate(values):
+        js[str(i * dt)] = {"bb": {"x": [v, 2 * v], "e": e}} if i == 0 else {"bb": {"x": [v, 2 * v]}}
+    return Json5(js)
+
+
+def test_results_series():
+    file = Path(__file__).parent / "data" / "BouncingBall3D" / "test_results"
+    series = results_series(file)
+    assert list(series.keys())[:5] == ["bb.e", "bb.g", "bb.x[0]", "bb.x[1]", "bb.x[2]"]
+    times, values = series["bb.x[2]"]
+    assert len(times) == len(values) == 300
+    assert values[0] == 39.35076771653544
+
+
+def test_diff_series():
+    t = np.linspace(0.0, 1.0, 11)
+    d = diff_series((t, t), (t, t))
+    assert d == {"max_abs": 0.0, "max_rel": 0.0, "first_divergence": None, "uncovered": [], "passed": True}
+    t2 = np.linspace(0.0, 1.0, 101)  # other time grid
+    y2 = np.where(t2 > 0.5, t2 + 0.01, t2)
+    d = diff_series((t, t), (t2, y2), rtol=1e-3)
+    assert d["first_divergence"] == pytest.approx(0.51) and not d["passed"], "First sample of b after the jump"
+    assert d["max_abs"] == pytest.approx(0.01)
+    assert diff_series((t, t), (t2 + 2.0, t2))["passed"] is False, "No overlap"
+    d = diff_series((t, t), (t[:6], t[:6]))
+    assert d["uncovered"] == [(0.5, 1.0)] and not d["passed"], "Truncated b"
+    assert d["first_divergence"] == 0.5 and d["max_abs"] == 0.0
+    d = diff_series((t[:6], t[:6]), (t, t))
+    assert d["uncovered"] == [(0.5, 1.0)] and not d["passed"], "Truncated a"
+    report = diff_report({"bb.x": d})
+    assert report.splitlines()[1] == "   bb.x: max abs 0, max rel 0, diverges @0.5, not covered 0.5..1.0"
+    y = np.where(t2 < 0.55, t2, 0.5)  # kink between two samples of the coarse grid
+    for d in (diff_series((t, t), (t2, y), rtol=1e-3), diff_series((t2, y), (t, t), rtol=1e-3)):
+        assert d["first_divergence"] == pytest.approx(0.55) and not d["passed"], "Samples of both grids are compared"
+    assert diff_series((t, t), (t, 1.001 * t), rtol=1e-3)["passed"], "The relative error is within rtol"
+    assert diff_series((t, t), (t, 1.001 * t), rtol=1e-3)["max_rel"] == pytest.approx(0.001 / 1.001)
+
+
+def test_diff_hold():
+    t = np.linspace(0.0, 1.0, 101)
+    step = (t >= 0.5).astype(float)
+    changes = (np.array([0.0, 0.5, 1.0]), np.array([0.0, 1.0, 1.0]))  # the step recorded with the 'change' policy
+    assert not diff_series((t, step), changes)["passed"], "Linear interpolation of a zero-order hold signal"
+    for d in (diff_series((t, step), changes, hold=(False, True)), diff_series(changes, (t, step), hold=(True, False))):
+        assert d["passed"] and d["max_abs"] == 0.0, f"Zero-order hold in both directions. Found {d}"
+    a = Json5({"header": {"case": "dense"}, **{str(ti): {"bb": {"v": vi}} for ti, vi in zip(t, step, strict=True)}})
+    b = Json5({"header": {"case": "change", "record": {"v": "change"}}, "0.0": {"bb": {"v": 0.0}}})
+    b.js_py.update({"0.5": {"bb": {"v": 1.0}}, "1.0": {"bb": {"v": 1.0}}})
+    assert diff_results(a, b)["bb.v"]["passed"], "header.record of the results is taken into account"
+    assert diff_results(b, a)["bb.v"]["passed"], "Also when swapped"
+
+
+def test_diff_results():
+    a = _results([0.0, 1.0, 2.0, 3.0])
+    b = _results([0.0, 1.0, 2.5, 3.0], e=0.6)
+    diffs = diff_results(a, b)
+    assert diffs["bb.x[0]"]["first_divergence"] == 0.2
+    assert diffs["bb.x[1]"]["max_abs"] == 1.0
+    assert diffs["bb.e"]["max_rel"] == pytest.approx(0.1 / 0.6)
+    assert diffs["bb.x[0]"]["max_rel"] == pytest.approx(0.2)
+    file = Path(__file__).parent / "data" / "BouncingBall3D" / "test_results"
+    diffs = diff_results(file, file)
+    assert all(d["passed"] for d in diffs.values())
+    c = Json5({"header": {"case": "test"}, "0.0": {"bb": {"y": 1.0}}})
+    diffs = diff_results(a, c)
+    assert diffs["bb.y"] == {"missing": "a", "passed": False}
+    assert diffs["bb.e"] == {"missing": "b", "passed": False}
+    report = diff_report(diff_results(a, b), "a.js5")
+    assert report.splitlines()[0] == "a.js5: 3 of 3 series changed"
+    assert report.splitlines()[1] == "   bb.x[0]: max abs 0.5, max rel 0.2, diverges @0.2"
+
+
+def test_diff_many(tmp_path):
+    for name, values in (("a", [0.0, 1.0, 2.0]), ("b", [0.0, 1.0, 2.1]), ("c", [0.0, 1.0, 2.0])):
+        _results(values).write(tmp_path / f"{name}.js5")
+    diffs = diff_many([(tmp_path / "a.js5", tmp_path / "b.js5"), (tmp_path / "a.js5", tmp_path / "c.js5")])
+    assert not diffs[0]["bb.x[0]"]["passed"]
+    assert all(d["passed"] for d in diffs[1].values())
+    a, b = _results([0.0, 1.0, 2.0]), _results([0.0, 1.0])
+    diffs = diff_many([(a, b), (tmp_path / "a.js5", a)])
+    assert diffs[0]["bb.x[0]"]["uncovered"] == [(0.1, 0.2)], "Json5 objects are accepted"
+    assert all(d["passed"] for d in diffs[1].values()), "Mixed file and Json5 object"
+    file = Path(__file__).parent / "data" / "BouncingBall3D" / "test_results"
+    diffs = diff_many([(Results(file=file), file), (file, Results(file=file))])
+    assert all(d["passed"] for diffs_pair in diffs for d in diffs_pair.values()), "Results objects are accepted"
+
+
+def test_diff_cli(tmp_path, capsys):
+    for folder, values in (("ref", [0.0, 1.0, 2.0]), ("new", [0.0, 1.0, 2.1])):
+        (tmp_path / folder).mkdir()
+        _results(values).write(tmp_path / folder / "case1.js5")
+        _results(values).write(tmp_path / folder / "case2.js5")
+    diff([str(tmp_path / "ref"), str(tmp_path / "new"), "--atol", "0.5"])
+    out = capsys.readouterr().out
+    assert out.splitlines() == ["case1.js5: 0 of 3 series changed", "case2.js5: 0 of 3 series changed"]
+    diff([str(tmp_path / "ref" / "case1.js5"), str(tmp_path / "new" / "case1.js5")])
+    out = capsys.readouterr().out
+    assert out.startswith("case1.js5: 2 of 3 series changed")
+
+
+if __name__ == "__main__":
+    retcode = pytest.main(["-rA", "-v", __file__])
+    assert retcode == 0, f"Non-zero return code {retcode}"
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sim_explorer.monte_carlo import draw, monte_carlo
+from sim_explorer.utils.streaming import P2Quantile, Welford
+
+
+def test_welford():
+    rng = np.random.default_rng(1)
+    data = rng.normal(2.0, 3.0, size=(1000, 4))
+    a, b = Welford(4), Welford(4)
+    for x in data[:300]:
+        a.add(x)
+    for x in data[300:]:
+        b.add(x)
+    assert np.allclose(b.mean, data[300:].mean(axis=0))
+    a.merge(b)
+    assert a.count == 1000
+    assert np.allclose(a.mean, data.mean(axis=0))
+    assert np.allclose(a.var, data.var(axis=0, ddof=1))
+    assert np.array_equal(a.min, data.min(axis=0)) and np.array_equal(a.max, data.max(axis=0))
+    assert np.all(np.isnan(Welford(2).var))
+
+
+def test_p2_quantile():
+    rng = np.random.default_rng(2)
+    data = np.stack((rng.normal(0.0, 1.0, 5000), rng.uniform(0.0, 10.0, 5000), rng.exponential(1.0, 5000)), axis=1)
+    for p in (0.05, 0.5, 0.95):
+        est = P2Quantile(p, 3)
+        for i, x in enumerate(data):
+            est.add(x)
+            if i == 2:
+                assert np.allclose(est.value, np.quantile(data[:3], p, axis=0)), "Exact for few observations"
+        assert np.allclose(est.value, np.quantile(data, p, axis=0), atol=0.05, rtol=0.02), f"Quantile {p}"
+
+
+def test_draw():
+    seeds = np.random.SeedSequence(42).spawn(2)
+    dists = {"e": ["uniform", 0.4, 0.6], "g": ["normal", 9.81, 0.1]}
+    first = draw(dists, seeds[0])
+    assert first == draw(dists, np.random.SeedSequence(42).spawn(2)[0]), "Reproducible"
+    assert first != draw(dists, seeds[1]), "Independent streams"
+    assert 0.4 <= first["e"] <= 0.6
+
+
+def test_monte_carlo():
+    file = Path(__file__).parent / "data" / "BouncingBall3D" / "BouncingBall3D.cases"
+    dists = {"e": ["uniform", 0.4, 0.9], "g": ["normal", 9.81, 0.5]}
+    stats = monte_carlo(file, "base", dists, ["bb.x[2]", "bb.v[2]"], samples=12, seed=7, max_workers=2)
+    x = stats["bb.x[2]"]
+    assert x["count"] == 12 and len(x["time"]) == len(x["mean"]) == 300
+    assert np.all(x["min"] <= x["q0.05"]) and np.all(x["q0.05"] <= x["q0.95"]) and np.all(x["q0.95"] <= x["max"])
+    assert x["mean"][0] == pytest.approx(39.37, abs=0.1), "All samples start at 1m (39.37 inch)"
+    assert x["std"][-1] > 0, "Spread at the end"
+    again = monte_carlo(file, "base", dists, ["bb.x[2]"], samples=12, seed=7, max_workers=3)
+    for key in ("mean", "var", "min", "max", "q0.5"):
+        assert np.array_equal(again["bb.x[2]"][key], x[key]), f"Reproducible {key}, independent of the processes"
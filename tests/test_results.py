@@ -1,7 +1,13 @@
 from datetime import datetime
 from pathlib import Path
 
-from sim_explorer.case import Cases, Results
+import numpy as np
+import pytest
+
+from sim_explorer.case import Case, Cases, Results, ResultsWriter
+from sim_explorer.exceptions import CaseInitError
+from sim_explorer.metrics import exposition
+from sim_explorer.utils.misc import minmax_decimate
 
 
 def test_init():
@@ -40,6 +46,27 @@ def test_plot_time_series(show):
         res.plot_time_series(comp_var=["bb.x[2]", "bb.v[2]"], title="Test plot")
 
 
+def test_plot_to_file(tmp_path):
+    file = Path(__file__).parent / "data" / "BouncingBall3D" / "test_results"
+    res = Results(file=file)
+    res.plot_time_series(comp_var=["bb.x[2]", ("bb", "v")], title="Test plot", file=tmp_path / "plot.svg")
+    assert (tmp_path / "plot.svg").exists()
+    res.plot_time_series(comp_var=["bb.x[2]"], file=tmp_path / "plot.png", decimate=False)
+    assert (tmp_path / "plot.png").exists()
+
+
+def test_minmax_decimate():
+    x = np.linspace(0.0, 10.0, 100001)
+    y = np.sin(x)
+    y[5000] = 5.0  # a spike
+    xd, yd = minmax_decimate(x, y, 500)
+    assert len(xd) == len(yd) <= 1000
+    assert np.all(np.diff(xd) >= 0), "Original order kept"
+    assert yd.max() == 5.0 and xd[np.argmax(yd)] == x[5000], "Spikes are kept"
+    assert yd.min() == y.min()
+    assert len(minmax_decimate(x[:10], y[:10], 500)[0]) == 10, "Short series are not decimated"
+
+
 def test_inspect():
     file = Path(__file__).parent / "data" / "BouncingBall3D" / "test_case"
     res = Results(file=file)
@@ -64,6 +91,136 @@ def test_retrieve():
     assert data[0] == [0.01, [0.01, 0.0, 39.35076771653544], [1.0, 0.0, -0.0981]]
 
 
+def test_offline(tmp_path):
+    cases = Cases(Path(__file__).parent / "data" / "BouncingBall3D" / "BouncingBall3D.cases")
+    case = cases.case_by_name("restitutionAndGravity")
+    assert isinstance(case, Case)
+    case.run(dump=str(tmp_path / "restitutionAndGravity"))
+    res = Results(file=tmp_path / "restitutionAndGravity.js5")
+    assert res.case is None, "Results are used offline, i.e. without Cases and simulator"
+    assert res.case_name == "restitutionAndGravity"
+    assert res.variables["x"]["variables"] == (0, 1, 2)
+    assert res.variables == cases.variables
+    assert res.inspect()["bb.x"]["info"]["description"] == "3D Position of the ball in meters"
+    data = res.retrieve((("bb", "g"), ("bb", "e")))
+    assert data == [[0.0, 1.5, 0.5]]
+    assert res.asserts == ["1", "2", "3", "4"]
+    assert res.assertion is not cases.assertion
+    assert res.assertion.do_assert_case(res) == [4, 4]
+    assert res.assertion.assertions("3")["case"] == "restitutionAndGravity"
+
+
+def test_record_policies(tmp_path):
+    cases = Cases(Path(__file__).parent / "data" / "BouncingBall3D" / "BouncingBall3D.cases")
+    spec = {"spec": {"e": 0.5}, "record": {"x_b": "change", "v": "deadband 10%"}}
+    compressed = Case(cases, "compressed", spec=spec)
+    assert compressed.record == {"x_b": "change", "v": "deadband 10%"}
+    assert Case._record_policy("deadband 0.1") == ("abs", 0.1)
+    with pytest.raises(CaseInitError):
+        Case._record_policy("deadband")
+    compressed.run(dump=str(tmp_path / "compressed"))
+    res = Results(file=tmp_path / "compressed.js5")
+    cases.case_by_name("restitution").run(dump=str(tmp_path / "restitution"))
+    ref = Results(file=tmp_path / "restitution.js5")
+    assert res.inspect()["bb.x_b"]["len"] < ref.inspect()["bb.x_b"]["len"] / 10, "Change-only recording"
+    assert res.inspect()["bb.x_b"]["range"][1] == 3.0, "Final value always recorded"
+    assert res.retrieve((("bb", "x"), ("bb", "x_b"))) == ref.retrieve((("bb", "x"), ("bb", "x_b"))), "Zero-order hold"
+    data = res.retrieve(("bb.v[2]", "bb.x[2]"))
+    data_ref = ref.retrieve(("bb.v[2]", "bb.x[2]"))
+    assert len(data) == len(data_ref)
+    assert any(d[1] != r[1] for d, r in zip(data, data_ref, strict=True)), "Values within deadband not recorded"
+    spec = {"spec": {"e": 0.5, "stopTime": 2.955}, "record": {"x_b": "change"}}
+    Case(cases, "truncated", spec=spec).run(dump=str(tmp_path / "truncated"))
+    res = Results(file=tmp_path / "truncated.js5")
+    assert res.inspect()["bb.x_b"]["range"][1] == 2.95, "Value at last executed step recorded"
+
+
+def test_results_writer(tmp_path, bouncing_ball_3d, monkeypatch):
+    cases = Cases(bouncing_ball_3d)
+    handed_over: list[Results] = []
+    put = ResultsWriter.put
+    monkeypatch.setattr(ResultsWriter, "put", lambda self, res, *args: handed_over.append(res) or put(self, res, *args))
+    do_assert_case = cases.assertion.do_assert_case
+
+    def do_assert_case_checked(res: Results):
+        assert all(r is not res for r in handed_over), "Results not changed by the writer while asserting"
+        return do_assert_case(res)
+
+    monkeypatch.setattr(cases.assertion, "do_assert_case", do_assert_case_checked)
+    cases.run_case("base", run_subs=True, run_assertions=True)
+    assert len(handed_over) == len(cases.base.list_cases(as_name=True, flat=True)), "All results saved by the writer"
+    for name in cases.base.list_cases(as_name=True, flat=True):
+        assert (tmp_path / f"{name}.js5").exists(), f"Results of {name} saved in the background"
+    res = Results(file=tmp_path / "gravity.js5")
+    assert res.retrieve((("bb", "g"),)) == [[0.0, 1.5]]
+
+    class Failing:
+        def save(self, dump: str):
+            raise OSError(f"Could not write {dump}")
+
+    writer = ResultsWriter(maxsize=1)
+    writer.put(Failing(), "test")  # type: ignore
+    with pytest.raises(OSError) as err:
+        writer.close()
+    assert str(err.value) == "Could not write test"
+
+
+def test_telemetry(tmp_path, bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+    cases.run_case("restitution", run_subs=True, metrics=tmp_path / "metrics.prom")
+    telemetry = cases.case_by_name("restitution").res.telemetry  # type: ignore
+    assert telemetry["steps"] == 300
+    assert telemetry["simulatedTime"] == pytest.approx(3.0)
+    assert telemetry["getActions"] == 3 * 300, "x, v and x_b at every step"
+    assert telemetry["setActions"] == 3, "Initial values of g, e and x[2]"
+    assert telemetry["cached"] is False
+    assert telemetry["realTimeFactor"] == pytest.approx(3.0 / telemetry["wallTime"])
+    assert telemetry["stepsPerSecond"] == pytest.approx(300 / telemetry["wallTime"])
+    assert Results(file=tmp_path / "restitution.js5").telemetry == telemetry, "Telemetry saved in the header"
+    assert Results(file=Path(__file__).parent / "data" / "BouncingBall3D" / "test_results").telemetry == {}
+    txt = (tmp_path / "metrics.prom").read_text()
+    assert txt == exposition([cases.case_by_name(n).res for n in ("restitution", "restitutionAndGravity")])  # type: ignore
+    assert "# TYPE sim_explorer_real_time_factor gauge\n" in txt
+    assert 'sim_explorer_steps{cases="BouncingBall3D",case="restitutionAndGravity"} 300\n' in txt
+    assert 'sim_explorer_cached{cases="BouncingBall3D",case="restitutionAndGravity"} 0\n' in txt
+
+
+def test_summary(tmp_path, bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+    spec = {
+        "parent": "restitution",
+        "spec": {"x@summary": "res"},
+        "results": ["v@summary"],
+        "assert": {
+            "1@A": ["x_max[2] > 0.99 and x_min[2] > -0.01 and bb_v_argmin[2] < 1.0", "Only summary statistics"],
+            "2@A": ["x[2] <= x_max[2]", "Mixed with time series"],
+            "3@F": ["x_integral[2] > 0 and x_rms[2] >= abs(x_mean[2])", "Integral and RMS"],
+            "4@A": ["v_max[2] > 10", "Fails: the ball falls from 1m"],
+        },
+    }
+    case = Case(cases, "summary", spec=spec)
+    assert len(case.act_summary) == 2
+    case.run(dump="")
+    summary = case.res.summary["bb"]
+    assert set(summary) == {"x", "v"}
+    data = np.array(case.res.retrieve(("bb.x[2]",)))  # the time series is still recorded in this case (@step)
+    assert summary["x"]["min"][2] == pytest.approx(data[:, 1].min())
+    assert summary["x"]["max"][2] == pytest.approx(data[:, 1].max())
+    assert summary["x"]["argmax"][2] == pytest.approx(data[np.argmax(data[:, 1]), 0])
+    assert summary["x"]["mean"][2] == pytest.approx(data[:, 1].mean())
+    assert summary["x"]["rms"][2] == pytest.approx(np.sqrt(np.mean(data[:, 1] ** 2)))
+    assert summary["x"]["integral"][2] == pytest.approx(np.sum((data[1:, 1] + data[:-1, 1]) * np.diff(data[:, 0])) / 2)
+    assert case.res.telemetry["getActions"] == 5 * 300, "x, v and x_b at every step. x and v for the summary"
+    assert cases.assertion.do_assert_case(case.res) == [3, 4]
+    assert not cases.assertion.assertions("4")["passed"]
+    offline = Results(file=tmp_path / "summary.js5")
+    assert offline.summary == case.res.summary, "Summary saved in the header"
+    with pytest.raises(AssertionError, match="No summary of bb.x_b"):
+        cases.assertion.expr("5", "x_b_max[2] > 0")
+        cases.assertion.temporal("5", "A")
+        cases.assertion.do_assert("5", case.res)
+
+
 if __name__ == "__main__":
     # retcode = pytest.main(["-rA", "-v", __file__, "--show", "True"])
     # assert retcode == 0, f"Non-zero return code {retcode}"
@@ -0,0 +1,76 @@
+import sys
+
+from sim_explorer.case import Case, Cases
+from sim_explorer.cli.sim_explorer import main
+from sim_explorer.json5 import Json5
+from sim_explorer.run_cache import RunCache
+
+
+def test_key(tmp_path, bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+    cache = RunCache(tmp_path / "cache")
+    keys = [cache.key(c) for c in cases.base.list_cases(as_name=False, flat=True) if isinstance(c, Case)]
+    assert len(keys) == 4
+    assert all(isinstance(k, str) for k in keys)
+    assert len(set(keys)) == len(keys), "Different cases have different keys"
+    assert cache.key(cases.case_by_name("gravity")) == RunCache(tmp_path / "cache").key(
+        Cases(tmp_path / "BouncingBall3D.cases").case_by_name("gravity")
+    ), "Keys are reproducible"
+    file = tmp_path / "BouncingBall3D.cases"
+    file.write_text(file.read_text().replace("g : 1.5", "g : 2.0"))
+    changed = Cases(file).case_by_name("gravity")
+    assert cache.key(changed) != cache.key(cases.case_by_name("gravity")), "Changed specification"
+    assert cache.key(Cases(file).case_by_name("restitution")) in keys, "Unchanged case"
+    summarized = [
+        Case(Cases(file), "summarized", spec={"parent": "restitution", "spec": {f"{var}@summary": "res"}})
+        for var in ("x", "v")
+    ]
+    assert cache.key(summarized[0]) != cache.key(summarized[1]), "Changed summary specification"
+
+
+def test_run_cached(tmp_path, bouncing_ball_3d):
+    cases = Cases(bouncing_ball_3d)
+    cache = RunCache(tmp_path / "cache")
+    cases.run_case("base", run_subs=True, run_assertions=True, cache=cache)
+    names = cases.base.list_cases(as_name=True, flat=True)
+    assert len(list((tmp_path / "cache").glob("*.js5"))) == len(names), "All results stored"
+    date = Json5(tmp_path / "gravity.js5").jspath("$.header.dateTime", str, True)
+    (tmp_path / "gravity.js5").unlink()
+
+    cases = Cases(tmp_path / "BouncingBall3D.cases")
+    cases.run_case("base", run_subs=True, run_assertions=True, cache=cache, metrics=tmp_path / "metrics.prom")
+    assert cases.simulator._simulator is None, "No case simulated"
+    telemetry = cases.case_by_name("gravity").res.telemetry  # type: ignore
+    assert telemetry["cached"] and telemetry["steps"] == 0 and telemetry["realTimeFactor"] == 0.0, "Cache hit"
+    txt = (tmp_path / "metrics.prom").read_text()
+    assert 'sim_explorer_cached{cases="BouncingBall3D",case="gravity"} 1\n' in txt
+    assert 'sim_explorer_steps{cases="BouncingBall3D",case="gravity"} 0\n' in txt
+    assert Json5(tmp_path / "gravity.js5").jspath("$.header.dateTime", str, True) == date, "Results from cache"
+    res = cases.case_by_name("gravity").res  # type: ignore
+    assert res.case is None, "Cached results are used offline"
+    assert res.retrieve((("bb", "g"),)) == [[0.0, 1.5]]
+
+    cases.run_case("gravity", cache=None)
+    assert cases.case_by_name("gravity").res.case is not None, "Simulated without cache"  # type: ignore
+
+
+def test_cli_cache(tmp_path, bouncing_ball_3d, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["sim-explorer", str(bouncing_ball_3d), "--info"])
+    main()
+    assert capsys.readouterr().out.startswith("Cases BouncingBall3D")
+    assert not (tmp_path / ".sim-explorer-cache").exists(), "No run cache when no case is run"
+    monkeypatch.setattr(sys, "argv", ["sim-explorer", str(bouncing_ball_3d), "--run", "gravity"])
+    main()
+    assert len(list((tmp_path / ".sim-explorer-cache").glob("*.js5"))) == 1, "Results of gravity stored"
+
+
+def test_evict(tmp_path):
+    cache = RunCache(tmp_path, max_bytes=250)
+    for i in range(5):
+        src = tmp_path / f"res{i}.txt"
+        src.write_text("x" * 100)
+        cache.store(f"key{i}", src)
+        if i == 1:
+            assert cache.load("key0") is not None, "key0 used, i.e. key1 is now the least recently used"
+    assert [cache.load(f"key{i}") is not None for i in range(5)] == [False, False, False, True, True]
+    assert not len(list(tmp_path.glob("*.tmp"))), "No temporary files left"
@@ -250,6 +250,19 @@ def test_step_by_step_cases(mobile_crane_fmu):
 #             cases.simulator.set_variable_value(0, 0, (get_ref("boom_angularVelocity"),), (0.7,))
 
 
+def test_branch_time():
+    cases = Cases(Path(__file__).parent / "data" / "MobileCrane" / "MobileCrane.cases")
+    base, static, dynamic = (cases.case_by_name(name) for name in ("base", "static", "dynamic"))
+    assert isinstance(base, Case) and isinstance(static, Case) and isinstance(dynamic, Case)
+    assert static.branch_time(dynamic) == 0.0, "Different initial settings"
+    assert base.branch_time(base) == 1.0, "Identical cases"
+    late = Case(cases, "late", spec={"spec": {"dp_dt@0.5": 1.0}})
+    later = Case(cases, "later", spec={"spec": {"dp_dt@0.7": 1.0, "stopTime": 2.0}})
+    assert late.branch_time(base) == base.branch_time(late) == 0.5
+    assert late.branch_time(later) == 0.5
+    assert later.branch_time(Case(cases, "later2", spec={"parent": "later", "spec": {"db_dt@1.5": 0.1}})) == 1.5
+
+
 # @pytest.mark.skip("Alternative only using SimulatorInterface")
 def test_run_basic():
     path = Path(Path(__file__).parent / "data" / "MobileCrane" / "OspSystemStructure.xml")
@@ -0,0 +1,54 @@
+import math
+from pathlib import Path
+
+import pytest
+
+from sim_explorer.case import Cases
+from sim_explorer.sensitivity import (
+    nominal_value,
+    output_measures,
+    perturbed_name,
+    sensitivity,
+    sensitivity_report,
+    start_value,
+)
+
+
+def test_helpers():
+    cases = Cases(Path(__file__).parent / "data" / "BouncingBall3D" / "BouncingBall3D.cases")
+    case = cases.case_by_name("restitutionAndGravity")
+    assert nominal_value(case, "e") == 0.5, "Inherited from restitution"  # type: ignore
+    assert nominal_value(case, "g") == 1.5  # type: ignore
+    assert nominal_value(case, "x[2]") == 39.37007874015748  # type: ignore
+    assert nominal_value(case, "v[0]") == 1.0, "Start value of the FMU variable"  # type: ignore
+    assert start_value(cases, "e") == 0.9
+    assert start_value(cases, "x_b[0]") is None, "No start value of a calculated variable"
+    with pytest.raises(AssertionError):
+        nominal_value(case, "v")  # type: ignore
+    with pytest.raises(AssertionError):
+        nominal_value(case, "x_b[1]")  # type: ignore
+    assert perturbed_name("base", "x[2]") == "base_sens_x_2"
+    m = output_measures([[0.0, 1.0], [1.0, 3.0], [2.0, 2.0]], ("final", "max", "min", "integral"))
+    assert m == {"final": 2.0, "max": 3.0, "min": 1.0, "integral": 4.5}
+
+
+def test_sensitivity():
+    file = Path(__file__).parent / "data" / "BouncingBall3D" / "BouncingBall3D.cases"
+    table = sensitivity(file, "restitution", ["e", "g"], ["bb.x[2]"], rel=0.01, measures=("max", "integral"))
+    assert len(table) == 4
+    ranked = [abs(r["normalized"]) for r in table]
+    assert ranked == sorted(ranked, reverse=True), "Ranked by normalized sensitivity"
+    rows = {(r["parameter"], r["measure"]): r for r in table}
+    assert rows[("g", "max")]["delta"] == pytest.approx(0.0981)
+    assert rows[("g", "max")]["sensitivity"] == pytest.approx(0.0, abs=0.01), (
+        "Ball is dropped: max close to start height"
+    )
+    integral = rows[("g", "integral")]
+    assert integral["sensitivity"] < 0, "Stronger gravity: ball closer to the floor"
+    assert integral["normalized"] == pytest.approx((integral["y1"] - integral["y0"]) / integral["y0"] / 0.01), (
+        "Normalized sensitivity"
+    )
+    assert not math.isnan(rows[("e", "integral")]["normalized"])
+    txt = sensitivity_report(table)
+    assert txt.startswith("parameter") and len(txt.splitlines()) == 5
+    print(txt)
@@ -4,7 +4,8 @@ import pytest
 from libcosimpy.CosimExecution import CosimExecution
 
 from sim_explorer.simulator_interface import SimulatorInterface
-from sim_explorer.utils.misc import match_with_wildcard
+from sim_explorer.system_metadata import _fmu_hash_cache, fmu_hash
+from sim_explorer.utils.misc import PrefixIndex, match_with_wildcard
 
 
 def test_match_with_wildcard():
@@ -13,6 +14,19 @@ def test_match_with_wildcard():
     assert match_with_wildcard("*o World", "Hello World"), "Match expected"
     assert not match_with_wildcard("*o W*ld", "Hello Word"), "No match expected"
     assert match_with_wildcard("*o W*ld", "Hello World"), "Two wildcard matches expected"
+    assert not match_with_wildcard("bb*", "xbb1"), "Anchored match expected"
+    assert match_with_wildcard("pos[*]", "pos[2]"), "Regex characters are taken literally"
+    assert not match_with_wildcard("der(*)", "derh"), "Regex characters are taken literally"
+
+
+def test_prefix_index():
+    index = PrefixIndex(["bb2", "xbb1", "bb", "bb10", "a"])
+    assert index.prefix("bb") == ["bb2", "bb", "bb10"], "Original order is kept"
+    assert index.match("bb*") == ["bb2", "bb", "bb10"]
+    assert index.match("*b1*") == ["xbb1", "bb10"]
+    assert index.match("bb") == ["bb"]
+    assert index.match("b") == []
+    assert PrefixIndex([]).match("x*") == []
 
 
 def test_pytype():
@@ -78,6 +92,41 @@ def test_simulator_from_system_structure():
     assert "bb" in system.components, f"Instance name 'bb' expected. Found instances {system.components}"
     # assert system.get_models()[0] == 0, f"Component model {system.get_models()[0]}"
     assert "bb" in system.get_components()
+    assert sorted(system.match_components("bb*")[1]) == ["bb", "bb2", "bb3"]
+    assert system.match_components("*2")[1] == ("bb2",)
+    assert system.match_variables("bb", "v") == (3,)
+
+
+def test_deferred_instantiation():
+    """Component and variable information is available without instantiating the simulator."""
+    path = Path(Path(__file__).parent, "data/BouncingBall0/OspSystemStructure.xml")
+    system = SimulatorInterface(str(path), name="BouncingBall")
+    assert system._simulator is None, "Simulator not instantiated"
+    assert system.components == {"bb": 0, "bb2": 0, "bb3": 0}
+    assert system.get_variables("bb2", "h") == {"h": {"reference": 1, "type": 0, "causality": 2, "variability": 4}}
+    assert system.get_variables("bb", 5, as_numbers=False)["g"]["causality"] == "PARAMETER"
+    assert system.match_variables("bb3", "e") == (6,)
+    assert system.allowed_action("set", "bb", "e", 0)
+    assert system._simulator is None, "Still not instantiated"
+    system.set_initial(2, 0, 6, 0.5)  # first usage instantiates the simulator
+    assert isinstance(system._simulator, CosimExecution)
+    slave = system.simulator.slave_index_from_instance_name("bb3")
+    assert system._slave_ids[2] == slave
+    system.simulator.simulate_until(1e8)
+    assert system.get_variable_value(2, 0, (6,)) == system.observer.last_real_values(slave, [6]) == [0.5]
+
+
+def test_fmu_hash(tmp_path):
+    """The FMU hash is memoized per file state and recalculated when the file changes."""
+    fmu = tmp_path / "BouncingBall.fmu"
+    fmu.write_bytes(Path(Path(__file__).parent, "data/BouncingBall0/BouncingBall.fmu").read_bytes())
+    h0 = fmu_hash(fmu)
+    stat = fmu.stat()
+    assert _fmu_hash_cache[(str(fmu.resolve()), stat.st_mtime_ns, stat.st_size)] == h0, "Memoized"
+    assert fmu_hash(tmp_path / "." / "BouncingBall.fmu") == h0, "Same resolved path"
+    with open(fmu, "ab") as f:
+        f.write(b"changed")
+    assert fmu_hash(fmu) != h0, "Recalculated after change"
 
 
 def test_simulator_reset():
@@ -89,6 +138,12 @@ def test_simulator_reset():
     assert system.simulator.status().current_time == 1e9
     system.reset()
     assert system.simulator.status().current_time == 0
+    for idx, name in enumerate(("bb", "bb2", "bb3")):  # ids in order of definition in the system structure
+        assert idx == system.component_id_from_name(name)
+        assert system.component_name_from_id(idx) == name
+        assert system._slave_ids[idx] == system.simulator.slave_index_from_instance_name(name), "Table rebuilt"
+    assert system.component_id_from_name("bb99") == -1
+    assert system.component_name_from_id(99) == ""
 
 
 def test_simulator_instantiated():
@@ -104,6 +159,9 @@ def test_simulator_instantiated():
     )
     #    simulator.check_instances_variables()
     assert len(simulator.components) == 3, "Three instantiated (identical) components"
+    assert len(set(simulator.components.values())) == 1, "All components based on the same model"
+    fingerprints = [simulator.model_fingerprint(simulator.component_id_from_name(c)) for c in ("bb", "bb2", "bb3")]
+    assert fingerprints[0] == fingerprints[1] == fingerprints[2]
     variables = simulator.get_variables("bb")
     assert variables["g"] == {
         "reference": 5,
@@ -113,19 +171,20 @@ def test_simulator_instantiated():
     }
     assert simulator.allowed_action("set", "bb", "g", 0)
     assert not simulator.allowed_action("set", "bb", "g", 100)
-    assert simulator.message.startswith("Variable g, causality PARAMETER,")
-    assert simulator.allowed_action("set", "bb", "e", 100), simulator.message
-    assert simulator.allowed_action("set", "bb", "h", 0), simulator.message
-    assert not simulator.allowed_action("set", "bb", "h", 100), simulator.message
-    assert simulator.allowed_action("set", "bb", "der(h)", 0), simulator.message
-    assert not simulator.allowed_action("set", "bb", "der(h)", 100), simulator.message
-    assert simulator.allowed_action("set", "bb", "v", 0), simulator.message
-    assert not simulator.allowed_action("set", "bb", "v", 100), simulator.message
-    assert simulator.allowed_action("set", "bb", "der(v)", 0), simulator.message
-    assert not simulator.allowed_action("set", "bb", "der(v)", 100), simulator.message
-    assert not simulator.allowed_action("set", "bb", "v_min", 0), simulator.message
-    assert simulator.allowed_action("set", "bb", (1, 3), 0), simulator.message  # combination of h,v
-    assert not simulator.allowed_action("set", "bb", (1, 3), 100), simulator.message  # combination of h,v
+    assert simulator.action_error("set", "bb", "g", 100).startswith("Variable g, causality PARAMETER,")
+    assert simulator.action_error("set", "bb", "g", 0) == ""
+    assert simulator.allowed_action("set", "bb", "e", 100)
+    assert simulator.allowed_action("set", "bb", "h", 0)
+    assert not simulator.allowed_action("set", "bb", "h", 100)
+    assert simulator.allowed_action("set", "bb", "der(h)", 0)
+    assert not simulator.allowed_action("set", "bb", "der(h)", 100)
+    assert simulator.allowed_action("set", "bb", "v", 0)
+    assert not simulator.allowed_action("set", "bb", "v", 100)
+    assert simulator.allowed_action("set", "bb", "der(v)", 0)
+    assert not simulator.allowed_action("set", "bb", "der(v)", 100)
+    assert not simulator.allowed_action("set", "bb", "v_min", 0)
+    assert simulator.allowed_action("set", "bb", (1, 3), 0)  # combination of h,v
+    assert not simulator.allowed_action("set", "bb", (1, 3), 100)  # combination of h,v
 
 
 if __name__ == "__main__":
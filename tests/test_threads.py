@@ -0,0 +1,18 @@
+from sim_explorer.case import Cases
+from sim_explorer.diff import diff_results
+
+
+def test_run_cases(tmp_path, bouncing_ball_3d):
+    """Run independent systems in threads and compare with sequential runs."""
+    cases = Cases(bouncing_ball_3d)
+    names = cases.base.list_cases(as_name=True, flat=True)
+    for name in names:
+        cases.run_case(name, dump=f"seq_{name}")
+    finished = cases.run_cases(["base"], run_subs=True, max_workers=len(names))
+    assert [c.name for c, _, _ in finished] == names, "Order of the cases kept"
+    for case, res, asserts in finished:
+        assert case.res is res
+        assert res.case is not None and res.case.cases is not cases, "Run with its own Cases object and simulator"
+        assert len(asserts) == len(case.asserts)
+        diffs = diff_results(tmp_path / f"seq_{case.name}.js5", res)
+        assert all(d["passed"] for d in diffs.values()), f"Threaded results of {case.name} differ"
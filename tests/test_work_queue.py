@@ -0,0 +1,70 @@
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from sim_explorer import work_queue
+from sim_explorer.case import Results
+
+
+def test_claim(tmp_path, bouncing_ball_3d):
+    queue = tmp_path / "queue"
+    ids = work_queue.submit(queue, bouncing_ball_3d, ["gravity"])
+    assert len(ids) == 1 and ids[0].startswith("gravity-")
+    task = work_queue.claim(queue)
+    assert task is not None and task.parent.name == "running"
+    assert json.loads(task.read_text())["case"] == "gravity"
+    assert work_queue.claim(queue) is None, "A task is claimed only once"
+    assert work_queue.requeue(queue, older_than=3600.0) == []
+    assert work_queue.requeue(queue, older_than=-1.0) == ids, "Task of a 'crashed' worker"
+    assert work_queue.claim(queue) is not None
+
+
+def test_requeue_running(tmp_path, bouncing_ball_3d, monkeypatch):
+    queue = tmp_path / "queue"
+    ids = work_queue.submit(queue, bouncing_ball_3d, ["gravity"])
+    started, finish = threading.Event(), threading.Event()
+
+    def run_task(task: dict, worker: str = "") -> dict:
+        started.set()
+        finish.wait(10.0)
+        return dict(task, worker=worker, passed=True, assertions=[], error=None, duration=0.0)
+
+    monkeypatch.setattr(work_queue, "run_task", run_task)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        count = pool.submit(work_queue.work, queue, max_tasks=1, heartbeat=0.05)
+        assert started.wait(10.0)
+        time.sleep(0.5)
+        assert work_queue.requeue(queue, older_than=0.3) == [], "Task refreshed by the heartbeat of the worker"
+        assert work_queue.requeue(queue, older_than=-1.0) == ids, "Re-queued while running"
+        finish.set()
+        assert count.result() == 1, "The worker survives that the task was re-queued"
+    assert work_queue.collect(queue, ids)[ids[0]]["passed"]
+
+
+def test_workers(tmp_path, bouncing_ball_3d):
+    queue = tmp_path / "queue"
+    cases = bouncing_ball_3d
+    ids = work_queue.submit(queue, cases, ["base"], results=tmp_path / "results", run_subs=True)
+    ids += work_queue.submit(queue, cases, ["restitutionAndGravity"], results=tmp_path / "results")
+    assert len(ids) == 5
+    # a task which fails on the worker
+    bad = {"id": "bad", "cases": str(cases), "case": "unknown", "results": str(tmp_path / "unknown.js5")}
+    (queue / "pending" / "bad.json").write_text(json.dumps(bad))
+    with ProcessPoolExecutor(max_workers=3, mp_context=multiprocessing.get_context("spawn")) as executor:
+        counts = list(executor.map(work_queue.work, [queue] * 3))
+    assert sum(counts) == 6, "Each task is run exactly once"
+    summaries = work_queue.collect(queue, ids + ["bad"], timeout=1.0)
+    assert len(summaries) == 6
+    assert summaries["bad"]["error"].startswith("AssertionError: Case unknown not found")
+    both = [s for s in summaries.values() if s["case"] == "restitutionAndGravity"]
+    assert len(both) == 2 and all(s["passed"] and len(s["assertions"]) == 4 for s in both)
+    assert not len(list((queue / "pending").iterdir())) and not len(list((queue / "running").iterdir()))
+    res = Results(file=tmp_path / "results" / "restitution.js5")
+    assert res.case_name == "restitution"
+    txt = work_queue.report(summaries, ids + ["bad", "missing"])
+    assert "restitutionAndGravity: PASSED 4 of 4 assertions" in txt
+    assert "gravity: FAILED 0 of 1 assertions" in txt
+    assert "unknown: ERROR" in txt
+    assert txt.endswith("missing: not finished\n")